@@ -8,7 +8,8 @@ from config.logger import setup_logging
 from core.utils.util import get_local_ip, validate_mcp_endpoint
 from core.http_server import SimpleHttpServer
 from core.websocket_server import WebSocketServer
-from core.utils.util import check_ffmpeg_installed
+from core.utils.util import check_ffmpeg_installed, preload_audio_assets
+from core.utils import http_client
 
 TAG = __name__
 logger = setup_logging()
@@ -42,6 +43,12 @@ async def monitor_stdin():
         await ainput()  # 异步等待输入，消费回车
 
 
+async def preload_assets():
+    """后台预先转码提示音等固定音频，设备首次播放时无需等待转码"""
+    count = await asyncio.to_thread(preload_audio_assets)
+    logger.bind(tag=TAG).info(f"已预加载{count}个提示音频文件")
+
+
 async def main():
     check_ffmpeg_installed()
     config = load_config()
@@ -54,8 +61,13 @@ async def main():
         auth_key = str(uuid.uuid4().hex)
     config["server"]["auth_key"] = auth_key
 
+    # HTTP类供应商共用连接池的参数
+    http_client.configure(config.get("http_client"))
+
     # 添加 stdin 监控任务
     stdin_task = asyncio.create_task(monitor_stdin())
+    # 后台预加载提示音频
+    preload_task = asyncio.create_task(preload_assets())
 
     # 启动 WebSocket 服务器
     ws_server = WebSocketServer(config)
@@ -118,13 +130,18 @@ async def main():
     finally:
         # 取消所有任务（关键修复点）
         stdin_task.cancel()
+        preload_task.cancel()
         ws_task.cancel()
         if ota_task:
             ota_task.cancel()
 
         # 等待任务终止（必须加超时）
         await asyncio.wait(
-            [stdin_task, ws_task, ota_task] if ota_task else [stdin_task, ws_task],
+            (
+                [stdin_task, preload_task, ws_task, ota_task]
+                if ota_task
+                else [stdin_task, preload_task, ws_task]
+            ),
             timeout=3.0,
             return_when=asyncio.ALL_COMPLETED,
         )
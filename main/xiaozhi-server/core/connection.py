@@ -40,6 +40,8 @@ from config.manage_api_client import DeviceNotFoundException, DeviceBindExceptio
 from core.utils.prompt_manager import PromptManager
 from core.utils.voiceprint_provider import VoiceprintProvider
 from core.utils import textUtils
+from core.utils import pipeline
+from core.utils.ring_buffer import PCMRingBuffer
 
 TAG = __name__
 
@@ -90,10 +92,21 @@ class ConnectionHandler:
         # 线程任务相关
         self.loop = asyncio.get_event_loop()
         self.stop_event = threading.Event()
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        # asyncio模式下各处理阶段以事件循环任务运行，阻塞操作使用进程级共享线程池
+        self.async_pipeline = pipeline.is_async_pipeline(self.config)
+        self.pipeline_tasks = []
+        if self.async_pipeline:
+            self.executor = pipeline.get_shared_executor(
+                self.config.get("pipeline_workers")
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=5)
 
         # 添加上报线程池
-        self.report_queue = queue.Queue()
+        if self.async_pipeline:
+            self.report_queue = pipeline.AsyncQueue(self.loop)
+        else:
+            self.report_queue = queue.Queue()
         self.report_thread = None
         # 未来可以通过修改此处，调节asr的上报和tts的上报，目前默认都开启
         self.report_asr_enable = self.read_config_from_api
@@ -112,18 +125,27 @@ class ConnectionHandler:
         # 为每个连接单独管理声纹识别
         self.voiceprint_provider = None
 
+        # 上行音频解码器，每个数据包只解码一次，PCM供VAD、ASR、声纹识别共用
+        self.audio_decoder = None
+
         # vad相关变量
-        self.client_audio_buffer = bytearray()
+        self.client_audio_buffer = PCMRingBuffer()
         self.client_have_voice = False
         self.last_activity_time = 0.0  # 统一的活动时间戳（毫秒）
         self.client_voice_stop = False
         self.client_voice_window = deque(maxlen=5)
         self.last_is_voice = False
+        # 每个连接独立的VAD会话（Opus解码器和模型循环状态），由VAD模块按需创建
+        self.vad_session = None
 
         # asr相关变量
         # 因为实际部署时可能会用到公共的本地ASR，不能把变量暴露给公共ASR
         # 所以涉及到ASR的变量，需要在这里定义，属于connection的私有变量
-        self.asr_audio = []
+        self.asr_audio = []  # 已解码的PCM帧
+        # 静音阶段只保留最近10帧，作为语音开头的预录音频
+        self.asr_preroll = deque(maxlen=10)
+        # 流式ASR正在识别的一句话（识别流及中间结果），由支持流式识别的ASR模块创建
+        self.asr_online_session = None
         self.asr_audio_queue = queue.Queue()
 
         # llm相关变量
@@ -475,6 +497,9 @@ class ConnectionHandler:
             return
         if self.chat_history_conf == 0:
             return
+        if self.async_pipeline:
+            asyncio.run_coroutine_threadsafe(self._start_report_task(), self.loop)
+            return
         if self.report_thread is None or not self.report_thread.is_alive():
             self.report_thread = threading.Thread(
                 target=self._report_worker, daemon=True
@@ -990,6 +1015,27 @@ class ConnectionHandler:
 
         self.logger.bind(tag=TAG).info("聊天记录上报线程已退出")
 
+    async def _start_report_task(self):
+        self.pipeline_tasks.append(asyncio.create_task(self._report_task()))
+        self.logger.bind(tag=TAG).info("TTS上报任务已启动")
+
+    async def _report_task(self):
+        """聊天记录上报任务，asyncio模式下替代上报线程"""
+        while not self.stop_event.is_set():
+            try:
+                item = await self.report_queue.get()
+                if item is None:
+                    break
+                if self.executor is None:
+                    continue
+                self.loop.run_in_executor(self.executor, self._process_report, *item)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.bind(tag=TAG).error(f"聊天记录上报任务异常: {e}")
+
+        self.logger.bind(tag=TAG).info("聊天记录上报任务已退出")
+
     def _process_report(self, type, text, audio_data, report_time):
         """处理上报任务"""
         try:
@@ -1003,6 +1049,8 @@ class ConnectionHandler:
 
     def clearSpeakStatus(self):
         self.client_is_speaking = False
+        if self.vad_session is not None:
+            self.vad_session.reset()
         self.logger.bind(tag=TAG).debug(f"清除服务端讲话状态")
 
     async def close(self, ws=None):
@@ -1076,14 +1124,22 @@ class ConnectionHandler:
             if self.tts:
                 await self.tts.close()
 
-            # 最后关闭线程池（避免阻塞）
+            # 停止asyncio模式下的处理任务，当前任务由stop_event自行退出
+            current_task = asyncio.current_task()
+            for task in self.pipeline_tasks:
+                if task is not current_task and not task.done():
+                    task.cancel()
+            self.pipeline_tasks.clear()
+
+            # 最后关闭线程池（避免阻塞），共享线程池由进程持有，不在此关闭
             if self.executor:
-                try:
-                    self.executor.shutdown(wait=False)
-                except Exception as executor_error:
-                    self.logger.bind(tag=TAG).error(
-                        f"关闭线程池时出错: {executor_error}"
-                    )
+                if not self.async_pipeline:
+                    try:
+                        self.executor.shutdown(wait=False)
+                    except Exception as executor_error:
+                        self.logger.bind(tag=TAG).error(
+                            f"关闭线程池时出错: {executor_error}"
+                        )
                 self.executor = None
 
             self.logger.bind(tag=TAG).info("连接资源已释放")
@@ -1109,6 +1165,10 @@ class ConnectionHandler:
             ]:
                 if not q:
                     continue
+                if isinstance(q, pipeline.AsyncQueue):
+                    # 连同其它线程已放入但尚未进入事件循环的数据一起丢弃
+                    q.clear()
+                    continue
                 while True:
                     try:
                         q.get_nowait()
@@ -1120,11 +1180,18 @@ class ConnectionHandler:
             )
 
     def reset_vad_states(self):
-        self.client_audio_buffer = bytearray()
+        self.client_audio_buffer.clear()
         self.client_have_voice = False
         self.client_voice_stop = False
+        self.asr_online_session = None
         self.logger.bind(tag=TAG).debug("VAD states reset.")
 
+    def clear_asr_audio(self):
+        """丢弃当前这句话已收集的音频，流式识别中的一句话也一并丢弃"""
+        self.asr_audio.clear()
+        self.asr_preroll.clear()
+        self.asr_online_session = None
+
     def chat_and_close(self, text):
         """Chat with the user and then close the connection"""
         try:
@@ -1,7 +1,8 @@
 import time
 import json
 import asyncio
-from core.utils.util import audio_to_data
+import opuslib_next
+from core.utils.util import audio_to_data_cached
 from core.handle.abortHandle import handleAbortMessage
 from core.handle.intentHandler import handle_user_intent
 from core.utils.output_counter import check_device_output_limit
@@ -10,14 +11,29 @@ from core.handle.sendAudioHandle import send_stt_message, SentenceType
 TAG = __name__
 
 
+def decode_audio_frame(conn, audio):
+    """将上行音频解码为PCM，每个数据包只解码一次"""
+    if not audio or conn.audio_format == "pcm":
+        return audio
+    if conn.audio_decoder is None:
+        conn.audio_decoder = opuslib_next.Decoder(16000, 1)
+    return conn.audio_decoder.decode(audio, 960)
+
+
 async def handleAudioMessage(conn, audio):
+    # 解码后的PCM由VAD、ASR、声纹识别共用
+    try:
+        pcm_frame = decode_audio_frame(conn, audio)
+    except opuslib_next.OpusError as e:
+        conn.logger.bind(tag=TAG).info(f"解码错误: {e}")
+        return
     # 当前片段是否有人说话
-    have_voice = conn.vad.is_vad(conn, audio)
+    have_voice = await conn.vad.is_vad_async(conn, pcm_frame)
     # 如果设备刚刚被唤醒，短暂忽略VAD检测
     if have_voice and hasattr(conn, "just_woken_up") and conn.just_woken_up:
         have_voice = False
         # 设置一个短暂延迟后恢复VAD检测
-        conn.asr_audio.clear()
+        conn.clear_asr_audio()
         if not hasattr(conn, "vad_resume_task") or conn.vad_resume_task.done():
             conn.vad_resume_task = asyncio.create_task(resume_vad_detection(conn))
         return
@@ -27,7 +43,7 @@ async def handleAudioMessage(conn, audio):
     # 设备长时间空闲检测，用于say goodbye
     await no_voice_close_connect(conn, have_voice)
     # 接收音频
-    await conn.asr.receive_audio(conn, audio, have_voice)
+    await conn.asr.receive_audio(conn, pcm_frame, have_voice)
 
 
 async def resume_vad_detection(conn):
@@ -121,7 +137,7 @@ async def max_out_size(conn):
     text = "不好意思，我现在有点事情要忙，明天这个时候我们再聊，约好了哦！明天不见不散，拜拜！"
     await send_stt_message(conn, text)
     file_path = "config/assets/max_output_size.wav"
-    opus_packets = audio_to_data(file_path)
+    opus_packets = audio_to_data_cached(file_path)
     conn.tts.tts_audio_queue.put((SentenceType.LAST, opus_packets, text))
     conn.close_after_chat = True
 
@@ -140,7 +156,7 @@ async def check_bind_device(conn):
 
         # 播放提示音
         music_path = "config/assets/bind_code.wav"
-        opus_packets = audio_to_data(music_path)
+        opus_packets = audio_to_data_cached(music_path)
         conn.tts.tts_audio_queue.put((SentenceType.FIRST, opus_packets, text))
 
         # 逐个播放数字
@@ -148,7 +164,7 @@ async def check_bind_device(conn):
             try:
                 digit = conn.bind_code[i]
                 num_path = f"config/assets/bind_code/{digit}.wav"
-                num_packets = audio_to_data(num_path)
+                num_packets = audio_to_data_cached(num_path)
                 conn.tts.tts_audio_queue.put((SentenceType.MIDDLE, num_packets, None))
             except Exception as e:
                 conn.logger.bind(tag=TAG).error(f"播放数字音频失败: {e}")
@@ -160,5 +176,5 @@ async def check_bind_device(conn):
         text = f"没有找到该设备的版本信息，请正确配置 OTA地址，然后重新编译固件。"
         await send_stt_message(conn, text)
         music_path = "config/assets/bind_not_found.wav"
-        opus_packets = audio_to_data(music_path)
+        opus_packets = audio_to_data_cached(music_path)
         conn.tts.tts_audio_queue.put((SentenceType.LAST, opus_packets, text))
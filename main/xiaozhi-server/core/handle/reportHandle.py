@@ -25,11 +25,13 @@ def report(conn, type, text, opus_data, report_time):
         conn: 连接对象
         type: 上报类型，1为用户，2为智能体
         text: 合成文本
-        opus_data: opus音频数据
+        opus_data: 音频数据，用户(ASR)为已解码的PCM帧，智能体(TTS)为opus数据
         report_time: 上报时间
     """
     try:
-        if opus_data:
+        if opus_data and type == 1:
+            audio_data = pcm_to_wav(b"".join(opus_data))
+        elif opus_data:
             audio_data = opus_to_wav(conn, opus_data)
         else:
             audio_data = None
@@ -69,8 +71,19 @@ def opus_to_wav(conn, opus_data):
     if not pcm_data:
         raise ValueError("没有有效的PCM数据")
 
+    return pcm_to_wav(b"".join(pcm_data))
+
+
+def pcm_to_wav(pcm_data_bytes):
+    """为16kHz单声道16位PCM数据添加WAV文件头
+
+    Args:
+        pcm_data_bytes: PCM音频数据
+
+    Returns:
+        bytes: WAV格式的音频数据
+    """
     # 创建WAV文件头
-    pcm_data_bytes = b"".join(pcm_data)
     num_samples = len(pcm_data_bytes) // 2  # 16-bit samples
 
     # WAV文件头
@@ -121,7 +134,7 @@ def enqueue_tts_report(conn, text, opus_data):
         conn.logger.bind(tag=TAG).error(f"加入TTS上报队列失败: {text}, {e}")
 
 
-def enqueue_asr_report(conn, text, opus_data):
+def enqueue_asr_report(conn, text, pcm_data):
     if not conn.read_config_from_api or conn.need_bind or not conn.report_asr_enable:
         return
     if conn.chat_history_conf == 0:
@@ -131,14 +144,14 @@ def enqueue_asr_report(conn, text, opus_data):
     Args:
         conn: 连接对象
         text: 合成文本
-        opus_data: opus音频数据
+        pcm_data: 已解码的PCM帧列表
     """
     try:
         # 使用连接对象的队列，传入文本和二进制数据而非文件路径
         if conn.chat_history_conf == 2:
-            conn.report_queue.put((1, text, opus_data, int(time.time())))
+            conn.report_queue.put((1, text, pcm_data, int(time.time())))
             conn.logger.bind(tag=TAG).debug(
-                f"ASR数据已加入上报队列: {conn.device_id}, 音频大小: {len(opus_data)} "
+                f"ASR数据已加入上报队列: {conn.device_id}, 音频大小: {len(pcm_data)} "
             )
         else:
             conn.report_queue.put((1, text, None, int(time.time())))
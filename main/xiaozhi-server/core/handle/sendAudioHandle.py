@@ -1,8 +1,8 @@
 import json
 import time
-import asyncio
 from core.utils import textUtils
-from core.utils.util import audio_to_data
+from core.utils.audio_pacer import get_audio_pacer
+from core.utils.util import audio_to_data_cached
 from core.providers.tts.dto.dto import SentenceType
 
 TAG = __name__
@@ -30,13 +30,13 @@ async def sendAudioMessage(conn, sentenceType, audios, text):
             await conn.close()
 
 
-def calculate_timestamp_and_sequence(conn, start_time, packet_index, frame_duration=60):
+def calculate_timestamp_and_sequence(start_time, packet_index, sequence, frame_duration=60):
     """
     计算音频数据包的时间戳和序列号
     Args:
-        conn: 连接对象
-        start_time: 起始时间（性能计数器值）
-        packet_index: 数据包索引
+        start_time: 本段音频的起始时间（事件循环时钟）
+        packet_index: 本段音频内的数据包索引
+        sequence: 连接内连续递增的序列号
         frame_duration: 帧时长（毫秒），匹配 Opus 编码
     Returns:
         tuple: (timestamp, sequence)
@@ -45,14 +45,7 @@ def calculate_timestamp_and_sequence(conn, start_time, packet_index, frame_durat
     timestamp = int((start_time + packet_index * frame_duration / 1000) * 1000) % (
         2**32
     )
-
-    # 计算序列号
-    if hasattr(conn, "audio_flow_control"):
-        sequence = conn.audio_flow_control["sequence"]
-    else:
-        sequence = packet_index  # 如果没有流控状态，直接使用索引
-
-    return timestamp, sequence
+    return timestamp, sequence % (2**32)
 
 
 async def _send_to_mqtt_gateway(conn, opus_packet, timestamp, sequence):
@@ -77,113 +70,45 @@ async def _send_to_mqtt_gateway(conn, opus_packet, timestamp, sequence):
     await conn.websocket.send(complete_packet)
 
 
+async def _send_frame(conn, opus_packet, start_time, packet_index, sequence):
+    """由节奏调度器在到期时调用，发送单个opus数据包"""
+    # 重置没有声音的状态
+    conn.last_activity_time = time.time() * 1000
+    if conn.conn_from_mqtt_gateway:
+        timestamp, sequence = calculate_timestamp_and_sequence(
+            start_time, packet_index, sequence
+        )
+        # 调用通用函数发送带头部的数据包
+        await _send_to_mqtt_gateway(conn, opus_packet, timestamp, sequence)
+    else:
+        # 直接发送opus数据包，不添加头部
+        await conn.websocket.send(opus_packet)
+
+
 # 播放音频
 async def sendAudio(conn, audios, frame_duration=60):
     """
-    发送单个opus包，支持流控
+    把音频交给所在事件循环的节奏调度器，由调度器按帧时长统一定时发送，
+    每段音频开始时的前几帧立即发送作为预缓冲
     Args:
         conn: 连接对象
-        opus_packet: 单个opus数据包
-        pre_buffer: 快速发送音频
+        audios: 单个opus数据包，或opus数据包列表
         frame_duration: 帧时长（毫秒），匹配 Opus 编码
     """
     if audios is None or len(audios) == 0:
         return
+    if conn.client_abort:
+        return
 
+    conn.last_activity_time = time.time() * 1000
     if isinstance(audios, bytes):
-        if conn.client_abort:
-            return
-
-        conn.last_activity_time = time.time() * 1000
-
-        # 获取或初始化流控状态
-        if not hasattr(conn, "audio_flow_control"):
-            conn.audio_flow_control = {
-                "last_send_time": 0,
-                "packet_count": 0,
-                "start_time": time.perf_counter(),
-                "sequence": 0,  # 添加序列号
-            }
+        audios = (audios,)
+    await get_audio_pacer(_send_frame).enqueue(conn, audios, frame_duration)
 
-        flow_control = conn.audio_flow_control
-        current_time = time.perf_counter()
-        # 计算预期发送时间
-        expected_time = flow_control["start_time"] + (
-            flow_control["packet_count"] * frame_duration / 1000
-        )
-        delay = expected_time - current_time
-        if delay > 0:
-            await asyncio.sleep(delay)
-        else:
-            # 纠正误差
-            flow_control["start_time"] += abs(delay)
-
-        if conn.conn_from_mqtt_gateway:
-            # 计算时间戳和序列号
-            timestamp, sequence = calculate_timestamp_and_sequence(
-                conn,
-                flow_control["start_time"],
-                flow_control["packet_count"],
-                frame_duration,
-            )
-            # 调用通用函数发送带头部的数据包
-            await _send_to_mqtt_gateway(conn, audios, timestamp, sequence)
-        else:
-            # 直接发送opus数据包，不添加头部
-            await conn.websocket.send(audios)
-
-        # 更新流控状态
-        flow_control["packet_count"] += 1
-        flow_control["sequence"] += 1
-        flow_control["last_send_time"] = time.perf_counter()
-    else:
-        # 文件型音频走普通播放
-        start_time = time.perf_counter()
-        play_position = 0
-
-        # 执行预缓冲
-        pre_buffer_frames = min(3, len(audios))
-        for i in range(pre_buffer_frames):
-            if conn.conn_from_mqtt_gateway:
-                # 计算时间戳和序列号
-                timestamp, sequence = calculate_timestamp_and_sequence(
-                    conn, start_time, i, frame_duration
-                )
-                # 调用通用函数发送带头部的数据包
-                await _send_to_mqtt_gateway(conn, audios[i], timestamp, sequence)
-            else:
-                # 直接发送预缓冲包，不添加头部
-                await conn.websocket.send(audios[i])
-        remaining_audios = audios[pre_buffer_frames:]
-
-        # 播放剩余音频帧
-        for i, opus_packet in enumerate(remaining_audios):
-            if conn.client_abort:
-                break
-
-            # 重置没有声音的状态
-            conn.last_activity_time = time.time() * 1000
-
-            # 计算预期发送时间
-            expected_time = start_time + (play_position / 1000)
-            current_time = time.perf_counter()
-            delay = expected_time - current_time
-            if delay > 0:
-                await asyncio.sleep(delay)
-
-            if conn.conn_from_mqtt_gateway:
-                # 计算时间戳和序列号（使用当前的数据包索引确保连续性）
-                packet_index = pre_buffer_frames + i
-                timestamp, sequence = calculate_timestamp_and_sequence(
-                    conn, start_time, packet_index, frame_duration
-                )
-                # 调用通用函数发送带头部的数据包
-                await _send_to_mqtt_gateway(conn, opus_packet, timestamp, sequence)
-            else:
-                # 直接发送opus数据包，不添加头部
-                await conn.websocket.send(opus_packet)
-
-            play_position += frame_duration
+
+async def wait_audio_sent(conn):
+    """等待已交给调度器的音频全部发出，保证随后的状态消息排在音频之后"""
+    await get_audio_pacer(_send_frame).wait_sent(conn)
 
 
 async def send_tts_message(conn, state, text=None):
@@ -194,6 +119,9 @@ async def send_tts_message(conn, state, text=None):
     if text is not None:
         message["text"] = textUtils.check_emoji(text)
 
+    # 状态消息不经过调度器，先等之前的音频发完，保持与音频的先后顺序
+    await wait_audio_sent(conn)
+
     # TTS播放结束
     if state == "stop":
         # 播放提示音
@@ -202,8 +130,9 @@ async def send_tts_message(conn, state, text=None):
             stop_tts_notify_voice = conn.config.get(
                 "stop_tts_notify_voice", "config/assets/tts_notify.mp3"
             )
-            audios = audio_to_data(stop_tts_notify_voice, is_opus=True)
+            audios = audio_to_data_cached(stop_tts_notify_voice, is_opus=True)
             await sendAudio(conn, audios)
+            await wait_audio_sent(conn)
         # 清除服务端讲话状态
         conn.clearSpeakStatus()
 
@@ -211,6 +140,21 @@ async def send_tts_message(conn, state, text=None):
     await conn.websocket.send(json.dumps(message))
 
 
+async def send_stt_partial_message(conn, text):
+    """发送流式识别的中间结果，只更新设备上显示的文字，不改变对话状态"""
+    stt_text = textUtils.get_string_no_punctuation_or_emoji(text)
+    await conn.websocket.send(
+        json.dumps(
+            {
+                "type": "stt",
+                "text": stt_text,
+                "partial": True,
+                "session_id": conn.session_id,
+            }
+        )
+    )
+
+
 async def send_stt_message(conn, text):
     """发送 STT 状态消息"""
     end_prompt_str = conn.config.get("end_prompt", {}).get("prompt")
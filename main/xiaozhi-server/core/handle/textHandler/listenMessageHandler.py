@@ -33,7 +33,7 @@ class ListenTextMessageHandler(TextMessageHandler):
                 await handleAudioMessage(conn, b"")
         elif msg_json["state"] == "detect":
             conn.client_have_voice = False
-            conn.asr_audio.clear()
+            conn.clear_asr_audio()
             if "text" in msg_json:
                 conn.last_activity_time = time.time() * 1000
                 original_text = msg_json["text"]  # 保留原始文本
@@ -7,7 +7,6 @@ import hashlib
 import asyncio
 import requests
 import websockets
-import opuslib_next
 import random
 from typing import Optional, Tuple, List
 from urllib import parse
@@ -72,7 +71,6 @@ class ASRProvider(ASRProviderBase):
         self.interface_type = InterfaceType.STREAM
         self.config = config
         self.text = ""
-        self.decoder = opuslib_next.Decoder(16000, 1)
         self.asr_ws = None
         self.forward_task = None
         self.is_processing = False
@@ -134,8 +132,7 @@ class ASRProvider(ASRProviderBase):
         if audio:
             conn.asr_audio_for_voiceprint.append(audio)
         
-        conn.asr_audio.append(audio)
-        conn.asr_audio = conn.asr_audio[-10:]
+        conn.asr_preroll.append(audio)
 
         # 只在有声音且没有连接时建立连接
         if audio_have_voice and not self.is_processing:
@@ -148,8 +145,7 @@ class ASRProvider(ASRProviderBase):
 
         if self.asr_ws and self.is_processing and self.server_ready:
             try:
-                pcm_frame = self.decoder.decode(audio, 960)
-                await self.asr_ws.send(pcm_frame)
+                await self.asr_ws.send(audio)
             except Exception as e:
                 logger.bind(tag=TAG).warning(f"发送音频失败: {str(e)}")
                 await self._cleanup(conn)
@@ -228,11 +224,11 @@ class ASRProvider(ASRProviderBase):
                         logger.bind(tag=TAG).info("服务器已准备，开始发送缓存音频...")
                         
                         # 发送缓存音频
-                        if conn.asr_audio:
-                            for cached_audio in conn.asr_audio[-10:]:
+                        if conn.asr_preroll:
+                            # 发送期间预录缓冲区可能继续写入，先复制一份
+                            for cached_audio in list(conn.asr_preroll):
                                 try:
-                                    pcm_frame = self.decoder.decode(cached_audio, 960)
-                                    await self.asr_ws.send(pcm_frame)
+                                    await self.asr_ws.send(cached_audio)
                                 except Exception as e:
                                     logger.bind(tag=TAG).warning(f"发送缓存音频失败: {e}")
                                     break
@@ -15,12 +15,60 @@ from config.logger import setup_logging
 from typing import Optional, Tuple, List
 from core.handle.receiveAudioHandle import startToChat
 from core.handle.reportHandle import enqueue_asr_report
+from core.utils.pipeline import AsyncQueue
 from core.utils.util import remove_punctuation_and_length
 from core.handle.receiveAudioHandle import handleAudioMessage
 
 TAG = __name__
 logger = setup_logging()
 
+# 保留录音（delete_audio为false）时，音频文件在后台单线程中写入，不占用识别流程的时间
+_audio_file_executor = None
+
+
+def _get_audio_file_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _audio_file_executor
+    if _audio_file_executor is None:
+        _audio_file_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="asr_audio_file"
+        )
+    return _audio_file_executor
+
+
+# 语音识别常驻工作线程，每个线程持有一个长期运行的事件循环，
+# 每句话结束时直接复用，不再临时创建线程池和事件循环
+_asr_executor = None
+_asr_executor_lock = threading.Lock()
+_asr_worker_local = threading.local()
+
+
+def _get_asr_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _asr_executor
+    if _asr_executor is None:
+        with _asr_executor_lock:
+            if _asr_executor is None:
+                _asr_executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix="asr_worker"
+                )
+    return _asr_executor
+
+
+def _run_in_worker_loop(coro_func, *args):
+    loop = getattr(_asr_worker_local, "loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _asr_worker_local.loop = loop
+    return loop.run_until_complete(coro_func(*args))
+
+
+async def run_in_asr_worker(coro_func, *args):
+    """在ASR常驻工作线程的事件循环中执行coro_func(*args)，并等待其结果"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_asr_executor(), _run_in_worker_loop, coro_func, *args
+    )
+
 
 class ASRProviderBase(ABC):
     def __init__(self):
@@ -28,6 +76,12 @@ class ASRProviderBase(ABC):
 
     # 打开音频通道
     async def open_audio_channels(self, conn):
+        if conn.async_pipeline:
+            conn.asr_audio_queue = AsyncQueue(conn.loop, conn.asr_audio_queue)
+            conn.pipeline_tasks.append(
+                asyncio.create_task(self.asr_text_priority_task(conn))
+            )
+            return
         conn.asr_priority_thread = threading.Thread(
             target=self.asr_text_priority_thread, args=(conn,), daemon=True
         )
@@ -51,18 +105,37 @@ class ASRProviderBase(ABC):
                 )
                 continue
 
-    # 接收音频
+    # 有序处理ASR音频（asyncio模式）
+    async def asr_text_priority_task(self, conn):
+        while not conn.stop_event.is_set():
+            try:
+                message = await conn.asr_audio_queue.get()
+                await handleAudioMessage(conn, message)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"处理ASR文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+                )
+                continue
+
+    # 接收音频，audio为handleAudioMessage中已解码的PCM帧
     async def receive_audio(self, conn, audio, audio_have_voice):
         if conn.client_listen_mode == "auto" or conn.client_listen_mode == "realtime":
             have_voice = audio_have_voice
         else:
             have_voice = conn.client_have_voice
         
-        conn.asr_audio.append(audio)
         if not have_voice and not conn.client_have_voice:
-            conn.asr_audio = conn.asr_audio[-10:]
+            conn.asr_preroll.append(audio)
             return
 
+        # 开始说话时把预录音频并入本句音频
+        if conn.asr_preroll:
+            conn.asr_audio.extend(conn.asr_preroll)
+            conn.asr_preroll.clear()
+        conn.asr_audio.append(audio)
+
         if conn.client_voice_stop:
             asr_audio_task = conn.asr_audio.copy()
             conn.asr_audio.clear()
@@ -77,75 +150,45 @@ class ASRProviderBase(ABC):
         try:
             total_start_time = time.monotonic()
             
-            # 准备音频数据
-            if conn.audio_format == "pcm":
-                pcm_data = asr_audio_task
-            else:
-                pcm_data = self.decode_opus(asr_audio_task)
-            
-            combined_pcm_data = b"".join(pcm_data)
+            # 音频在handleAudioMessage中已解码为PCM，无需再次解码
+            combined_pcm_data = b"".join(asr_audio_task)
             
             # 预先准备WAV数据
             wav_data = None
             if conn.voiceprint_provider and combined_pcm_data:
                 wav_data = self._pcm_to_wav(combined_pcm_data)
             
-            # 定义ASR任务
-            def run_asr():
+            # ASR在常驻工作线程的事件循环中执行，避免阻塞型识别占用主事件循环
+            async def run_asr():
                 start_time = time.monotonic()
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result = loop.run_until_complete(
-                            self.speech_to_text(asr_audio_task, conn.session_id, conn.audio_format)
-                        )
-                        end_time = time.monotonic()
-                        logger.bind(tag=TAG).info(f"ASR耗时: {end_time - start_time:.3f}s")
-                        return result
-                    finally:
-                        loop.close()
+                    result = await run_in_asr_worker(
+                        self.speech_to_text, asr_audio_task, conn.session_id, "pcm"
+                    )
+                    logger.bind(tag=TAG).info(f"ASR耗时: {time.monotonic() - start_time:.3f}s")
+                    return result
                 except Exception as e:
-                    end_time = time.monotonic()
                     logger.bind(tag=TAG).error(f"ASR失败: {e}")
                     return ("", None)
-            
-            # 定义声纹识别任务
-            def run_voiceprint():
+
+            # 声纹识别为aiohttp异步请求，直接在当前事件循环中执行
+            async def run_voiceprint():
                 if not wav_data:
                     return None
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        # 使用连接的声纹识别提供者
-                        result = loop.run_until_complete(
-                            conn.voiceprint_provider.identify_speaker(wav_data, conn.session_id)
-                        )
-                        return result
-                    finally:
-                        loop.close()
+                    return await conn.voiceprint_provider.identify_speaker(
+                        wav_data, conn.session_id
+                    )
                 except Exception as e:
                     logger.bind(tag=TAG).error(f"声纹识别失败: {e}")
                     return None
-            
-            # 使用线程池执行器并行运行
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as thread_executor:
-                asr_future = thread_executor.submit(run_asr)
-                
-                if conn.voiceprint_provider and wav_data:
-                    voiceprint_future = thread_executor.submit(run_voiceprint)
-                    
-                    # 等待两个线程都完成
-                    asr_result = asr_future.result(timeout=15)
-                    voiceprint_result = voiceprint_future.result(timeout=15)
-                    
-                    results = {"asr": asr_result, "voiceprint": voiceprint_result}
-                else:
-                    asr_result = asr_future.result(timeout=15)
-                    results = {"asr": asr_result, "voiceprint": None}
-            
-            
+
+            # 并行运行ASR和声纹识别
+            asr_result, voiceprint_result = await asyncio.wait_for(
+                asyncio.gather(run_asr(), run_voiceprint()), timeout=15
+            )
+            results = {"asr": asr_result, "voiceprint": voiceprint_result}
+
             # 处理结果
             raw_text, _ = results.get("asr", ("", None))
             speaker_name = results.get("voiceprint", None)
@@ -219,18 +262,37 @@ class ASRProviderBase(ABC):
 
     def save_audio_to_file(self, pcm_data: List[bytes], session_id: str) -> str:
         """PCM数据保存为WAV文件"""
+        file_path = self._new_audio_file_path(session_id)
+        self._write_wav_file(file_path, pcm_data)
+        return file_path
+
+    def save_audio_to_file_async(self, pcm_data: List[bytes], session_id: str) -> str:
+        """在后台线程中将PCM数据保存为WAV文件，立即返回文件路径"""
+        file_path = self._new_audio_file_path(session_id)
+        future = _get_audio_file_executor().submit(
+            self._write_wav_file, file_path, list(pcm_data)
+        )
+        future.add_done_callback(self._on_audio_file_saved)
+        return file_path
+
+    @staticmethod
+    def _on_audio_file_saved(future: concurrent.futures.Future):
+        if future.exception():
+            logger.bind(tag=TAG).error(f"保存音频文件失败: {future.exception()}")
+
+    def _new_audio_file_path(self, session_id: str) -> str:
         module_name = __name__.split(".")[-1]
         file_name = f"asr_{module_name}_{session_id}_{uuid.uuid4()}.wav"
-        file_path = os.path.join(self.output_dir, file_name)
+        return os.path.join(self.output_dir, file_name)
 
+    @staticmethod
+    def _write_wav_file(file_path: str, pcm_data: List[bytes]):
         with wave.open(file_path, "wb") as wf:
             wf.setnchannels(1)
             wf.setsampwidth(2)  # 2 bytes = 16-bit
             wf.setframerate(16000)
             wf.writeframes(b"".join(pcm_data))
 
-        return file_path
-
     @abstractmethod
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus"
@@ -3,7 +3,6 @@ import gzip
 import uuid
 import asyncio
 import websockets
-import opuslib_next
 from core.providers.asr.base import ASRProviderBase
 from config.logger import setup_logging
 from core.providers.asr.dto.dto import InterfaceType
@@ -20,7 +19,6 @@ class ASRProvider(ASRProviderBase):
         self.text = ""
         self.max_retries = 3
         self.retry_delay = 2
-        self.decoder = opuslib_next.Decoder(16000, 1)
         self.asr_ws = None
         self.forward_task = None
         self.is_processing = False  # 添加处理状态标志
@@ -54,8 +52,7 @@ class ASRProvider(ASRProviderBase):
         await super().open_audio_channels(conn)
 
     async def receive_audio(self, conn, audio, audio_have_voice):
-        conn.asr_audio.append(audio)
-        conn.asr_audio = conn.asr_audio[-10:]
+        conn.asr_preroll.append(audio)
         
         # 存储音频数据
         if not hasattr(conn, 'asr_audio_for_voiceprint'):
@@ -117,11 +114,10 @@ class ASRProvider(ASRProviderBase):
                 self.forward_task = asyncio.create_task(self._forward_asr_results(conn))
 
                 # 发送缓存的音频数据
-                if conn.asr_audio and len(conn.asr_audio) > 0:
-                    for cached_audio in conn.asr_audio[-10:]:
+                if conn.asr_preroll:
+                    for cached_audio in conn.asr_preroll:
                         try:
-                            pcm_frame = self.decoder.decode(cached_audio, 960)
-                            payload = gzip.compress(pcm_frame)
+                            payload = gzip.compress(cached_audio)
                             audio_request = bytearray(
                                 self.generate_audio_default_header()
                             )
@@ -146,8 +142,7 @@ class ASRProvider(ASRProviderBase):
         # 发送当前音频数据
         if self.asr_ws and self.is_processing:
             try:
-                pcm_frame = self.decoder.decode(audio, 960)
-                payload = gzip.compress(pcm_frame)
+                payload = gzip.compress(audio)
                 audio_request = bytearray(self.generate_audio_default_header())
                 audio_request.extend(len(payload).to_bytes(4, "big"))
                 audio_request.extend(payload)
@@ -225,8 +220,8 @@ class ASRProvider(ASRProviderBase):
             if conn:
                 if hasattr(conn, 'asr_audio_for_voiceprint'):
                     conn.asr_audio_for_voiceprint = []
-                if hasattr(conn, 'asr_audio'):
-                    conn.asr_audio = []
+                if hasattr(conn, 'asr_preroll'):
+                    conn.asr_preroll.clear()
                 if hasattr(conn, 'has_valid_voice'):
                     conn.has_valid_voice = False
 
@@ -375,7 +370,7 @@ class ASRProvider(ASRProviderBase):
             for conn in self._connections.values():
                 if hasattr(conn, 'asr_audio_for_voiceprint'):
                     conn.asr_audio_for_voiceprint = []
-                if hasattr(conn, 'asr_audio'):
-                    conn.asr_audio = []
+                if hasattr(conn, 'asr_preroll'):
+                    conn.asr_preroll.clear()
                 if hasattr(conn, 'has_valid_voice'):
                     conn.has_valid_voice = False
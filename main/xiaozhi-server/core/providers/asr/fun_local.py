@@ -9,7 +9,11 @@ from core.providers.asr.base import ASRProviderBase
 from funasr import AutoModel
 from funasr.utils.postprocess_utils import rich_transcription_postprocess
 import shutil
+import asyncio
+import numpy as np
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.fair_pool import FairProcessPool
+from core.utils.batch_scheduler import BatchScheduler
 
 TAG = __name__
 logger = setup_logging()
@@ -35,6 +39,58 @@ class CaptureOutput:
             logger.bind(tag=TAG).info(self.output.strip())
 
 
+def _load_model(model_dir):
+    with CaptureOutput():
+        return AutoModel(
+            model=model_dir,
+            vad_kwargs={"max_single_segment_time": 30000},
+            disable_update=True,
+            hub="hf",
+            # device="cuda:0",  # 启用GPU加速
+        )
+
+
+def _generate_batch(model, pcm_list: List[bytes]) -> List[str]:
+    """一次调用识别多段音频，结果与输入顺序一致"""
+    inputs = [
+        np.frombuffer(pcm_data, dtype=np.int16).astype(np.float32) / 32768
+        for pcm_data in pcm_list
+    ]
+    results = model.generate(
+        input=inputs,
+        cache={},
+        language="auto",
+        use_itn=True,
+        batch_size=len(inputs),
+    )
+    return [rich_transcription_postprocess(result["text"]) for result in results]
+
+
+def _generate(model, pcm_data: bytes) -> str:
+    result = model.generate(
+        input=pcm_data,
+        cache={},
+        language="auto",
+        use_itn=True,
+        batch_size_s=60,
+    )
+    return rich_transcription_postprocess(result[0]["text"])
+
+
+# 进程池模式下，每个工作进程持有的模型实例
+_worker_model = None
+
+
+def _init_worker(model_dir):
+    """工作进程启动时加载一次模型"""
+    global _worker_model
+    _worker_model = _load_model(model_dir)
+
+
+def _worker_generate(pcm_data: bytes) -> str:
+    return _generate(_worker_model, pcm_data)
+
+
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool):
         super().__init__()
@@ -52,14 +108,33 @@ class ASRProvider(ASRProviderBase):
 
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
-        with CaptureOutput():
-            self.model = AutoModel(
-                model=self.model_dir,
-                vad_kwargs={"max_single_segment_time": 30000},
-                disable_update=True,
-                hub="hf",
-                # device="cuda:0",  # 启用GPU加速
+
+        # 进程池模式：每个工作进程各自加载一份模型，识别请求按设备轮询分配，0为在当前进程中识别
+        worker_processes = int(config.get("worker_processes", 0) or 0)
+        self.pool = None
+        self.model = None
+        if worker_processes > 0:
+            self.pool = FairProcessPool(
+                worker_processes, initializer=_init_worker, initargs=(self.model_dir,)
             )
+            logger.bind(tag=TAG).info(f"FunASR进程池模式已启用，工作进程数: {worker_processes}")
+        else:
+            self.model = _load_model(self.model_dir)
+
+        # 跨连接批量识别：时间窗口内说完话的多段语音合并为一次识别，batch_window_ms为0时不启用
+        batch_window_ms = config.get("batch_window_ms", 0)
+        batch_max_size = config.get("batch_max_size", 16)
+        self.batcher = None
+        if batch_window_ms and float(batch_window_ms) > 0:
+            if self.pool:
+                logger.bind(tag=TAG).warning("进程池模式下不启用批量识别")
+            else:
+                self.batcher = BatchScheduler(
+                    lambda pcm_list: _generate_batch(self.model, pcm_list),
+                    window_ms=float(batch_window_ms),
+                    max_batch_size=int(batch_max_size) if batch_max_size else 16,
+                    name="asr_batch",
+                )
 
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus"
@@ -78,28 +153,24 @@ class ASRProvider(ASRProviderBase):
 
                 combined_pcm_data = b"".join(pcm_data)
 
-                # 检查磁盘空间
+                # 只有需要保留录音时才写文件，并在后台线程中完成，磁盘空间不足时跳过保存
                 if not self.delete_audio_file:
                     free_space = shutil.disk_usage(self.output_dir).free
                     if free_space < len(combined_pcm_data) * 2:  # 预留2倍空间
-                        raise OSError("磁盘空间不足")
-
-                # 判断是否保存为WAV文件
-                if self.delete_audio_file:
-                    pass
-                else:
-                    file_path = self.save_audio_to_file(pcm_data, session_id)
+                        logger.bind(tag=TAG).warning("磁盘空间不足，跳过保存录音文件")
+                    else:
+                        file_path = self.save_audio_to_file_async(pcm_data, session_id)
 
                 # 语音识别
                 start_time = time.time()
-                result = self.model.generate(
-                    input=combined_pcm_data,
-                    cache={},
-                    language="auto",
-                    use_itn=True,
-                    batch_size_s=60,
-                )
-                text = rich_transcription_postprocess(result[0]["text"])
+                if self.pool:
+                    text = await asyncio.wrap_future(
+                        self.pool.submit(session_id, _worker_generate, combined_pcm_data)
+                    )
+                elif self.batcher:
+                    text = await self.batcher.submit_async(combined_pcm_data)
+                else:
+                    text = _generate(self.model, combined_pcm_data)
                 logger.bind(tag=TAG).debug(
                     f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
                 )
@@ -121,14 +192,3 @@ class ASRProvider(ASRProviderBase):
             except Exception as e:
                 logger.bind(tag=TAG).error(f"语音识别失败: {e}", exc_info=True)
                 return "", file_path
-
-            finally:
-                # 文件清理逻辑
-                if self.delete_audio_file and file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        logger.bind(tag=TAG).debug(f"已删除临时音频文件: {file_path}")
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(
-                            f"文件删除失败: {file_path} | 错误: {e}"
-                        )
@@ -5,7 +5,7 @@ from typing import Optional, Tuple, List
 from core.providers.asr.dto.dto import InterfaceType
 from core.providers.asr.base import ASRProviderBase
 
-import requests
+from core.utils import http_client
 
 TAG = __name__
 logger = setup_logging()
@@ -48,19 +48,19 @@ class ASRProvider(ASRProviderBase):
 
             with open(file_path, "rb") as audio_file:  # 使用with语句确保文件关闭
                 files = {
-                    "file": audio_file
+                    "file": (os.path.basename(file_path), audio_file.read(), "audio/wav")
                 }
 
-                start_time = time.time()
-                response = requests.post(
-                    self.api_url,
-                    files=files,
-                    data=data,
-                    headers=headers
-                )
-                logger.bind(tag=TAG).debug(
-                    f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {response.text}"
-                )
+            start_time = time.time()
+            response = await http_client.post(
+                self.api_url,
+                files=files,
+                data=data,
+                headers=headers
+            )
+            logger.bind(tag=TAG).debug(
+                f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {response.text}"
+            )
 
             if response.status_code == 200:
                 text = response.json().get("text", "")
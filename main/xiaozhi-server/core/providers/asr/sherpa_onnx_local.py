@@ -1,5 +1,4 @@
 import time
-import wave
 import os
 import sys
 import io
@@ -7,6 +6,7 @@ from config.logger import setup_logging
 from typing import Optional, Tuple, List
 from core.providers.asr.dto.dto import InterfaceType
 from core.providers.asr.base import ASRProviderBase
+from core.utils.batch_scheduler import BatchScheduler
 
 import numpy as np
 import sherpa_onnx
@@ -96,54 +96,51 @@ class ASRProvider(ASRProviderBase):
                     use_itn=True,
                 )
 
-    def read_wave(self, wave_filename: str) -> Tuple[np.ndarray, int]:
-        """
-        Args:
-        wave_filename:
-            Path to a wave file. It should be single channel and each sample should
-            be 16-bit. Its sample rate does not need to be 16kHz.
-        Returns:
-        Return a tuple containing:
-        - A 1-D array of dtype np.float32 containing the samples, which are
-        normalized to the range [-1, 1].
-        - sample rate of the wave file
-        """
-
-        with wave.open(wave_filename) as f:
-            assert f.getnchannels() == 1, f.getnchannels()
-            assert f.getsampwidth() == 2, f.getsampwidth()  # it is in bytes
-            num_samples = f.getnframes()
-            samples = f.readframes(num_samples)
-            samples_int16 = np.frombuffer(samples, dtype=np.int16)
-            samples_float32 = samples_int16.astype(np.float32)
-
-            samples_float32 = samples_float32 / 32768
-            return samples_float32, f.getframerate()
+        # 跨连接批量识别：时间窗口内说完话的多段语音合并为一次识别，batch_window_ms为0时不启用
+        batch_window_ms = config.get("batch_window_ms", 0)
+        batch_max_size = config.get("batch_max_size", 16)
+        self.batcher = None
+        if batch_window_ms and float(batch_window_ms) > 0:
+            self.batcher = BatchScheduler(
+                self.decode_batch,
+                window_ms=float(batch_window_ms),
+                max_batch_size=int(batch_max_size) if batch_max_size else 16,
+                name="asr_batch",
+            )
+
+    def decode_batch(self, pcm_list: List[bytes]) -> List[str]:
+        """一次调用识别多段音频，结果与输入顺序一致"""
+        streams = []
+        for pcm_data in pcm_list:
+            samples = np.frombuffer(pcm_data, dtype=np.int16)
+            s = self.model.create_stream()
+            s.accept_waveform(16000, samples.astype(np.float32) / 32768)
+            streams.append(s)
+        self.model.decode_streams(streams)
+        return [s.result.text for s in streams]
 
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus"
     ) -> Tuple[Optional[str], Optional[str]]:
-        """语音转文本主处理逻辑"""
+        """语音转文本主处理逻辑，直接使用内存中的PCM数据识别"""
         file_path = None
         try:
-            # 保存音频文件
-            start_time = time.time()
             if audio_format == "pcm":
                 pcm_data = opus_data
             else:
                 pcm_data = self.decode_opus(opus_data)
-            file_path = self.save_audio_to_file(pcm_data, session_id)
-            logger.bind(tag=TAG).debug(
-                f"音频文件保存耗时: {time.time() - start_time:.3f}s | 路径: {file_path}"
-            )
+
+            # 只有需要保留录音时才写文件，并在后台线程中完成
+            if not self.delete_audio_file:
+                file_path = self.save_audio_to_file_async(pcm_data, session_id)
 
             # 语音识别
             start_time = time.time()
-            s = self.model.create_stream()
-            samples, sample_rate = self.read_wave(file_path)
-            s.accept_waveform(sample_rate, samples)
-            self.model.decode_stream(s)
-            text = s.result.text
+            combined_pcm_data = b"".join(pcm_data)
+            if self.batcher:
+                text = await self.batcher.submit_async(combined_pcm_data)
+            else:
+                text = self.decode_batch([combined_pcm_data])[0]
             logger.bind(tag=TAG).debug(
                 f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
             )
@@ -153,11 +150,3 @@ class ASRProvider(ASRProviderBase):
         except Exception as e:
             logger.bind(tag=TAG).error(f"语音识别失败: {e}", exc_info=True)
             return "", file_path
-        finally:
-            # 文件清理逻辑
-            if self.delete_audio_file and file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    logger.bind(tag=TAG).debug(f"已删除临时音频文件: {file_path}")
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"文件删除失败: {file_path} | 错误: {e}")
@@ -0,0 +1,184 @@
+import os
+import time
+import asyncio
+import numpy as np
+import sherpa_onnx
+from typing import Optional, Tuple, List
+from config.logger import setup_logging
+from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.sherpa_onnx_local import CaptureOutput
+from core.handle.sendAudioHandle import send_stt_partial_message
+
+TAG = __name__
+logger = setup_logging()
+
+# 说话结束时补充的静音时长（秒），让模型输出最后几个字
+TAIL_PADDING_SECONDS = 0.66
+
+
+class OnlineSession:
+    """单个连接正在识别的一句话"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.partial_text = ""
+
+
+class ASRProvider(ASRProviderBase):
+    """
+    基于sherpa-onnx OnlineRecognizer的本地流式识别
+
+    模型在进程内只加载一次，由所有连接共享；每个连接说话时创建独立的识别流，
+    音频帧到达时即送入模型解码，VAD判断说话结束后只需处理最后一小段音频即可得到结果
+    """
+
+    def __init__(self, config: dict, delete_audio_file: bool):
+        super().__init__()
+        self.interface_type = InterfaceType.LOCAL
+        self.model_dir = config.get("model_dir")
+        self.output_dir = config.get("output_dir", "tmp/")
+        self.model_type = config.get("model_type", "zipformer")  # 支持 paraformer
+        self.delete_audio_file = delete_audio_file
+        num_threads = int(config.get("num_threads", 2))
+        # 说话过程中是否把中间识别结果发送给设备显示
+        self.send_partial = str(config.get("send_partial", True)).lower() in (
+            "true",
+            "1",
+        )
+
+        # 说话结束后等待speech_to_text取走的识别结果，按session_id保存
+        self._final_texts = {}
+
+        model_files = {
+            "tokens": os.path.join(self.model_dir, config.get("tokens", "tokens.txt")),
+            "encoder": os.path.join(
+                self.model_dir,
+                config.get("encoder", "encoder-epoch-99-avg-1.int8.onnx"),
+            ),
+            "decoder": os.path.join(
+                self.model_dir, config.get("decoder", "decoder-epoch-99-avg-1.onnx")
+            ),
+        }
+        if self.model_type != "paraformer":
+            model_files["joiner"] = os.path.join(
+                self.model_dir,
+                config.get("joiner", "joiner-epoch-99-avg-1.int8.onnx"),
+            )
+        for file_path in model_files.values():
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"模型文件不存在，请先手动下载流式模型: {file_path}")
+
+        with CaptureOutput():
+            if self.model_type == "paraformer":
+                self.model = sherpa_onnx.OnlineRecognizer.from_paraformer(
+                    tokens=model_files["tokens"],
+                    encoder=model_files["encoder"],
+                    decoder=model_files["decoder"],
+                    num_threads=num_threads,
+                    sample_rate=16000,
+                    feature_dim=80,
+                    decoding_method="greedy_search",
+                )
+            else:  # zipformer transducer
+                self.model = sherpa_onnx.OnlineRecognizer.from_transducer(
+                    tokens=model_files["tokens"],
+                    encoder=model_files["encoder"],
+                    decoder=model_files["decoder"],
+                    joiner=model_files["joiner"],
+                    num_threads=num_threads,
+                    sample_rate=16000,
+                    feature_dim=80,
+                    decoding_method="greedy_search",
+                )
+
+    def _accept_frames(self, session: OnlineSession, pcm_frames: List[bytes]) -> str:
+        """送入PCM帧并解码已就绪的部分，返回当前的中间结果"""
+        for pcm_frame in pcm_frames:
+            if not pcm_frame:
+                continue
+            samples = np.frombuffer(pcm_frame, dtype=np.int16).astype(np.float32)
+            session.stream.accept_waveform(16000, samples / 32768.0)
+        while self.model.is_ready(session.stream):
+            self.model.decode_stream(session.stream)
+        return self.model.get_result(session.stream)
+
+    def _finish(self, session: OnlineSession) -> str:
+        """说话结束，补充尾部静音后解码剩余音频，返回最终结果"""
+        tail_padding = np.zeros(int(16000 * TAIL_PADDING_SECONDS), dtype=np.float32)
+        session.stream.accept_waveform(16000, tail_padding)
+        session.stream.input_finished()
+        while self.model.is_ready(session.stream):
+            self.model.decode_stream(session.stream)
+        return self.model.get_result(session.stream)
+
+    async def receive_audio(self, conn, audio, audio_have_voice):
+        if conn.client_listen_mode == "auto" or conn.client_listen_mode == "realtime":
+            have_voice = audio_have_voice
+        else:
+            have_voice = conn.client_have_voice
+
+        if not have_voice and not conn.client_have_voice:
+            conn.asr_preroll.append(audio)
+            return
+
+        loop = asyncio.get_running_loop()
+        session = conn.asr_online_session
+        if session is None:
+            session = OnlineSession(self.model.create_stream())
+            conn.asr_online_session = session
+
+        # 开始说话时把预录音频并入本句音频，一起送入识别流
+        pcm_frames = [audio]
+        if conn.asr_preroll:
+            pcm_frames = list(conn.asr_preroll) + pcm_frames
+            conn.asr_audio.extend(conn.asr_preroll)
+            conn.asr_preroll.clear()
+        conn.asr_audio.append(audio)
+
+        partial_text = await loop.run_in_executor(
+            conn.executor, self._accept_frames, session, pcm_frames
+        )
+        if (
+            partial_text
+            and partial_text != session.partial_text
+            # 等待解码期间这句话可能已被丢弃（如检测到唤醒词）
+            and conn.asr_online_session is session
+        ):
+            session.partial_text = partial_text
+            logger.bind(tag=TAG).debug(f"中间识别结果: {partial_text}")
+            if self.send_partial and not conn.client_voice_stop:
+                await send_stt_partial_message(conn, partial_text)
+
+        if conn.client_voice_stop:
+            asr_audio_task = conn.asr_audio.copy()
+            conn.asr_audio.clear()
+            conn.reset_vad_states()
+
+            start_time = time.time()
+            text = await loop.run_in_executor(conn.executor, self._finish, session)
+            logger.bind(tag=TAG).debug(
+                f"说话结束后识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
+            )
+
+            if len(asr_audio_task) > 15:
+                self._final_texts[conn.session_id] = text
+                await self.handle_voice_stop(conn, asr_audio_task)
+            self._final_texts.pop(conn.session_id, None)
+
+    async def speech_to_text(
+        self, opus_data: List[bytes], session_id: str, audio_format="opus"
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """返回receive_audio中已经完成的识别结果"""
+        text = self._final_texts.pop(session_id, None)
+        if text is not None:
+            return text, None
+
+        # 未经过receive_audio的调用（如性能测试）按整句识别
+        if audio_format == "pcm":
+            pcm_data = opus_data
+        else:
+            pcm_data = self.decode_opus(opus_data)
+        session = OnlineSession(self.model.create_stream())
+        self._accept_frames(session, pcm_data)
+        return self._finish(session), None
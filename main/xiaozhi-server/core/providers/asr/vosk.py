@@ -1,6 +1,8 @@
 import os
 import json
 import time
+import queue
+from contextlib import contextmanager
 from typing import Optional, Tuple, List
 from .base import ASRProviderBase
 from config.logger import setup_logging
@@ -10,6 +12,36 @@ import vosk
 TAG = __name__
 logger = setup_logging()
 
+DEFAULT_POOL_SIZE = 4
+ACQUIRE_TIMEOUT = 10  # 等待空闲识别器的最长时间（秒）
+
+
+class RecognizerPool:
+    """固定大小的KaldiRecognizer池，所有识别器共享同一个模型，每句话独占一个识别器"""
+
+    def __init__(self, model, size: int, sample_rate: int = 16000):
+        self.size = max(int(size), 1)
+        self._idle = queue.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            self._idle.put(vosk.KaldiRecognizer(model, sample_rate))
+
+    @contextmanager
+    def acquire(self, timeout: float = ACQUIRE_TIMEOUT):
+        try:
+            recognizer = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"等待VOSK识别器超时（{timeout}s），当前池大小: {self.size}")
+        ok = False
+        try:
+            yield recognizer
+            ok = True
+        finally:
+            # 识别中途出错时识别器内可能残留半句音频，归还前重置
+            if not ok:
+                recognizer.Reset()
+            self._idle.put(recognizer)
+
+
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool = True):
         super().__init__()
@@ -17,10 +49,12 @@ class ASRProvider(ASRProviderBase):
         self.model_path = config.get("model_path")
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
+        # 识别器池大小，即可以同时识别的语音段数
+        self.pool_size = int(config.get("pool_size", DEFAULT_POOL_SIZE) or DEFAULT_POOL_SIZE)
         
         # 初始化VOSK模型
         self.model = None
-        self.recognizer = None
+        self.recognizers = None
         self._load_model()
         
         # 确保输出目录存在
@@ -35,10 +69,10 @@ class ASRProvider(ASRProviderBase):
             logger.bind(tag=TAG).info(f"正在加载VOSK模型: {self.model_path}")
             self.model = vosk.Model(self.model_path)
 
-            # 初始化VOSK识别器（采样率必须为16kHz）
-            self.recognizer = vosk.KaldiRecognizer(self.model, 16000)
+            # 初始化VOSK识别器池（采样率必须为16kHz）
+            self.recognizers = RecognizerPool(self.model, self.pool_size, 16000)
 
-            logger.bind(tag=TAG).info("VOSK模型加载成功")
+            logger.bind(tag=TAG).info(f"VOSK模型加载成功，识别器数量: {self.pool_size}")
         except Exception as e:
             logger.bind(tag=TAG).error(f"加载VOSK模型失败: {e}")
             raise
@@ -70,30 +104,15 @@ class ASRProvider(ASRProviderBase):
                 logger.bind(tag=TAG).warning("合并后的PCM数据为空")
                 return "", None
 
-            # 判断是否保存为WAV文件
+            # 只有需要保留录音时才写文件，并在后台线程中完成
             if not self.delete_audio_file:
-                file_path = self.save_audio_to_file(pcm_data, session_id)
+                file_path = self.save_audio_to_file_async(pcm_data, session_id)
 
             start_time = time.time()
-            
-            
-            # 进行识别（VOSK推荐每次送入2000字节的数据）
-            chunk_size = 2000
-            text_result = ""
-            
-            for i in range(0, len(combined_pcm_data), chunk_size):
-                chunk = combined_pcm_data[i:i+chunk_size]
-                if self.recognizer.AcceptWaveform(chunk):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get('text', '')
-                    if text:
-                        text_result += text + " "
-            
-            # 获取最终结果
-            final_result = json.loads(self.recognizer.FinalResult())
-            final_text = final_result.get('text', '')
-            if final_text:
-                text_result += final_text
+
+            # 从池中取出一个识别器独占使用，识别结束后归还
+            with self.recognizers.acquire() as recognizer:
+                text_result = self._recognize(recognizer, combined_pcm_data)
             
             logger.bind(tag=TAG).debug(
                 f"VOSK语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text_result.strip()}"
@@ -104,11 +123,24 @@ class ASRProvider(ASRProviderBase):
         except Exception as e:
             logger.bind(tag=TAG).error(f"VOSK语音识别失败: {e}")
             return "", None
-        finally:
-            # 文件清理逻辑
-            if self.delete_audio_file and file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    logger.bind(tag=TAG).debug(f"已删除临时音频文件: {file_path}")
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"文件删除失败: {file_path} | 错误: {e}")
+
+    @staticmethod
+    def _recognize(recognizer, pcm_data: bytes) -> str:
+        # 进行识别（VOSK推荐每次送入2000字节的数据）
+        chunk_size = 2000
+        text_result = ""
+
+        for i in range(0, len(pcm_data), chunk_size):
+            chunk = pcm_data[i:i+chunk_size]
+            if recognizer.AcceptWaveform(chunk):
+                result = json.loads(recognizer.Result())
+                text = result.get('text', '')
+                if text:
+                    text_result += text + " "
+
+        # 获取最终结果，FinalResult之后识别器可直接用于下一句
+        final_result = json.loads(recognizer.FinalResult())
+        final_text = final_result.get('text', '')
+        if final_text:
+            text_result += final_text
+        return text_result
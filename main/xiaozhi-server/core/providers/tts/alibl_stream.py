@@ -7,8 +7,10 @@ import asyncio
 import traceback
 import websockets
 from asyncio import Task
+from functools import partial
 from config.logger import setup_logging
 from core.utils import opus_encoder_utils
+from core.utils.ws_pool import get_ws_pool
 from core.utils.tts import MarkdownCleaner
 from core.providers.tts.base import TTSProviderBase
 from core.providers.tts.dto.dto import SentenceType, ContentType, InterfaceType
@@ -17,6 +19,17 @@ TAG = __name__
 logger = setup_logging()
 
 
+async def _connect(ws_url, header):
+    """建立一个已鉴权的连接，不依赖TTS实例，可交给进程内共享的连接池使用"""
+    return await websockets.connect(
+        ws_url,
+        additional_headers=header,
+        ping_interval=30,
+        ping_timeout=10,
+        close_timeout=10,
+    )
+
+
 class TTSProvider(TTSProviderBase):
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
@@ -65,6 +78,25 @@ class TTSProvider(TTSProviderBase):
             sample_rate=self.sample_rate, channels=1, frame_size_ms=60
         )
 
+        # 跨设备共享的预建连接池，ws_pool_size为0时每个设备自行建立连接
+        # 服务端约60秒无数据即断开连接
+        self.ws_pool = get_ws_pool(
+            (__name__, self.ws_url, self.api_key),
+            partial(_connect, self.ws_url, dict(self.header)),
+            config.get("ws_pool_size", 0),
+            max_idle_time=float(config.get("ws_pool_idle_timeout", 50)),
+            keep_warm_time=float(config.get("ws_pool_keep_warm", 300)),
+            name="阿里百炼流式TTS连接池",
+        )
+
+    async def open_audio_channels(self, conn):
+        await super().open_audio_channels(conn)
+        if self.ws_pool:
+            self.ws_pool.warm_up()
+
+    async def _connect(self):
+        return await _connect(self.ws_url, self.header)
+
     async def _ensure_connection(self):
         """确保WebSocket连接可用，支持60秒内连接复用"""
         try:
@@ -73,15 +105,14 @@ class TTSProvider(TTSProviderBase):
                 # 一分钟内才可以复用链接进行连续对话
                 logger.bind(tag=TAG).info(f"使用已有链接...")
                 return self.ws
+            if self.ws_pool:
+                self.ws = await self.ws_pool.acquire()
+                self.last_active_time = time.time()
+                logger.bind(tag=TAG).info("从连接池取得连接")
+                return self.ws
             logger.bind(tag=TAG).info("开始建立新连接...")
 
-            self.ws = await websockets.connect(
-                self.ws_url,
-                additional_headers=self.header,
-                ping_interval=30,
-                ping_timeout=10,
-                close_timeout=10,
-            )
+            self.ws = await self._connect()
 
             logger.bind(tag=TAG).info("WebSocket连接建立成功")
             self.last_active_time = current_time
@@ -92,88 +123,77 @@ class TTSProvider(TTSProviderBase):
             self.last_active_time = None
             raise
 
-    def tts_text_priority_thread(self):
-        """流式TTS文本处理线程"""
-        while not self.conn.stop_event.is_set():
-            try:
-                message = self.tts_text_queue.get(timeout=1)
-                logger.bind(tag=TAG).debug(
-                    f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
-                )
+    def _process_tts_text_message(self, message):
+        """流式TTS文本处理"""
+        logger.bind(tag=TAG).debug(
+            f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
+        )
 
-                if message.sentence_type == SentenceType.FIRST:
-                    self.conn.client_abort = False
+        if message.sentence_type == SentenceType.FIRST:
+            self.conn.client_abort = False
 
-                if self.conn.client_abort:
-                    try:
-                        logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                        continue
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"取消TTS会话失败: {str(e)}")
-                        continue
+        if self.conn.client_abort:
+            try:
+                logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+                return
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"取消TTS会话失败: {str(e)}")
+                return
 
-                if message.sentence_type == SentenceType.FIRST:
-                    # 初始化会话
-                    try:
-                        if not getattr(self.conn, "sentence_id", None): 
-                            self.conn.sentence_id = uuid.uuid4().hex
-                            logger.bind(tag=TAG).info(f"自动生成新的 会话ID: {self.conn.sentence_id}")
-
-                        logger.bind(tag=TAG).info("开始启动TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.start_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                        self.before_stop_play_files.clear()
-                        logger.bind(tag=TAG).info("TTS会话启动成功")
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
-                        continue
+        if message.sentence_type == SentenceType.FIRST:
+            # 初始化会话
+            try:
+                if not getattr(self.conn, "sentence_id", None): 
+                    self.conn.sentence_id = uuid.uuid4().hex
+                    logger.bind(tag=TAG).info(f"自动生成新的 会话ID: {self.conn.sentence_id}")
+
+                logger.bind(tag=TAG).info("开始启动TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.start_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
+                )
+                future.result()
+                self.before_stop_play_files.clear()
+                logger.bind(tag=TAG).info("TTS会话启动成功")
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
+                return
 
-                elif ContentType.TEXT == message.content_type:
-                    if message.content_detail:
-                        try:
-                            logger.bind(tag=TAG).debug(
-                                f"开始发送TTS文本: {message.content_detail}"
-                            )
-                            future = asyncio.run_coroutine_threadsafe(
-                                self.text_to_speak(message.content_detail, None),
-                                loop=self.conn.loop,
-                            )
-                            future.result()
-                            logger.bind(tag=TAG).debug("TTS文本发送成功")
-                        except Exception as e:
-                            logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
-                            continue
-
-                elif ContentType.FILE == message.content_type:
-                    logger.bind(tag=TAG).info(
-                        f"添加音频文件到待播放列表: {message.content_file}"
+        elif ContentType.TEXT == message.content_type:
+            if message.content_detail:
+                try:
+                    logger.bind(tag=TAG).debug(
+                        f"开始发送TTS文本: {message.content_detail}"
+                    )
+                    future = asyncio.run_coroutine_threadsafe(
+                        self.text_to_speak(message.content_detail, None),
+                        loop=self.conn.loop,
                     )
-                    if message.content_file and os.path.exists(message.content_file):
-                        # 先处理文件音频数据
-                        self._process_audio_file_stream(message.content_file, callback=lambda audio_data: self.handle_audio_file(audio_data, message.content_detail))
+                    future.result()
+                    logger.bind(tag=TAG).debug("TTS文本发送成功")
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
+                    return
 
-                if message.sentence_type == SentenceType.LAST:
-                    try:
-                        logger.bind(tag=TAG).info("开始结束TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.finish_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
-                        continue
+        elif ContentType.FILE == message.content_type:
+            logger.bind(tag=TAG).info(
+                f"添加音频文件到待播放列表: {message.content_file}"
+            )
+            if message.content_file and os.path.exists(message.content_file):
+                # 记录文件，会话结束后按播放进度解码播放
+                self.handle_audio_file(message.content_file, message.content_detail)
 
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.bind(tag=TAG).error(
-                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+        if message.sentence_type == SentenceType.LAST:
+            try:
+                logger.bind(tag=TAG).info("开始结束TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.finish_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
                 )
-                continue
+                future.result()
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
+                return
 
     async def text_to_speak(self, text, _):
         """发送文本到TTS服务进行合成"""
@@ -319,6 +339,16 @@ class TTSProvider(TTSProviderBase):
             self.ws = None
             self.last_active_time = None
 
+        # 关闭to_tts使用的常驻事件循环
+        self._close_loop()
+
+    def _release_to_pool(self):
+        """会话正常结束后把连接归还连接池"""
+        if self.ws_pool and self.ws:
+            self.ws_pool.release(self.ws)
+            self.ws = None
+            self.last_active_time = None
+
     async def _start_monitor_tts_response(self):
         """监听TTS响应"""
         try:
@@ -355,6 +385,7 @@ class TTSProvider(TTSProviderBase):
                                 logger.bind(tag=TAG).debug("TTS任务完成~")
                                 self._process_before_stop_play_files()
                                 session_finished = True
+                                self._release_to_pool()
                                 break
                             elif event == "task-failed":
                                 error_code = data["header"].get("error_code", "unknown")
@@ -392,10 +423,6 @@ class TTSProvider(TTSProviderBase):
     def to_tts(self, text: str) -> list:
         """非流式生成音频数据，用于生成音频及测试场景"""
         try:
-            # 创建事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 生成会话ID
             session_id = uuid.uuid4().hex
             # 存储音频数据
@@ -512,8 +539,7 @@ class TTSProvider(TTSProviderBase):
                         pass
 
             # 运行异步任务
-            loop.run_until_complete(_generate_audio())
-            loop.close()
+            self._run_coroutine(_generate_audio())
 
             return audio_data
 
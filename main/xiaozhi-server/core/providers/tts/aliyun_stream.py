@@ -16,6 +16,7 @@ from core.providers.tts.base import TTSProviderBase
 from core.providers.tts.dto.dto import SentenceType, ContentType, InterfaceType
 from core.utils.tts import MarkdownCleaner
 from core.utils import opus_encoder_utils, textUtils
+from core.utils.ws_pool import get_ws_pool
 from config.logger import setup_logging
 
 TAG = __name__
@@ -84,6 +85,60 @@ class AccessToken:
         return None, None
 
 
+def _create_token(access_key_id, access_key_secret):
+    """获取Token，返回(Token, 提前60秒的过期时间戳)"""
+    token, expire_time_str = AccessToken.create_token(access_key_id, access_key_secret)
+    if not expire_time_str:
+        raise ValueError("无法获取有效的Token过期时间")
+
+    expire_str = str(expire_time_str).strip()
+
+    try:
+        if expire_str.isdigit():
+            expire_time = datetime.fromtimestamp(int(expire_str))
+        else:
+            expire_time = datetime.strptime(expire_str, "%Y-%m-%dT%H:%M:%SZ")
+        expire_time = expire_time.timestamp() - 60
+    except Exception as e:
+        raise ValueError(f"无效的过期时间格式: {expire_str}") from e
+
+    if not token:
+        raise ValueError("无法获取有效的访问Token")
+    return token, expire_time
+
+
+async def _connect(ws_url, token):
+    return await websockets.connect(
+        ws_url,
+        additional_headers={"X-NLS-Token": token},
+        ping_interval=30,
+        ping_timeout=10,
+        close_timeout=10,
+    )
+
+
+def _pool_connector(ws_url, access_key_id, access_key_secret, token, expire_time):
+    """
+    连接池使用的建立连接函数，只持有服务地址和鉴权信息，不依赖TTS实例
+    连接池中的连接可能由其他设备触发建立，配置了AccessKey时在Token过期后自行刷新
+    """
+    state = {"token": token, "expire_time": expire_time}
+
+    async def connect():
+        if (
+            access_key_id
+            and access_key_secret
+            and state["expire_time"]
+            and time.time() > state["expire_time"]
+        ):
+            state["token"], state["expire_time"] = _create_token(
+                access_key_id, access_key_secret
+            )
+        return await _connect(ws_url, state["token"])
+
+    return connect
+
+
 class TTSProvider(TTSProviderBase):
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
@@ -145,30 +200,33 @@ class TTSProvider(TTSProviderBase):
             self.token = config.get("token")
             self.expire_time = None
 
+        # 跨设备共享的预建连接池，ws_pool_size为0时每个设备自行建立连接
+        # 服务端约10秒无数据即断开连接，空闲连接保留时间需小于10秒
+        self.ws_pool = get_ws_pool(
+            (__name__, self.ws_url, self.appkey, self.access_key_id or self.token),
+            _pool_connector(
+                self.ws_url,
+                self.access_key_id,
+                self.access_key_secret,
+                self.token,
+                self.expire_time,
+            ),
+            config.get("ws_pool_size", 0),
+            max_idle_time=float(config.get("ws_pool_idle_timeout", 8)),
+            keep_warm_time=float(config.get("ws_pool_keep_warm", 300)),
+            name="阿里云流式TTS连接池",
+        )
+
     def _refresh_token(self):
         """刷新Token并记录过期时间"""
         if self.access_key_id and self.access_key_secret:
-            self.token, expire_time_str = AccessToken.create_token(
+            self.token, self.expire_time = _create_token(
                 self.access_key_id, self.access_key_secret
             )
-            if not expire_time_str:
-                raise ValueError("无法获取有效的Token过期时间")
-
-            expire_str = str(expire_time_str).strip()
-
-            try:
-                if expire_str.isdigit():
-                    expire_time = datetime.fromtimestamp(int(expire_str))
-                else:
-                    expire_time = datetime.strptime(expire_str, "%Y-%m-%dT%H:%M:%SZ")
-                self.expire_time = expire_time.timestamp() - 60
-            except Exception as e:
-                raise ValueError(f"无效的过期时间格式: {expire_str}") from e
         else:
             self.expire_time = None
-
-        if not self.token:
-            raise ValueError("无法获取有效的访问Token")
+            if not self.token:
+                raise ValueError("无法获取有效的访问Token")
 
     def _is_token_expired(self):
         """检查Token是否过期"""
@@ -176,6 +234,16 @@ class TTSProvider(TTSProviderBase):
             return False
         return time.time() > self.expire_time
 
+    async def open_audio_channels(self, conn):
+        await super().open_audio_channels(conn)
+        if self.ws_pool:
+            self.ws_pool.warm_up()
+
+    async def _connect(self):
+        if self._is_token_expired():
+            self._refresh_token()
+        return await _connect(self.ws_url, self.token)
+
     async def _ensure_connection(self):
         """确保WebSocket连接可用"""
         try:
@@ -187,15 +255,14 @@ class TTSProvider(TTSProviderBase):
                 # 10秒内才可以复用链接进行连续对话
                 logger.bind(tag=TAG).info(f"使用已有链接...")
                 return self.ws
+            if self.ws_pool:
+                self.ws = await self.ws_pool.acquire()
+                self.last_active_time = time.time()
+                logger.bind(tag=TAG).info("从连接池取得连接")
+                return self.ws
             logger.bind(tag=TAG).info("开始建立新连接...")
 
-            self.ws = await websockets.connect(
-                self.ws_url,
-                additional_headers={"X-NLS-Token": self.token},
-                ping_interval=30,
-                ping_timeout=10,
-                close_timeout=10,
-            )
+            self.ws = await self._connect()
             logger.bind(tag=TAG).info("WebSocket连接建立成功")
             self.last_active_time = time.time()
             return self.ws
@@ -205,88 +272,78 @@ class TTSProvider(TTSProviderBase):
             self.last_active_time = None
             raise
 
-    def tts_text_priority_thread(self):
-        """流式文本处理线程"""
-        while not self.conn.stop_event.is_set():
-            try:
-                message = self.tts_text_queue.get(timeout=1)
-                logger.bind(tag=TAG).debug(
-                    f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
-                )
-
-                if message.sentence_type == SentenceType.FIRST:
-                    self.conn.client_abort = False
+    def _process_tts_text_message(self, message):
+        """流式文本处理"""
+        logger.bind(tag=TAG).debug(
+            f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
+        )
 
-                if self.conn.client_abort:
-                    logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                    continue
+        if message.sentence_type == SentenceType.FIRST:
+            self.conn.client_abort = False
 
-                if message.sentence_type == SentenceType.FIRST:
-                    # 初始化参数
-                    try:
-                        if not getattr(self.conn, "sentence_id", None):
-                            self.conn.sentence_id = uuid.uuid4().hex
-                            logger.bind(tag=TAG).info(
-                                f"自动生成新的 会话ID: {self.conn.sentence_id}"
-                            )
+        if self.conn.client_abort:
+            logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+            return
 
-                        # aliyunStream独有的参数生成
-                        self.message_id = str(uuid.uuid4().hex)
+        if message.sentence_type == SentenceType.FIRST:
+            # 初始化参数
+            try:
+                if not getattr(self.conn, "sentence_id", None):
+                    self.conn.sentence_id = uuid.uuid4().hex
+                    logger.bind(tag=TAG).info(
+                        f"自动生成新的 会话ID: {self.conn.sentence_id}"
+                    )
 
-                        logger.bind(tag=TAG).info("开始启动TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.start_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                        self.before_stop_play_files.clear()
-                        logger.bind(tag=TAG).info("TTS会话启动成功")
+                # aliyunStream独有的参数生成
+                self.message_id = str(uuid.uuid4().hex)
 
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
-                        continue
+                logger.bind(tag=TAG).info("开始启动TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.start_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
+                )
+                future.result()
+                self.before_stop_play_files.clear()
+                logger.bind(tag=TAG).info("TTS会话启动成功")
 
-                elif ContentType.TEXT == message.content_type:
-                    if message.content_detail:
-                        try:
-                            logger.bind(tag=TAG).debug(
-                                f"开始发送TTS文本: {message.content_detail}"
-                            )
-                            future = asyncio.run_coroutine_threadsafe(
-                                self.text_to_speak(message.content_detail, None),
-                                loop=self.conn.loop,
-                            )
-                            future.result()
-                            logger.bind(tag=TAG).debug("TTS文本发送成功")
-                        except Exception as e:
-                            logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
-                            continue
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
+                return
 
-                elif ContentType.FILE == message.content_type:
-                    logger.bind(tag=TAG).info(
-                        f"添加音频文件到待播放列表: {message.content_file}"
+        elif ContentType.TEXT == message.content_type:
+            if message.content_detail:
+                try:
+                    logger.bind(tag=TAG).debug(
+                        f"开始发送TTS文本: {message.content_detail}"
                     )
-                    if message.content_file and os.path.exists(message.content_file):
-                        # 先处理文件音频数据
-                        self._process_audio_file_stream(message.content_file, callback=lambda audio_data: self.handle_audio_file(audio_data, message.content_detail))
-                if message.sentence_type == SentenceType.LAST:
-                    try:
-                        logger.bind(tag=TAG).info("开始结束TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.finish_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
-                        continue
+                    future = asyncio.run_coroutine_threadsafe(
+                        self.text_to_speak(message.content_detail, None),
+                        loop=self.conn.loop,
+                    )
+                    future.result()
+                    logger.bind(tag=TAG).debug("TTS文本发送成功")
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
+                    return
 
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.bind(tag=TAG).error(
-                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+        elif ContentType.FILE == message.content_type:
+            logger.bind(tag=TAG).info(
+                f"添加音频文件到待播放列表: {message.content_file}"
+            )
+            if message.content_file and os.path.exists(message.content_file):
+                # 记录文件，会话结束后按播放进度解码播放
+                self.handle_audio_file(message.content_file, message.content_detail)
+        if message.sentence_type == SentenceType.LAST:
+            try:
+                logger.bind(tag=TAG).info("开始结束TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.finish_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
                 )
+                future.result()
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
+                return
 
     async def text_to_speak(self, text, _):
         try:
@@ -416,6 +473,16 @@ class TTSProvider(TTSProviderBase):
             self.ws = None
             self.last_active_time = None
 
+        # 关闭to_tts使用的常驻事件循环
+        self._close_loop()
+
+    def _release_to_pool(self):
+        """会话正常结束后把连接归还连接池"""
+        if self.ws_pool and self.ws:
+            self.ws_pool.release(self.ws)
+            self.ws = None
+            self.last_active_time = None
+
     async def _start_monitor_tts_response(self):
         """监听TTS响应"""
         try:
@@ -452,6 +519,7 @@ class TTSProvider(TTSProviderBase):
                                 logger.bind(tag=TAG).debug(f"会话结束～～")
                                 self._process_before_stop_play_files()
                                 session_finished = True
+                                self._release_to_pool()
                                 break
                         except json.JSONDecodeError:
                             logger.bind(tag=TAG).warning("收到无效的JSON消息")
@@ -480,10 +548,6 @@ class TTSProvider(TTSProviderBase):
     def to_tts(self, text: str) -> list:
         """非流式TTS处理，用于测试及保存音频文件的场景"""
         try:
-            # 创建新的事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 生成会话ID
             session_id = uuid.uuid4().hex
             # 存储音频数据
@@ -609,8 +673,7 @@ class TTSProvider(TTSProviderBase):
                     except:
                         pass
 
-            loop.run_until_complete(_generate_audio())
-            loop.close()
+            self._run_coroutine(_generate_audio())
 
             return audio_data
         except Exception as e:
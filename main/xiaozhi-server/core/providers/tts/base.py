@@ -13,10 +13,14 @@ from typing import Callable, Any
 from abc import ABC, abstractmethod
 from config.logger import setup_logging
 from core.utils.tts import MarkdownCleaner
+from core.utils.text_segmenter import TextSegmenter
+from core.utils.pipeline import AsyncQueue, run_in_thread
+from core.utils.tts_cache import TTSAudioCache, get_tts_cache
 from core.utils.output_counter import add_device_output
 from core.handle.reportHandle import enqueue_tts_report
 from core.handle.sendAudioHandle import sendAudioMessage
-from core.utils.util import audio_bytes_to_data_stream, audio_to_data_stream
+from core.utils.util import audio_bytes_to_data_stream
+from core.utils.stream_decoder import FRAME_DURATION, iter_audio_file_frames
 from core.providers.tts.dto.dto import (
     TTSMessageDTO,
     SentenceType,
@@ -27,6 +31,11 @@ from core.providers.tts.dto.dto import (
 TAG = __name__
 logger = setup_logging()
 
+MAX_BUFFERED_FRAMES = 50  # 播放长音频时音频队列中最多积压的帧数（约3秒）
+
+# 不参与缓存键计算的配置项：与合成结果无关，或是密钥类信息
+CACHE_KEY_IGNORED_CONFIG = ("output_dir", "api_key", "access_token", "secret", "secret_key", "token")
+
 
 class TTSProviderBase(ABC):
     def __init__(self, config, delete_audio_file):
@@ -69,6 +78,28 @@ class TTSProviderBase(ABC):
         self.processed_chars = 0
         self.is_first_sentence = True
 
+        # 增量分句：只扫描新追加的文本，open_audio_channels时按全局配置重新创建
+        self._segmenter = TextSegmenter(
+            self.punctuations, self.first_sentence_punctuations
+        )
+        self._segment_buff = None  # 正在分句的tts_text_buff
+        self._segment_items = 0  # 已送入分句器的文本片段数
+        self._segment_processed = 0  # 分句器同步时的processed_chars
+
+        # 需要上报的文本和音频
+        self._report_text = None
+        self._report_audio = None
+
+        # 同步合成流程中运行协程的常驻事件循环，多句话之间复用，
+        # 供应商在其中创建的HTTP会话、连接池可以跨句子、跨轮次保持
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+        # 合成结果缓存键中使用的音频参数
+        self._cache_params = {
+            k: v for k, v in config.items() if k not in CACHE_KEY_IGNORED_CONFIG
+        }
+
     def generate_filename(self, extension=".wav"):
         return os.path.join(
             self.output_file,
@@ -79,17 +110,92 @@ class TTSProviderBase(ABC):
         logger.bind(tag=TAG).debug(f"推送数据到队列里面帧数～～ {len(opus_data)}")
         self.tts_audio_queue.put((SentenceType.MIDDLE, opus_data, None))
 
-    def handle_audio_file(self, file_audio: bytes, text):
-        self.before_stop_play_files.append((file_audio, text))
+    def handle_audio_file(self, tts_file: str, text):
+        """流式TTS的音频文件需在本轮合成的语音之后播放，先记录文件，会话结束时再按播放进度解码"""
+        self.before_stop_play_files.append((tts_file, text))
+
+    def _run_coroutine(self, coro):
+        """在本实例的常驻事件循环中执行协程并返回结果，供TTS文本线程等同步流程调用"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coro)
+
+    def _close_loop(self):
+        # 合成仍在进行时不等待，事件循环随实例一起回收
+        if not self._loop_lock.acquire(blocking=False):
+            return
+        try:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+                self._loop.close()
+            self._loop = None
+        finally:
+            self._loop_lock.release()
+
+    def _get_tts_cache(self):
+        if self.conn is None:
+            return None
+        return get_tts_cache(self.conn.config)
+
+    def _output_audio_format(self):
+        """合成结果最终输出的音频格式，保留音频文件时按设备要求的格式转换"""
+        if not self.delete_audio_file and self.conn and self.conn.audio_format == "pcm":
+            return "pcm"
+        return "opus"
+
+    def _tts_cache_key(self, text, audio_format):
+        return TTSAudioCache.make_key(
+            self.__class__.__module__,
+            getattr(self, "voice", None),
+            text,
+            dict(self._cache_params, audio_format=audio_format),
+        )
 
     def to_tts_stream(self, text, opus_handler: Callable[[bytes], None] = None) -> None:
         text = MarkdownCleaner.clean_markdown(text)
+        cache = self._get_tts_cache()
+        if not (cache and cache.cacheable(text)):
+            self._to_tts_stream(text, opus_handler)
+            return None
+
+        start_time = time.monotonic()
+        key = self._tts_cache_key(text, self._output_audio_format())
+        frames = cache.get(key)
+        if frames is not None:
+            cache.record_first_audio(True, time.monotonic() - start_time)
+            self.tts_audio_queue.put((SentenceType.FIRST, None, text))
+            for frame in frames:
+                opus_handler(frame)
+            return None
+
+        collected = []
+
+        def collect_handler(frame):
+            if not collected:
+                cache.record_first_audio(False, time.monotonic() - start_time)
+            collected.append(frame)
+            opus_handler(frame)
+
+        completed = self._to_tts_stream(text, collect_handler)
+        # 合成失败、中断或被打断时只得到部分音频，不能缓存，否则之后每次都播放残缺的句子
+        if completed and collected and not (self.conn and self.conn.client_abort):
+            cache.put(key, collected)
+        return None
+
+    def _to_tts_stream(self, text, opus_handler: Callable[[bytes], None] = None) -> bool:
+        """
+        合成一句话并逐帧回调
+
+        Returns:
+            bool: 整句音频是否完整输出，失败、中断或被打断时返回False
+        """
         max_repeat_time = 5
         if self.delete_audio_file:
             # 需要删除文件的直接转为音频数据
             while max_repeat_time > 0:
                 try:
-                    audio_bytes = asyncio.run(self.text_to_speak(text, None))
+                    audio_bytes = self._run_coroutine(self.text_to_speak(text, None))
                     if audio_bytes:
                         self.tts_audio_queue.put((SentenceType.FIRST, None, text))
                         audio_bytes_to_data_stream(
@@ -98,7 +204,10 @@ class TTSProviderBase(ABC):
                             is_opus=True,
                             callback=opus_handler,
                         )
-                        break
+                        logger.bind(tag=TAG).info(
+                            f"语音生成成功: {text}，重试{5 - max_repeat_time}次"
+                        )
+                        return True
                     else:
                         max_repeat_time -= 1
                 except Exception as e:
@@ -106,21 +215,16 @@ class TTSProviderBase(ABC):
                         f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
                     )
                     max_repeat_time -= 1
-            if max_repeat_time > 0:
-                logger.bind(tag=TAG).info(
-                    f"语音生成成功: {text}，重试{5 - max_repeat_time}次"
-                )
-            else:
-                logger.bind(tag=TAG).error(
-                    f"语音生成失败: {text}，请检查网络或服务是否正常"
-                )
-            return None
+            logger.bind(tag=TAG).error(
+                f"语音生成失败: {text}，请检查网络或服务是否正常"
+            )
+            return False
         else:
             tmp_file = self.generate_filename()
             try:
                 while not os.path.exists(tmp_file) and max_repeat_time > 0:
                     try:
-                        asyncio.run(self.text_to_speak(text, tmp_file))
+                        self._run_coroutine(self.text_to_speak(text, tmp_file))
                     except Exception as e:
                         logger.bind(tag=TAG).warning(
                             f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
@@ -139,19 +243,39 @@ class TTSProviderBase(ABC):
                         f"语音生成失败: {text}，请检查网络或服务是否正常"
                     )
                     self.tts_audio_queue.put((SentenceType.FIRST, None, text))
-                self._process_audio_file_stream(tmp_file, callback=opus_handler)
+                    return False
+                return self._process_audio_file_stream(tmp_file, callback=opus_handler)
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Failed to generate TTS file: {e}")
-                return None
+                return False
     
     def to_tts(self, text):
         text = MarkdownCleaner.clean_markdown(text)
+        cache = self._get_tts_cache()
+        # 保留音频文件时返回的是文件路径，只有直接返回音频帧时才使用缓存
+        if not (cache and self.delete_audio_file and cache.cacheable(text)):
+            return self._to_tts(text)
+
+        start_time = time.monotonic()
+        key = self._tts_cache_key(text, "opus")
+        frames = cache.get(key)
+        if frames is not None:
+            cache.record_first_audio(True, time.monotonic() - start_time)
+            return list(frames)
+
+        audio_datas = self._to_tts(text)
+        if audio_datas:
+            cache.record_first_audio(False, time.monotonic() - start_time)
+            cache.put(key, audio_datas)
+        return audio_datas
+
+    def _to_tts(self, text):
         max_repeat_time = 5
         if self.delete_audio_file:
             # 需要删除文件的直接转为音频数据
             while max_repeat_time > 0:
                 try:
-                    audio_bytes = asyncio.run(self.text_to_speak(text, None))
+                    audio_bytes = self._run_coroutine(self.text_to_speak(text, None))
                     if audio_bytes:
                         audio_datas = []
                         audio_bytes_to_data_stream(
@@ -182,7 +306,7 @@ class TTSProviderBase(ABC):
             try:
                 while not os.path.exists(tmp_file) and max_repeat_time > 0:
                     try:
-                        asyncio.run(self.text_to_speak(text, tmp_file))
+                        self._run_coroutine(self.text_to_speak(text, tmp_file))
                     except Exception as e:
                         logger.bind(tag=TAG).warning(
                             f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
@@ -214,13 +338,43 @@ class TTSProviderBase(ABC):
         self, audio_file_path, callback: Callable[[Any], Any] = None
     ):
         """音频文件转换为PCM编码"""
-        return audio_to_data_stream(audio_file_path, is_opus=False, callback=callback)
+        return self._play_frames(
+            iter_audio_file_frames(audio_file_path, is_opus=False), callback
+        )
 
     def audio_to_opus_data_stream(
         self, audio_file_path, callback: Callable[[Any], Any] = None
     ):
         """音频文件转换为Opus编码"""
-        return audio_to_data_stream(audio_file_path, is_opus=True, callback=callback)
+        return self._play_frames(
+            iter_audio_file_frames(audio_file_path, is_opus=True), callback
+        )
+
+    def _play_frames(self, frames, callback: Callable[[Any], Any], paced=False) -> bool:
+        """逐帧取出音频并回调，收到打断时立即停止读取和解码，返回是否完整播放"""
+        try:
+            for frame in frames:
+                if self.conn and self.conn.client_abort:
+                    logger.bind(tag=TAG).info("收到打断信息，停止播放音频文件")
+                    return False
+                if self.conn and self.conn.stop_event.is_set():
+                    return False
+                callback(frame)
+                if paced:
+                    self._wait_audio_queue()
+            return True
+        finally:
+            frames.close()
+
+    def _wait_audio_queue(self):
+        """音频队列中积压的帧过多时等待播放，保证每路长音频只缓冲有限的帧数"""
+        audio_queue = self.tts_audio_queue
+        while audio_queue.qsize() >= MAX_BUFFERED_FRAMES:
+            if self.conn.client_abort or self.conn.stop_event.is_set():
+                return
+            # 播放端每取出一项都会通知not_full，超时只用于及时发现打断
+            with audio_queue.not_full:
+                audio_queue.not_full.wait(FRAME_DURATION / 1000)
 
     def tts_one_sentence(
         self,
@@ -252,6 +406,26 @@ class TTSProviderBase(ABC):
 
     async def open_audio_channels(self, conn):
         self.conn = conn
+        segment_config = conn.config.get("tts_segment") or {}
+        self._segmenter = TextSegmenter(
+            self.punctuations,
+            self.first_sentence_punctuations,
+            first_min_length=segment_config.get("first_min_length", 0),
+            first_max_length=segment_config.get("first_max_length", 0),
+        )
+        self._segment_buff = None
+        if conn.async_pipeline:
+            # asyncio模式：文本处理和音频播放以事件循环任务运行
+            self.tts_text_queue = AsyncQueue(conn.loop, self.tts_text_queue)
+            self.tts_audio_queue = AsyncQueue(conn.loop, self.tts_audio_queue)
+            conn.pipeline_tasks.append(
+                asyncio.create_task(self.tts_text_priority_task())
+            )
+            conn.pipeline_tasks.append(
+                asyncio.create_task(self._audio_play_priority_task())
+            )
+            return
+
         # tts 消化线程
         self.tts_priority_thread = threading.Thread(
             target=self.tts_text_priority_thread, daemon=True
@@ -264,42 +438,11 @@ class TTSProviderBase(ABC):
         )
         self.audio_play_priority_thread.start()
 
-    # 这里默认是非流式的处理方式
-    # 流式处理方式请在子类中重写
     def tts_text_priority_thread(self):
         while not self.conn.stop_event.is_set():
             try:
                 message = self.tts_text_queue.get(timeout=1)
-                if message.sentence_type == SentenceType.FIRST:
-                    self.conn.client_abort = False
-                if self.conn.client_abort:
-                    logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                    continue
-                if message.sentence_type == SentenceType.FIRST:
-                    # 初始化参数
-                    self.tts_stop_request = False
-                    self.processed_chars = 0
-                    self.tts_text_buff = []
-                    self.is_first_sentence = True
-                    self.tts_audio_first_sentence = True
-                elif ContentType.TEXT == message.content_type:
-                    self.tts_text_buff.append(message.content_detail)
-                    segment_text = self._get_segment_text()
-                    if segment_text:
-                        self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
-                elif ContentType.FILE == message.content_type:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    tts_file = message.content_file
-                    if tts_file and os.path.exists(tts_file):
-                        self._process_audio_file_stream(
-                            tts_file, callback=self.handle_opus
-                        )
-                if message.sentence_type == SentenceType.LAST:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    self.tts_audio_queue.put(
-                        (message.sentence_type, [], message.content_detail)
-                    )
-
+                self._process_tts_text_message(message)
             except queue.Empty:
                 continue
             except Exception as e:
@@ -308,12 +451,62 @@ class TTSProviderBase(ABC):
                 )
                 continue
 
+    async def tts_text_priority_task(self):
+        """asyncio模式下的TTS文本处理任务，合成等阻塞操作交给共享线程池"""
+        loop = asyncio.get_running_loop()
+        while not self.conn.stop_event.is_set():
+            try:
+                message = await self.tts_text_queue.get()
+                if message.content_type == ContentType.FILE:
+                    # 音乐等文件按播放进度解码，整首播放期间都占用线程，不放进共享线程池
+                    await run_in_thread(
+                        self._process_tts_text_message, message, name="tts_file"
+                    )
+                else:
+                    await loop.run_in_executor(
+                        self.conn.executor, self._process_tts_text_message, message
+                    )
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+                )
+                continue
+
+    # 这里默认是非流式的处理方式
+    # 流式处理方式请在子类中重写
+    def _process_tts_text_message(self, message):
+        if message.sentence_type == SentenceType.FIRST:
+            self.conn.client_abort = False
+        if self.conn.client_abort:
+            logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+            return
+        if message.sentence_type == SentenceType.FIRST:
+            # 初始化参数
+            self.tts_stop_request = False
+            self.processed_chars = 0
+            self.tts_text_buff = []
+            self.is_first_sentence = True
+            self.tts_audio_first_sentence = True
+        elif ContentType.TEXT == message.content_type:
+            self.tts_text_buff.append(message.content_detail)
+            segment_text = self._get_segment_text()
+            if segment_text:
+                self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
+        elif ContentType.FILE == message.content_type:
+            self._process_remaining_text_stream(opus_handler=self.handle_opus)
+            tts_file = message.content_file
+            if tts_file and os.path.exists(tts_file):
+                self._process_audio_file_stream(
+                    tts_file, callback=self.handle_opus, paced=True
+                )
+        if message.sentence_type == SentenceType.LAST:
+            self._process_remaining_text_stream(opus_handler=self.handle_opus)
+            self.tts_audio_queue.put((message.sentence_type, [], message.content_detail))
+
     def _audio_play_priority_thread(self):
-        # 需要上报的文本和音频列表
-        enqueue_text = None
-        enqueue_audio = None
         while not self.conn.stop_event.is_set():
-            text = None
             try:
                 try:
                     sentence_type, audio_datas, text = self.tts_audio_queue.get(
@@ -324,36 +517,54 @@ class TTSProviderBase(ABC):
                         break
                     continue
 
-                if self.conn.client_abort:
-                    logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
-                    enqueue_text, enqueue_audio = None, []
-                    continue
-
-                # 收到下一个文本开始或会话结束时进行上报
-                if sentence_type is not SentenceType.MIDDLE:
-                    # 上报TTS数据
-                    if enqueue_text is not None and enqueue_audio is not None:
-                        enqueue_tts_report(self.conn, enqueue_text, enqueue_audio)
-                    enqueue_audio = []
-                    enqueue_text = text
-
-                # 收集上报音频数据
-                if isinstance(audio_datas, bytes) and enqueue_audio is not None:
-                    enqueue_audio.append(audio_datas)
-
-                # 发送音频
                 future = asyncio.run_coroutine_threadsafe(
-                    sendAudioMessage(self.conn, sentence_type, audio_datas, text),
+                    self._play_audio_message(sentence_type, audio_datas, text),
                     self.conn.loop,
                 )
                 future.result()
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"audio_play_priority_thread: {e}")
 
-                # 记录输出和报告
-                if self.conn.max_output_size > 0 and text:
-                    add_device_output(self.conn.headers.get("device-id"), len(text))
-
+    async def _audio_play_priority_task(self):
+        """asyncio模式下的音频播放任务"""
+        while not self.conn.stop_event.is_set():
+            try:
+                sentence_type, audio_datas, text = await self.tts_audio_queue.get()
+                await self._play_audio_message(sentence_type, audio_datas, text)
+            except asyncio.CancelledError:
+                break
             except Exception as e:
-                logger.bind(tag=TAG).error(f"audio_play_priority_thread: {text} {e}")
+                logger.bind(tag=TAG).error(f"audio_play_priority_task: {e}")
+
+    async def _play_audio_message(self, sentence_type, audio_datas, text):
+        """播放一条音频消息，并在句子切换时上报上一句的文本和音频"""
+        try:
+            if self.conn.client_abort:
+                logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
+                self._report_text, self._report_audio = None, []
+                return
+
+            # 收到下一个文本开始或会话结束时进行上报
+            if sentence_type is not SentenceType.MIDDLE:
+                # 上报TTS数据
+                if self._report_text is not None and self._report_audio is not None:
+                    enqueue_tts_report(self.conn, self._report_text, self._report_audio)
+                self._report_audio = []
+                self._report_text = text
+
+            # 收集上报音频数据
+            if isinstance(audio_datas, bytes) and self._report_audio is not None:
+                self._report_audio.append(audio_datas)
+
+            # 发送音频
+            await sendAudioMessage(self.conn, sentence_type, audio_datas, text)
+
+            # 记录输出和报告
+            if self.conn.max_output_size > 0 and text:
+                add_device_output(self.conn.headers.get("device-id"), len(text))
+
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"audio_play_priority_thread: {text} {e}")
 
     async def start_session(self, session_id):
         pass
@@ -365,61 +576,65 @@ class TTSProviderBase(ABC):
         """资源清理方法"""
         if hasattr(self, "ws") and self.ws:
             await self.ws.close()
+        self._close_loop()
 
     def _get_segment_text(self):
-        # 合并当前全部文本并处理未分割部分
-        full_text = "".join(self.tts_text_buff)
-        current_text = full_text[self.processed_chars :]  # 从未处理的位置开始
-        last_punct_pos = -1
-
-        # 根据是否是第一句话选择不同的标点符号集合
-        punctuations_to_use = (
-            self.first_sentence_punctuations
-            if self.is_first_sentence
-            else self.punctuations
-        )
+        if (
+            self.tts_text_buff is not self._segment_buff
+            or self.processed_chars != self._segment_processed
+        ):
+            # 新一轮对话重置了文本缓冲，或剩余文本已在别处处理，按processed_chars重新同步
+            self._segmenter.reset()
+            new_text = "".join(self.tts_text_buff)[self.processed_chars :]
+            self._segment_buff = self.tts_text_buff
+        else:
+            # 只取新追加的文本
+            new_text = "".join(self.tts_text_buff[self._segment_items :])
+        self._segment_items = len(self.tts_text_buff)
 
-        for punct in punctuations_to_use:
-            pos = current_text.rfind(punct)
-            if (pos != -1 and last_punct_pos == -1) or (
-                pos != -1 and pos < last_punct_pos
-            ):
-                last_punct_pos = pos
-
-        if last_punct_pos != -1:
-            segment_text_raw = current_text[: last_punct_pos + 1]
-            segment_text = textUtils.get_string_no_punctuation_or_emoji(
-                segment_text_raw
-            )
+        # 根据是否是第一句话使用不同的标点符号集合
+        segment_text_raw = self._segmenter.feed(new_text, self.is_first_sentence)
+        if segment_text_raw:
             self.processed_chars += len(segment_text_raw)  # 更新已处理字符位置
+        self._segment_processed = self.processed_chars
 
-            # 如果是第一句话，在找到第一个逗号后，将标志设置为False
+        if segment_text_raw:
+            # 如果是第一句话，切分出第一段后将标志设置为False
             if self.is_first_sentence:
                 self.is_first_sentence = False
+            return textUtils.get_string_no_punctuation_or_emoji(segment_text_raw)
 
-            return segment_text
-        elif self.tts_stop_request and current_text:
-            segment_text = current_text
+        current_text = self._segmenter.pending_text
+        if self.tts_stop_request and current_text:
             self.is_first_sentence = True  # 重置标志
-            return segment_text
-        else:
-            return None
+            return current_text
+        return None
 
     def _process_audio_file_stream(
-        self, tts_file, callback: Callable[[Any], Any]
-    ) -> None:
+        self, tts_file, callback: Callable[[Any], Any], paced: bool = False
+    ) -> bool:
         """处理音频文件并转换为指定格式
 
         Args:
             tts_file: 音频文件路径
             callback: 文件处理函数
+            paced: 是否按播放进度解码，音频队列中积压的帧过多时暂停，用于音乐等长音频
+
+        Returns:
+            bool: 是否完整播放，被打断时返回False
         """
         if tts_file.endswith(".p3"):
-            p3.decode_opus_from_file_stream(tts_file, callback=callback)
-        elif self.conn.audio_format == "pcm":
-            self.audio_to_pcm_data_stream(tts_file, callback=callback)
+            if self.conn.audio_format == "pcm":
+                # 要求PCM的设备，只需把Opus数据包解码，不必重新解码原始音频
+                frames = p3.iter_pcm_from_file(tts_file)
+            else:
+                # p3文件已是Opus数据包，内存映射后逐包读取，无需解码
+                frames = p3.iter_opus_from_file(tts_file)
         else:
-            self.audio_to_opus_data_stream(tts_file, callback=callback)
+            frames = iter_audio_file_frames(
+                tts_file, is_opus=self.conn.audio_format != "pcm"
+            )
+        completed = self._play_frames(frames, callback, paced=paced)
 
         if (
             self.delete_audio_file
@@ -428,12 +643,33 @@ class TTSProviderBase(ABC):
             and tts_file.startswith(self.output_file)
         ):
             os.remove(tts_file)
+        return completed
 
     def _process_before_stop_play_files(self):
-        for audio_datas, text in self.before_stop_play_files:
-            self.tts_audio_queue.put((SentenceType.MIDDLE, audio_datas, text))
+        play_files = list(self.before_stop_play_files)
         self.before_stop_play_files.clear()
-        self.tts_audio_queue.put((SentenceType.LAST, [], None))
+        if not play_files:
+            self.tts_audio_queue.put((SentenceType.LAST, [], None))
+            return
+        # 可能在事件循环中调用，按播放进度解码会长时间阻塞，放到单独的线程中进行
+        threading.Thread(
+            target=self._play_before_stop_files,
+            args=(play_files,),
+            name="tts_file",
+            daemon=True,
+        ).start()
+
+    def _play_before_stop_files(self, play_files):
+        try:
+            for tts_file, _ in play_files:
+                if os.path.exists(tts_file):
+                    self._process_audio_file_stream(
+                        tts_file, callback=self.handle_opus, paced=True
+                    )
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"播放音频文件失败: {e}")
+        finally:
+            self.tts_audio_queue.put((SentenceType.LAST, [], None))
 
     def _process_remaining_text_stream(
         self, opus_handler: Callable[[bytes], None] = None
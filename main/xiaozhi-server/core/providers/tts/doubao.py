@@ -1,7 +1,7 @@
 import uuid
 import json
 import base64
-import requests
+from core.utils import http_client
 from core.utils.util import check_model_key
 from core.providers.tts.base import TTSProviderBase
 from config.logger import setup_logging
@@ -67,8 +67,8 @@ class TTSProvider(TTSProviderBase):
         }
 
         try:
-            resp = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
+            resp = await http_client.post(
+                self.api_url, data=json.dumps(request_json), headers=self.header
             )
             if "data" in resp.json():
                 data = resp.json()["data"]
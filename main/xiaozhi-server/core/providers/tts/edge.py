@@ -2,7 +2,14 @@ import os
 import uuid
 import edge_tts
 from datetime import datetime
+from typing import Callable
+from config.logger import setup_logging
 from core.providers.tts.base import TTSProviderBase
+from core.providers.tts.dto.dto import SentenceType
+from core.utils.stream_decoder import StreamingAudioDecoder
+
+TAG = __name__
+logger = setup_logging()
 
 
 class TTSProvider(TTSProviderBase):
@@ -20,6 +27,81 @@ class TTSProvider(TTSProviderBase):
             f"tts-{datetime.now().date()}@{uuid.uuid4().hex}{extension}",
         )
 
+    def _to_tts_stream(self, text, opus_handler: Callable[[bytes], None] = None) -> bool:
+        """
+        边合成边解码：每收到一段mp3就解码，凑够60ms立即编码推送，不等整句合成完毕
+
+        Returns:
+            bool: 整句音频是否完整输出，合成中断或被打断时返回False
+        """
+        max_repeat_time = 5
+        is_opus = self._output_audio_format() == "opus"
+        while max_repeat_time > 0:
+            output_file = None if self.delete_audio_file else self.generate_filename()
+            first_frame = True
+
+            def frame_handler(frame):
+                nonlocal first_frame
+                if first_frame:
+                    self.tts_audio_queue.put((SentenceType.FIRST, None, text))
+                    first_frame = False
+                opus_handler(frame)
+
+            decoder = StreamingAudioDecoder(
+                frame_handler, input_format=self.audio_file_type, is_opus=is_opus
+            )
+            try:
+                completed = self._run_coroutine(
+                    self._stream_to_decoder(text, decoder, output_file)
+                )
+                if completed:
+                    logger.bind(tag=TAG).info(
+                        f"语音生成成功: {text}，重试{5 - max_repeat_time}次"
+                    )
+                return completed
+            except Exception as e:
+                if decoder.frame_count:
+                    # 已经推送了部分音频，重试会导致重复播放
+                    logger.bind(tag=TAG).error(f"语音生成中断: {text}，错误: {e}")
+                    return False
+                logger.bind(tag=TAG).warning(
+                    f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
+                )
+                if output_file and os.path.exists(output_file):
+                    os.remove(output_file)
+                max_repeat_time -= 1
+        logger.bind(tag=TAG).error(f"语音生成失败: {text}，请检查网络或服务是否正常")
+        return False
+
+    async def _stream_to_decoder(
+        self, text, decoder: StreamingAudioDecoder, output_file
+    ) -> bool:
+        """把合成的音频送入解码器，返回是否完整合成，被打断时返回False"""
+        communicate = edge_tts.Communicate(text, voice=self.voice)
+        await decoder.start()
+        file = None
+        try:
+            if output_file:
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                file = open(output_file, "wb")
+            async for chunk in communicate.stream():
+                if self.conn and self.conn.client_abort:
+                    logger.bind(tag=TAG).info("收到打断信息，停止Edge TTS合成")
+                    await decoder.abort()
+                    return False
+                if chunk["type"] == "audio":
+                    await decoder.feed(chunk["data"])
+                    if file:
+                        file.write(chunk["data"])
+            await decoder.finish()
+            return True
+        except BaseException:
+            await decoder.abort()
+            raise
+        finally:
+            if file:
+                file.close()
+
     async def text_to_speak(self, text, output_file):
         try:
             communicate = edge_tts.Communicate(text, voice=self.voice)
@@ -36,11 +118,11 @@ class TTSProvider(TTSProviderBase):
                             f.write(chunk["data"])
             else:
                 # 返回音频二进制数据
-                audio_bytes = b""
+                audio_chunks = []
                 async for chunk in communicate.stream():
                     if chunk["type"] == "audio":
-                        audio_bytes += chunk["data"]
-                return audio_bytes
+                        audio_chunks.append(chunk["data"])
+                return b"".join(audio_chunks)
         except Exception as e:
             error_msg = f"Edge TTS请求失败: {e}"
-            raise Exception(error_msg)  # 抛出异常，让调用方捕获
\ No newline at end of file
+            raise Exception(error_msg)  # 抛出异常，让调用方捕获
@@ -1,4 +1,4 @@
-import requests
+from core.utils import http_client
 from config.logger import setup_logging
 from core.providers.tts.base import TTSProviderBase
 from core.utils.util import parse_string_to_list
@@ -90,7 +90,7 @@ class TTSProvider(TTSProviderBase):
             "repetition_penalty": self.repetition_penalty,
         }
 
-        resp = requests.post(self.url, json=request_json)
+        resp = await http_client.post(self.url, json=request_json)
         if resp.status_code == 200:
             if output_file:
                 with open(output_file, "wb") as file:
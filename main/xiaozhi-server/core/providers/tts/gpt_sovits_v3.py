@@ -1,4 +1,4 @@
-import requests
+from core.utils import http_client
 from config.logger import setup_logging
 from core.providers.tts.base import TTSProviderBase
 from core.utils.util import parse_string_to_list
@@ -51,7 +51,7 @@ class TTSProvider(TTSProviderBase):
             "if_sr": self.if_sr,
         }
 
-        resp = requests.get(self.url, params=request_params)
+        resp = await http_client.get(self.url, params=request_params)
         if resp.status_code == 200:
             if output_file:
                 with open(output_file, "wb") as file:
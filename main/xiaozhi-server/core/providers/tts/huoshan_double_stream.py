@@ -4,12 +4,14 @@ import json
 import queue
 import asyncio
 import traceback
+from functools import partial
 from typing import Callable, Any
 import websockets
 from core.utils.tts import MarkdownCleaner
 from config.logger import setup_logging
 from core.utils import opus_encoder_utils
 from core.utils.util import check_model_key
+from core.utils.ws_pool import get_ws_pool
 from core.providers.tts.base import TTSProviderBase
 from core.providers.tts.dto.dto import SentenceType, ContentType, InterfaceType
 from asyncio import Task
@@ -139,6 +141,19 @@ class Response:
         return super().__str__()
 
 
+async def _connect(ws_url, app_id, access_token, resource_id):
+    """建立一个已鉴权的连接，不依赖TTS实例，可交给进程内共享的连接池使用"""
+    ws_header = {
+        "X-Api-App-Key": app_id,
+        "X-Api-Access-Key": access_token,
+        "X-Api-Resource-Id": resource_id,
+        "X-Api-Connect-Id": uuid.uuid4(),
+    }
+    return await websockets.connect(
+        ws_url, additional_headers=ws_header, max_size=1000000000
+    )
+
+
 class TTSProvider(TTSProviderBase):
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
@@ -170,31 +185,45 @@ class TTSProvider(TTSProviderBase):
         model_key_msg = check_model_key("TTS", self.access_token)
         if model_key_msg:
             logger.bind(tag=TAG).error(model_key_msg)
+        # 跨设备共享的预建连接池，ws_pool_size为0时每个设备自行建立连接
+        self.ws_pool = get_ws_pool(
+            (__name__, self.ws_url, self.appId, self.access_token, self.resource_id),
+            partial(
+                _connect, self.ws_url, self.appId, self.access_token, self.resource_id
+            ),
+            config.get("ws_pool_size", 0),
+            max_idle_time=float(config.get("ws_pool_idle_timeout", 50)),
+            keep_warm_time=float(config.get("ws_pool_keep_warm", 300)),
+            name="火山双流式TTS连接池",
+        )
 
     async def open_audio_channels(self, conn):
         try:
             await super().open_audio_channels(conn)
+            if self.ws_pool:
+                self.ws_pool.warm_up()
         except Exception as e:
             logger.bind(tag=TAG).error(f"Failed to open audio channels: {str(e)}")
             self.ws = None
             raise
 
+    async def _connect(self):
+        return await _connect(
+            self.ws_url, self.appId, self.access_token, self.resource_id
+        )
+
     async def _ensure_connection(self):
         """建立新的WebSocket连接"""
         try:
             if self.ws:
                 logger.bind(tag=TAG).info(f"使用已有链接...")
                 return self.ws
+            if self.ws_pool:
+                self.ws = await self.ws_pool.acquire()
+                logger.bind(tag=TAG).info("从连接池取得连接")
+                return self.ws
             logger.bind(tag=TAG).info("开始建立新连接...")
-            ws_header = {
-                "X-Api-App-Key": self.appId,
-                "X-Api-Access-Key": self.access_token,
-                "X-Api-Resource-Id": self.resource_id,
-                "X-Api-Connect-Id": uuid.uuid4(),
-            }
-            self.ws = await websockets.connect(
-                self.ws_url, additional_headers=ws_header, max_size=1000000000
-            )
+            self.ws = await self._connect()
             logger.bind(tag=TAG).info("WebSocket连接建立成功")
             return self.ws
         except Exception as e:
@@ -202,91 +231,80 @@ class TTSProvider(TTSProviderBase):
             self.ws = None
             raise
 
-    def tts_text_priority_thread(self):
-        """火山引擎双流式TTS的文本处理线程"""
-        while not self.conn.stop_event.is_set():
+    def _process_tts_text_message(self, message):
+        """火山引擎双流式TTS的文本处理"""
+        logger.bind(tag=TAG).debug(
+            f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
+        )
+
+        if message.sentence_type == SentenceType.FIRST:
+            self.conn.client_abort = False
+
+        if self.conn.client_abort:
             try:
-                message = self.tts_text_queue.get(timeout=1)
-                logger.bind(tag=TAG).debug(
-                    f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
+                logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+                asyncio.run_coroutine_threadsafe(
+                    self.cancel_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
                 )
+                return
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"取消TTS会话失败: {str(e)}")
+                return
 
-                if message.sentence_type == SentenceType.FIRST:
-                    self.conn.client_abort = False
-
-                if self.conn.client_abort:
-                    try:
-                        logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                        asyncio.run_coroutine_threadsafe(
-                            self.cancel_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        continue
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"取消TTS会话失败: {str(e)}")
-                        continue
+        if message.sentence_type == SentenceType.FIRST:
+            # 初始化参数
+            try:
+                if not getattr(self.conn, "sentence_id", None): 
+                    self.conn.sentence_id = uuid.uuid4().hex
+                    logger.bind(tag=TAG).info(f"自动生成新的 会话ID: {self.conn.sentence_id}")
+
+                logger.bind(tag=TAG).info("开始启动TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.start_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
+                )
+                future.result()
+                self.before_stop_play_files.clear()
+                logger.bind(tag=TAG).info("TTS会话启动成功")
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
+                return
 
-                if message.sentence_type == SentenceType.FIRST:
-                    # 初始化参数
-                    try:
-                        if not getattr(self.conn, "sentence_id", None): 
-                            self.conn.sentence_id = uuid.uuid4().hex
-                            logger.bind(tag=TAG).info(f"自动生成新的 会话ID: {self.conn.sentence_id}")
-
-                        logger.bind(tag=TAG).info("开始启动TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.start_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                        self.before_stop_play_files.clear()
-                        logger.bind(tag=TAG).info("TTS会话启动成功")
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"启动TTS会话失败: {str(e)}")
-                        continue
-
-                elif ContentType.TEXT == message.content_type:
-                    if message.content_detail:
-                        try:
-                            logger.bind(tag=TAG).debug(
-                                f"开始发送TTS文本: {message.content_detail}"
-                            )
-                            future = asyncio.run_coroutine_threadsafe(
-                                self.text_to_speak(message.content_detail, None),
-                                loop=self.conn.loop,
-                            )
-                            future.result()
-                            logger.bind(tag=TAG).debug("TTS文本发送成功")
-                        except Exception as e:
-                            logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
-                            continue
-
-                elif ContentType.FILE == message.content_type:
-                    logger.bind(tag=TAG).info(
-                        f"添加音频文件到待播放列表: {message.content_file}"
+        elif ContentType.TEXT == message.content_type:
+            if message.content_detail:
+                try:
+                    logger.bind(tag=TAG).debug(
+                        f"开始发送TTS文本: {message.content_detail}"
                     )
-                    if message.content_file and os.path.exists(message.content_file):
-                        # 先处理文件音频数据
-                        self._process_audio_file_stream(message.content_file, callback=lambda audio_data: self.handle_audio_file(audio_data, message.content_detail))
-                if message.sentence_type == SentenceType.LAST:
-                    try:
-                        logger.bind(tag=TAG).info("开始结束TTS会话...")
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.finish_session(self.conn.sentence_id),
-                            loop=self.conn.loop,
-                        )
-                        future.result()
-                    except Exception as e:
-                        logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
-                        continue
+                    future = asyncio.run_coroutine_threadsafe(
+                        self.text_to_speak(message.content_detail, None),
+                        loop=self.conn.loop,
+                    )
+                    future.result()
+                    logger.bind(tag=TAG).debug("TTS文本发送成功")
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
+                    return
 
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.bind(tag=TAG).error(
-                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+        elif ContentType.FILE == message.content_type:
+            logger.bind(tag=TAG).info(
+                f"添加音频文件到待播放列表: {message.content_file}"
+            )
+            if message.content_file and os.path.exists(message.content_file):
+                # 记录文件，会话结束后按播放进度解码播放
+                self.handle_audio_file(message.content_file, message.content_detail)
+        if message.sentence_type == SentenceType.LAST:
+            try:
+                logger.bind(tag=TAG).info("开始结束TTS会话...")
+                future = asyncio.run_coroutine_threadsafe(
+                    self.finish_session(self.conn.sentence_id),
+                    loop=self.conn.loop,
                 )
-                continue
+                future.result()
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"结束TTS会话失败: {str(e)}")
+                return
 
     async def text_to_speak(self, text, _):
         """发送文本到TTS服务"""
@@ -423,6 +441,15 @@ class TTSProvider(TTSProviderBase):
                 pass
             self.ws = None
 
+        # 关闭to_tts使用的常驻事件循环
+        self._close_loop()
+
+    def _release_to_pool(self):
+        """会话正常结束后把连接归还连接池"""
+        if self.ws_pool and self.ws:
+            self.ws_pool.release(self.ws)
+            self.ws = None
+
     async def _start_monitor_tts_response(self):
         """监听TTS响应"""
         try:
@@ -437,6 +464,7 @@ class TTSProvider(TTSProviderBase):
                     if res.optional.event == EVENT_SessionCanceled:
                         logger.bind(tag=TAG).debug(f"释放服务端资源成功～～")
                         session_finished = True
+                        self._release_to_pool()
                         break
                     elif res.optional.event == EVENT_TTSSentenceStart:
                         json_data = json.loads(res.payload.decode("utf-8"))
@@ -456,6 +484,7 @@ class TTSProvider(TTSProviderBase):
                         logger.bind(tag=TAG).debug(f"会话结束～～")
                         self._process_before_stop_play_files()
                         session_finished = True
+                        self._release_to_pool()
                         break
                 except websockets.ConnectionClosed:
                     logger.bind(tag=TAG).warning("WebSocket连接已关闭")
@@ -637,10 +666,6 @@ class TTSProvider(TTSProviderBase):
             list: 音频数据列表
         """
         try:
-            # 创建事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 生成会话ID
             session_id = uuid.uuid4().__str__().replace("-", "")
 
@@ -721,8 +746,7 @@ class TTSProvider(TTSProviderBase):
                         pass
 
             # 运行异步任务
-            loop.run_until_complete(_generate_audio())
-            loop.close()
+            self._run_coroutine(_generate_audio())
 
             return audio_data
 
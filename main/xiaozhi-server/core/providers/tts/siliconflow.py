@@ -1,4 +1,4 @@
-import requests
+from core.utils import http_client
 from core.providers.tts.base import TTSProviderBase
 
 
@@ -32,7 +32,7 @@ class TTSProvider(TTSProviderBase):
             "Content-Type": "application/json",
         }
         try:
-            response = requests.request(
+            response = await http_client.request(
                 "POST", self.api_url, json=request_json, headers=headers
             )
             data = response.content
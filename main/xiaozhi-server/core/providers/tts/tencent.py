@@ -4,7 +4,7 @@ import time
 import uuid
 import json
 import base64
-import requests
+from core.utils import http_client
 from datetime import datetime, timezone
 from core.providers.tts.base import TTSProviderBase
 
@@ -134,8 +134,8 @@ class TTSProvider(TTSProviderBase):
             headers = self._get_auth_headers(request_json)
 
             # 发送请求
-            resp = requests.post(
-                self.api_url, json.dumps(request_json), headers=headers
+            resp = await http_client.post(
+                self.api_url, data=json.dumps(request_json), headers=headers
             )
 
             # 检查响应
@@ -5,5 +5,9 @@ from typing import Optional
 class VADProviderBase(ABC):
     @abstractmethod
     def is_vad(self, conn, data) -> bool:
-        """检测音频数据中的语音活动"""
+        """检测音频数据中的语音活动，data为已解码的16kHz单声道PCM帧"""
         pass
+
+    async def is_vad_async(self, conn, data) -> bool:
+        """检测音频数据中的语音活动，支持批量推理的实现可以重写此方法"""
+        return self.is_vad(conn, data)
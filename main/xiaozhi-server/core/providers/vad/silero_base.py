@@ -0,0 +1,204 @@
+"""
+Silero VAD的公共逻辑
+
+torch和onnxruntime两种实现共用配置解析、分片切分、能量门限、双阈值判断和跨连接批量推理，
+子类只需实现模型加载、会话循环状态的创建和批量推理（_run_batch）。
+"""
+
+import time
+import threading
+import numpy as np
+from config.logger import setup_logging
+from core.providers.vad.base import VADProviderBase
+from core.utils.batch_scheduler import BatchScheduler
+
+TAG = __name__
+logger = setup_logging()
+
+# Silero模型每次处理512个采样点，并需要保留64个采样点的上下文
+CHUNK_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+STATE_SHAPE = (2, 1, 128)
+
+
+class SileroVADSessionBase:
+    """
+    单个连接的VAD会话
+
+    模型权重由所有连接共享，但模型的循环状态（state/context）属于各个连接，
+    避免不同设备的音频状态相互串扰
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.state = None
+        self.context = None
+        # 预分配的分片缓冲区，每个分片复用同一块内存
+        chunk_bytes = bytearray(CHUNK_SAMPLES * 2)
+        self.chunk_view = memoryview(chunk_bytes)
+        self.chunk_int16 = np.frombuffer(chunk_bytes, dtype=np.int16)
+        self.chunk_float = np.empty(CHUNK_SAMPLES, dtype=np.float32)
+        # 每次重置加一，推理期间会话被重置时不再写回推理前的状态
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        """清空模型循环状态，下一个分片从静音状态开始推理"""
+        # 与批量推理写回状态使用同一把锁，进行中的批次不会覆盖刚重置的状态
+        with self.owner._model_lock:
+            self.generation += 1
+            self.state, self.context = self._initial_state()
+
+    def _initial_state(self):
+        """返回(state, context)的初始值"""
+        raise NotImplementedError
+
+
+class SileroVADProviderBase(VADProviderBase):
+    session_class = SileroVADSessionBase
+
+    def __init__(self, config):
+        # 保护各会话循环状态的读取和写回，会话重置时同样需要持有
+        self._model_lock = threading.Lock()
+
+        # 处理空字符串的情况
+        threshold = config.get("threshold", "0.5")
+        threshold_low = config.get("threshold_low", "0.2")
+        min_silence_duration_ms = config.get("min_silence_duration_ms", "1000")
+
+        self.vad_threshold = float(threshold) if threshold else 0.5
+        self.vad_threshold_low = float(threshold_low) if threshold_low else 0.2
+
+        self.silence_threshold_ms = (
+            int(min_silence_duration_ms) if min_silence_duration_ms else 1000
+        )
+
+        # 至少要多少帧才算有语音
+        self.frame_window_threshold = 3
+
+        # 能量门限（分片均方根，满幅为1），低于该值的分片直接判定为静音，不进行模型推理，0为不启用
+        energy_threshold = config.get("energy_threshold", 0)
+        self.energy_threshold = float(energy_threshold) if energy_threshold else 0.0
+        self._energy_limit = self.energy_threshold**2 * CHUNK_SAMPLES
+
+        # 跨连接批量推理，batch_window_ms为0时不启用
+        batch_window_ms = config.get("batch_window_ms", 0)
+        batch_max_size = config.get("batch_max_size", 64)
+        self.batcher = None
+        if batch_window_ms and float(batch_window_ms) > 0:
+            self.batcher = BatchScheduler(
+                self._run_batch,
+                window_ms=float(batch_window_ms),
+                max_batch_size=int(batch_max_size) if batch_max_size else 64,
+                name="vad_batch",
+            )
+            logger.bind(tag=TAG).info(
+                f"VAD批量推理已启用: 窗口{batch_window_ms}ms, 单批最多{batch_max_size}个分片"
+            )
+
+    def _get_session(self, conn):
+        """获取连接的VAD会话，不存在或VAD模块已更换时重新创建"""
+        session = conn.vad_session
+        if session is None or session.owner is not self:
+            session = self.session_class(self)
+            conn.vad_session = session
+        return session
+
+    def _iter_chunks(self, conn, pcm_frame):
+        """将PCM帧按512采样点切分，逐个产出float32分片
+
+        产出的分片是会话内复用的缓冲区，调用方需在取下一个分片前用完
+        """
+        session = self._get_session(conn)
+        audio_buffer = conn.client_audio_buffer
+        audio_buffer.write(pcm_frame)  # 将新数据加入缓冲区
+
+        # 处理缓冲区中的完整帧（每次处理512采样点）
+        while len(audio_buffer) >= CHUNK_SAMPLES * 2:
+            # 取出前512个采样点（1024字节）
+            audio_buffer.read_into(session.chunk_view)
+
+            # 转换为模型需要的格式
+            np.divide(session.chunk_int16, 32768.0, out=session.chunk_float)
+            yield session.chunk_float
+
+    def _is_below_energy_gate(self, audio_float32):
+        """分片能量是否低于门限，低于门限时视为明显静音"""
+        if self.energy_threshold <= 0:
+            return False
+        return float(np.dot(audio_float32, audio_float32)) < self._energy_limit
+
+    def _update_voice_state(self, conn, speech_prob):
+        """根据语音概率更新连接的说话状态，返回当前是否有声音"""
+        # 双阈值判断
+        if speech_prob >= self.vad_threshold:
+            is_voice = True
+        elif speech_prob <= self.vad_threshold_low:
+            is_voice = False
+        else:
+            is_voice = conn.last_is_voice
+
+        # 声音没低于最低值则延续前一个状态，判断为有声音
+        conn.last_is_voice = is_voice
+
+        # 更新滑动窗口
+        conn.client_voice_window.append(is_voice)
+        client_have_voice = (
+            conn.client_voice_window.count(True) >= self.frame_window_threshold
+        )
+
+        # 如果之前有声音，但本次没有声音，且与上次有声音的时间差已经超过了静默阈值，则认为已经说完一句话
+        if conn.client_have_voice and not client_have_voice:
+            stop_duration = time.time() * 1000 - conn.last_activity_time
+            if stop_duration >= self.silence_threshold_ms:
+                conn.client_voice_stop = True
+        if client_have_voice:
+            conn.client_have_voice = True
+            conn.last_activity_time = time.time() * 1000
+
+        return client_have_voice
+
+    def is_vad(self, conn, pcm_frame):
+        try:
+            client_have_voice = False
+            session = self._get_session(conn)
+            for audio_float32 in self._iter_chunks(conn, pcm_frame):
+                # 明显静音的分片跳过模型推理，但仍参与静默时长计算
+                if self._is_below_energy_gate(audio_float32):
+                    speech_prob = 0.0
+                else:
+                    # 检测语音活动
+                    speech_prob = self._run_batch([(session, audio_float32)])[0]
+                client_have_voice = self._update_voice_state(conn, speech_prob)
+
+            return client_have_voice
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
+
+    async def is_vad_async(self, conn, pcm_frame):
+        if self.batcher is None:
+            return self.is_vad(conn, pcm_frame)
+        try:
+            client_have_voice = False
+            session = self._get_session(conn)
+            for audio_float32 in self._iter_chunks(conn, pcm_frame):
+                if self._is_below_energy_gate(audio_float32):
+                    speech_prob = 0.0
+                else:
+                    speech_prob = await self.batcher.submit_async(
+                        (session, audio_float32)
+                    )
+                client_have_voice = self._update_voice_state(conn, speech_prob)
+
+            return client_have_voice
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
+
+    def _run_batch(self, items):
+        """
+        批量推理多个连接的分片
+
+        items为(会话, 分片)列表，按相同顺序返回语音概率列表，
+        并把推理后的循环状态按会话写回，保证各连接的状态互不影响
+        """
+        raise NotImplementedError
@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import onnxruntime
+from config.logger import setup_logging
+from core.providers.vad.silero_base import (
+    CHUNK_SAMPLES,
+    CONTEXT_SAMPLES,
+    STATE_SHAPE,
+    SileroVADProviderBase,
+    SileroVADSessionBase,
+)
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_MODEL_PATH = "models/snakers4_silero-vad/src/silero_vad/data/silero_vad.onnx"
+
+
+class SileroOnnxVADSession(SileroVADSessionBase):
+    def _initial_state(self):
+        return (
+            np.zeros(STATE_SHAPE, dtype=np.float32),
+            np.zeros((1, CONTEXT_SAMPLES), dtype=np.float32),
+        )
+
+
+class VADProvider(SileroVADProviderBase):
+    """
+    基于onnxruntime运行Silero VAD的ONNX模型，不依赖torch
+
+    阈值配置和判断逻辑与silero类型保持一致，可直接替换
+    """
+
+    session_class = SileroOnnxVADSession
+
+    def __init__(self, config):
+        logger.bind(tag=TAG).info("SileroVAD(ONNX)", config)
+        model_path = config.get("model_path") or DEFAULT_MODEL_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"VAD模型文件不存在: {model_path}")
+
+        # 模型很小，单线程推理即可，避免多个推理抢占CPU
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.sample_rate = np.array(16000, dtype=np.int64)
+        super().__init__(config)
+
+    def _run_batch(self, items):
+        """
+        批量推理多个连接的分片
+
+        items为(会话, 分片)列表，模型输入为[上下文 + 分片]，
+        推理后的循环状态和最后64个采样点按会话写回
+        """
+        chunks = np.stack([chunk for _, chunk in items])
+        with self._model_lock:
+            generations = [s.generation for s, _ in items]
+            contexts = np.concatenate([s.context for s, _ in items], axis=0)
+            state = np.concatenate([s.state for s, _ in items], axis=1)
+        audio_batch = np.concatenate([contexts, chunks], axis=1)
+        # 循环状态随输入传入，InferenceSession本身可以被多个线程同时调用，推理时不持锁
+        out, new_state = self.session.run(
+            None, {"input": audio_batch, "state": state, "sr": self.sample_rate}
+        )
+
+        with self._model_lock:
+            for i, (session, _) in enumerate(items):
+                if session.generation != generations[i]:
+                    # 推理期间会话已被重置
+                    continue
+                session.state = new_state[:, i : i + 1].copy()
+                session.context = audio_batch[i : i + 1, -CONTEXT_SAMPLES:].copy()
+        return out[:, 0].tolist()
@@ -0,0 +1,188 @@
+"""
+音频发送节奏调度器
+
+每个事件循环只有一个调度器，用一个按固定刻度划分的时间轮记录各连接下一帧的发送时间，
+由同一个定时器在每个刻度到期时把所有到期连接的音频帧一起发出，
+不再为每个连接的每一帧单独调用asyncio.sleep，连接数增加时事件循环的唤醒次数不随之增加。
+每段音频开始播放时的前几帧立即发送，作为设备端的预缓冲。
+"""
+
+import math
+import asyncio
+import weakref
+from collections import deque
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 时间轮每格时长（毫秒），同一格内到期的帧合并为一次唤醒发送，也是发送时间的最大延后量
+TICK_MS = 20
+# 每段音频开始时立即发送的帧数（预缓冲）
+PRE_BUFFER_FRAMES = 3
+# 每个连接最多排队的帧数，超过后enqueue等待，避免生产端一次性把整首歌塞进内存
+MAX_QUEUED_FRAMES = 50
+
+# 发送缓冲区超过该字节数的连接不在调度器中直接发送（websockets默认在64KB时才等待缓冲区排空）
+MAX_INLINE_WRITE_BUFFER = 16 * 1024
+
+_pacers = weakref.WeakKeyDictionary()  # 事件循环 -> AudioPacer
+
+
+class _Stream:
+    """单个连接的发送状态"""
+
+    __slots__ = (
+        "frames",
+        "frame_duration",
+        "start_time",
+        "packet_index",
+        "sequence",
+        "scheduled",
+        "drained",
+        "space",
+    )
+
+    def __init__(self, frame_duration):
+        self.frames = deque()
+        self.frame_duration = frame_duration / 1000
+        self.start_time = 0.0
+        self.packet_index = 0  # 本段音频内的帧序号，用于计算发送时间和时间戳
+        self.sequence = 0  # 连接内连续递增的序列号
+        self.scheduled = False  # 是否已在时间轮中或正在发送
+        self.drained = None  # 队列发完时完成的Future
+        self.space = None  # 队列有空位时完成的Future
+
+    def due_time(self):
+        return self.start_time + max(self.packet_index - PRE_BUFFER_FRAMES, 0) * self.frame_duration
+
+    def wake(self, attr):
+        future = getattr(self, attr)
+        if future is not None:
+            setattr(self, attr, None)
+            if not future.done():
+                future.set_result(None)
+
+
+def _write_buffer_size(conn) -> int:
+    transport = getattr(conn.websocket, "transport", None)
+    if transport is None:
+        return 0
+    try:
+        return transport.get_write_buffer_size()
+    except Exception:
+        return 0
+
+
+class AudioPacer:
+    def __init__(self, loop, send_frame):
+        """
+        Args:
+            loop: 所属事件循环
+            send_frame: 发送一帧的协程函数，参数为(conn, packet, start_time, packet_index, sequence)
+        """
+        self._loop = loop
+        self._send_frame = send_frame
+        self._tick = TICK_MS / 1000
+        self._streams = weakref.WeakKeyDictionary()  # 连接 -> _Stream
+        self._wheel = {}  # 刻度序号 -> 到期的(连接, 发送状态)列表
+        self._timer = None
+        self._timer_slot = None
+        self.wakeups = 0  # 定时器触发次数，便于统计
+
+    async def enqueue(self, conn, frames, frame_duration=60):
+        """把一组音频帧加入连接的发送队列，队列已满时等待"""
+        stream = self._streams.get(conn)
+        if stream is None:
+            stream = self._streams[conn] = _Stream(frame_duration)
+        while len(stream.frames) >= MAX_QUEUED_FRAMES and not conn.client_abort:
+            if stream.space is None:
+                stream.space = self._loop.create_future()
+            await stream.space
+        if conn.client_abort:
+            return
+
+        if not stream.scheduled:
+            # 空闲后重新开始的音频，或者生产端跟不上实时节奏时，从当前时间重新计时并预缓冲
+            now = self._loop.time()
+            if stream.due_time() < now:
+                stream.start_time = now
+                stream.packet_index = 0
+        stream.frames.extend(frames)
+        if not stream.scheduled:
+            stream.scheduled = True
+            self._schedule(conn, stream)
+
+    async def wait_sent(self, conn):
+        """等待连接已排队的音频全部发出（或被打断丢弃）"""
+        stream = self._streams.get(conn)
+        if stream is None or not stream.scheduled:
+            return
+        if stream.drained is None:
+            stream.drained = self._loop.create_future()
+        await stream.drained
+
+    def _schedule(self, conn, stream):
+        slot = math.ceil(stream.due_time() / self._tick)
+        self._wheel.setdefault(slot, []).append((conn, stream))
+        if self._timer is None or slot < self._timer_slot:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer_slot = slot
+            self._timer = self._loop.call_at(slot * self._tick, self._on_tick)
+
+    def _on_tick(self):
+        self._timer = None
+        self.wakeups += 1
+        # 定时器可能按时钟精度略早触发，按所在刻度的时间计算到期
+        now = max(self._loop.time(), self._timer_slot * self._tick)
+        current = math.floor(now / self._tick + 1e-6)
+        streams = []
+        for slot in sorted(s for s in self._wheel if s <= current):
+            streams.extend(self._wheel.pop(slot))
+        if self._wheel:
+            slot = min(self._wheel)
+            self._timer_slot = slot
+            self._timer = self._loop.call_at(slot * self._tick, self._on_tick)
+        if streams:
+            self._loop.create_task(self._send_due(streams, now))
+
+    async def _send_due(self, streams, now):
+        # 依次发送开销最小；发送缓冲区已积压的连接可能在发送时等待，单独发送以免阻塞其它连接
+        for conn, stream in streams:
+            if _write_buffer_size(conn) > MAX_INLINE_WRITE_BUFFER:
+                self._loop.create_task(self._send_stream(conn, stream, now))
+            else:
+                await self._send_stream(conn, stream, now)
+
+    async def _send_stream(self, conn, stream, now):
+        try:
+            while stream.frames and not conn.client_abort and stream.due_time() <= now:
+                packet = stream.frames.popleft()
+                await self._send_frame(
+                    conn, packet, stream.start_time, stream.packet_index, stream.sequence
+                )
+                stream.packet_index += 1
+                stream.sequence += 1
+        except Exception as e:
+            logger.bind(tag=TAG).debug(f"发送音频失败，丢弃剩余音频: {e}")
+            stream.frames.clear()
+
+        if conn.client_abort:
+            stream.frames.clear()
+        if len(stream.frames) < MAX_QUEUED_FRAMES:
+            stream.wake("space")
+        if stream.frames:
+            self._schedule(conn, stream)
+        else:
+            stream.scheduled = False
+            stream.wake("drained")
+
+
+def get_audio_pacer(send_frame) -> AudioPacer:
+    """获取当前事件循环的调度器，不存在时创建"""
+    loop = asyncio.get_running_loop()
+    pacer = _pacers.get(loop)
+    if pacer is None:
+        pacer = _pacers[loop] = AudioPacer(loop, send_frame)
+    return pacer
@@ -0,0 +1,107 @@
+"""
+跨连接批量推理调度器
+
+各连接提交的待推理项先进入待处理列表，在window_ms时间窗口内（或达到max_batch_size时）
+合并为一次模型调用，推理结果再分别回传给各提交方。推理在调度器自己的后台线程中执行，
+提交方可以位于任意线程或事件循环中。
+"""
+
+import time
+import asyncio
+import threading
+from typing import Any, Callable, List
+from concurrent.futures import Future
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        window_ms: float = 5,
+        max_batch_size: int = 64,
+        name: str = "batch",
+    ):
+        """
+        Args:
+            run_batch: 批量推理函数，输入待处理项列表，按相同顺序返回结果列表
+            window_ms: 收集待处理项的时间窗口（毫秒）
+            max_batch_size: 单批最大数量，达到后立即推理
+            name: 后台线程名称
+        """
+        self._run_batch = run_batch
+        self.window = max(float(window_ms), 0) / 1000
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._pending = []
+        self._first_arrival = 0.0
+        self._condition = threading.Condition()
+        # 模型状态在推理期间可能被改写，同一时间只运行一个批次
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """提交一个待推理项，返回该项结果的Future"""
+        future = Future()
+        with self._condition:
+            if not self._pending:
+                self._first_arrival = time.monotonic()
+            self._pending.append((item, future))
+            self._condition.notify()
+        return future
+
+    async def submit_async(self, item: Any) -> Any:
+        """在事件循环中提交待推理项，等待所在批次完成后返回该项的结果"""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _take_batch(self):
+        with self._condition:
+            while True:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                remaining = self._first_arrival + self.window - time.monotonic()
+                if len(self._pending) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            # 超出单批数量的部分已经等待过一个窗口，下一轮立即推理
+            self._first_arrival = 0.0
+            return batch
+
+    def _worker(self):
+        while True:
+            batch = self._take_batch()
+            # 提交方已取消的项不再推理；标记为运行中后提交方无法再取消，结果一定能回传
+            batch = [
+                (item, future)
+                for item, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            try:
+                results = self._run_batch([item for item, _ in batch])
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"批量推理失败: {e}")
+                self._deliver(batch, error=e)
+                continue
+            self._deliver(batch, results)
+
+    @staticmethod
+    def _deliver(batch, results=None, error=None):
+        """回传结果，任何异常都不能让后台线程退出"""
+        for i, (_, future) in enumerate(batch):
+            try:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"回传批量推理结果失败: {e}")
@@ -19,6 +19,7 @@ class CacheType(Enum):
     CONFIG = "config"
     DEVICE_PROMPT = "device_prompt"
     VOICEPRINT_HEALTH = "voiceprint_health"  # 声纹识别健康检查
+    AUDIO_ASSET = "audio_asset"  # 提示音等固定音频文件转码后的帧
 
 
 @dataclass
@@ -58,5 +59,8 @@ class CacheConfig:
             CacheType.VOICEPRINT_HEALTH: cls(
                 strategy=CacheStrategy.TTL, ttl=600, max_size=100  # 10分钟过期
             ),
+            CacheType.AUDIO_ASSET: cls(
+                strategy=CacheStrategy.LRU, ttl=None, max_size=200  # 文件修改时间变化时失效
+            ),
         }
         return configs.get(cache_type, cls())
@@ -0,0 +1,87 @@
+"""
+按设备公平调度的进程池
+
+每个工作进程启动时执行一次initializer（例如加载模型），之后持续处理任务。
+待处理任务按key（设备/会话）分别排队，空闲进程按轮询顺序从各个key的队列中取任务，
+避免某一台设备连续提交的大量任务阻塞其他设备。
+"""
+
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+
+TAG = __name__
+
+
+class FairProcessPool:
+    def __init__(self, workers: int, initializer=None, initargs=()):
+        self.workers = max(int(workers), 1)
+        # 使用spawn启动子进程，避免fork时复制父进程中已加载的模型和线程状态
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs,
+        )
+        self._lock = threading.Lock()
+        self._queues = OrderedDict()  # key -> deque[(future, fn, args)]
+        self._running = 0
+
+    def submit(self, key, fn, *args) -> Future:
+        """提交任务，返回concurrent.futures.Future"""
+        future = Future()
+        with self._lock:
+            self._queues.setdefault(key, deque()).append((future, fn, args))
+        self._dispatch()
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            queues, self._queues = self._queues, OrderedDict()
+        for queue in queues.values():
+            for future, _, _ in queue:
+                future.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _next_task(self):
+        """轮询取出下一个任务，取完后该key移到队尾"""
+        key, queue = next(iter(self._queues.items()))
+        task = queue.popleft()
+        if queue:
+            self._queues.move_to_end(key)
+        else:
+            del self._queues[key]
+        return task
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                if self._running >= self.workers or not self._queues:
+                    return
+                future, fn, args = self._next_task()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running += 1
+            worker_future = self._executor.submit(fn, *args)
+            worker_future.add_done_callback(
+                lambda f, outer=future: self._on_done(outer, f)
+            )
+
+    def _on_done(self, future: Future, worker_future: Future):
+        with self._lock:
+            self._running -= 1
+        if worker_future.cancelled():
+            future.set_exception(CancelledError())
+            self._dispatch()
+            return
+        error = worker_future.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(worker_future.result())
+        self._dispatch()
@@ -0,0 +1,193 @@
+"""
+进程级共享的异步HTTP客户端
+
+所有HTTP类TTS、ASR供应商共用一个连接池：
+- 连接池运行在独立的后台事件循环线程中，任意线程、任意事件循环中都可以await调用，
+  不同设备、不同句子之间复用keep-alive连接，省去每次请求的TCP/TLS握手
+- 限制总连接数和单个服务地址的连接数
+- 统一的超时设置，连接失败、超时以及429/5xx响应按指数退避重试
+
+请求完成后响应内容已全部读取，返回的HttpResponse可以在任意线程中使用，
+属性与requests.Response保持一致（status_code、content、text、json()）。
+"""
+
+import json
+import asyncio
+import threading
+from typing import Optional
+import aiohttp
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_HTTP_CONFIG = {
+    "limit": 200,  # 总连接数上限
+    "limit_per_host": 32,  # 单个服务地址的连接数上限
+    "keepalive_timeout": 60,  # 空闲连接保持时间（秒）
+    "connect_timeout": 5,  # 建立连接超时（秒）
+    "timeout": 30,  # 单次请求总超时（秒）
+    "retries": 2,  # 失败后的重试次数
+    "backoff": 0.3,  # 首次重试等待时间（秒），之后每次翻倍
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_http_config = dict(DEFAULT_HTTP_CONFIG)
+_loop = None
+_session = None
+_lock = threading.Lock()
+
+
+class HttpResponse:
+    def __init__(self, status_code: int, reason, headers, content: bytes, url: str):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status_code, message=self.text[:200]
+            )
+
+
+def configure(config: Optional[dict]):
+    """使用全局配置中的http_client覆盖默认参数，需在首次请求前调用"""
+    if config:
+        _http_config.update({k: v for k, v in config.items() if v is not None})
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="http_client", daemon=True
+                ).start()
+                _loop = loop
+    return _loop
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """在后台事件循环中调用，首次使用时创建会话"""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=int(_http_config["limit"]),
+            limit_per_host=int(_http_config["limit_per_host"]),
+            keepalive_timeout=float(_http_config["keepalive_timeout"]),
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=float(_http_config["timeout"]),
+                sock_connect=float(_http_config["connect_timeout"]),
+            ),
+        )
+    return _session
+
+
+def _clean_params(params):
+    # 与requests一致：忽略值为None的参数，列表展开为同名多个参数，其余转为字符串
+    if not params or not isinstance(params, dict):
+        return params
+    items = []
+    for k, v in params.items():
+        for item in v if isinstance(v, (list, tuple)) else [v]:
+            if item is not None:
+                items.append((k, str(item)))
+    return items
+
+
+def _build_form(data, files) -> aiohttp.FormData:
+    """与requests的files参数一致：files为{字段名: (文件名, 内容, 类型)}，data为普通表单字段"""
+    form = aiohttp.FormData()
+    for name, value in (data or {}).items():
+        form.add_field(name, str(value))
+    for name, (filename, content, content_type) in files.items():
+        form.add_field(name, content, filename=filename, content_type=content_type)
+    return form
+
+
+async def _request(method, url, retries, timeout, files=None, **kwargs) -> HttpResponse:
+    session = _get_session()
+    if timeout is not None:
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=float(timeout))
+    kwargs["params"] = _clean_params(kwargs.get("params"))
+    form_data = kwargs.pop("data", None) if files else None
+    backoff = float(_http_config["backoff"])
+
+    for attempt in range(retries + 1):
+        if files:
+            # FormData只能发送一次，每次重试重新构建
+            kwargs["data"] = _build_form(form_data, files)
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                content = await resp.read()
+                response = HttpResponse(
+                    resp.status, resp.reason, resp.headers, content, str(resp.url)
+                )
+            if response.status_code not in RETRY_STATUS or attempt == retries:
+                return response
+            logger.bind(tag=TAG).warning(
+                f"HTTP请求返回{response.status_code}，{backoff:.1f}秒后重试: {url}"
+            )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise
+            logger.bind(tag=TAG).warning(
+                f"HTTP请求失败({type(e).__name__})，{backoff:.1f}秒后重试: {url}"
+            )
+        await asyncio.sleep(backoff)
+        backoff *= 2
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    retries: Optional[int] = None,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> HttpResponse:
+    """
+    发送HTTP请求并读取完整响应
+    Args:
+        method: 请求方法
+        url: 请求地址
+        retries: 重试次数，默认使用全局配置
+        timeout: 本次请求的总超时（秒），默认使用全局配置
+        kwargs: 透传给aiohttp的参数，如params、json、data、headers；
+            上传文件时与requests一致使用files={字段名: (文件名, 内容, 类型)}
+    """
+    if retries is None:
+        retries = int(_http_config["retries"])
+    loop = _get_loop()
+    coro = _request(method, url, retries, timeout, **kwargs)
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def get(url: str, **kwargs) -> HttpResponse:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> HttpResponse:
+    return await request("POST", url, **kwargs)
@@ -0,0 +1,192 @@
+"""
+本地音乐库
+
+扫描音乐目录，在后台线程中把每首歌转码一次为p3格式（Opus数据包）并写入数据包偏移索引，
+播放时直接内存映射p3文件逐包发送，不再每次播放都解码、重采样、编码。
+源文件新增、修改或删除后，下一次刷新时只处理有变化的歌曲。
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List
+from config.logger import setup_logging
+from core.utils import p3
+from core.utils.song_index import SongIndex
+from core.utils.stream_decoder import iter_audio_file_frames
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_CACHE_DIR = "tmp/music_p3"
+MANIFEST_FILE = "manifest.json"
+
+
+class MusicLibrary:
+    def __init__(self, music_dir: str, music_ext, cache_dir: str = DEFAULT_CACHE_DIR, transcode: bool = True):
+        """
+        Args:
+            music_dir: 音乐目录，包含子目录
+            music_ext: 支持的音乐文件扩展名
+            cache_dir: 转码后的p3文件及索引存放目录
+            transcode: 是否在后台预先转码，关闭时只扫描目录
+        """
+        self.music_dir = os.path.abspath(music_dir)
+        self.music_ext = tuple(ext.lower() for ext in music_ext)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.transcode = transcode
+        self.music_files: List[str] = []  # 相对music_dir的路径
+        self.music_file_names: List[str] = []  # 去掉扩展名的相对路径，与music_files一一对应
+        self.song_index = SongIndex()  # 歌名模糊检索索引，每次扫描后增量更新
+        self._manifest: Dict[str, dict] = {}  # 相对路径 -> {mtime_ns, size, p3}
+        self._lock = threading.Lock()
+        self._refresh_event = threading.Event()
+        self._scanned = threading.Event()  # 首次扫描完成
+        self._thread = None
+        if self.transcode:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._manifest = self._load_manifest()
+
+    def scan(self) -> List[str]:
+        """同步扫描音乐目录，返回相对路径列表"""
+        music_files = []
+        for root, _, files in os.walk(self.music_dir):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in self.music_ext:
+                    path = os.path.join(root, name)
+                    music_files.append(os.path.relpath(path, self.music_dir))
+        music_files.sort()
+        self.music_file_names = [os.path.splitext(f)[0] for f in music_files]
+        self.music_files = music_files
+        return music_files
+
+    def refresh(self):
+        """在后台线程中重新扫描目录并转码有变化的歌曲，不等待完成"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="music_library", daemon=True)
+            self._thread.start()
+        self._refresh_event.set()
+
+    def wait_scanned(self, timeout: float = None) -> bool:
+        """等待首次扫描完成（阻塞），返回是否已完成"""
+        return self._scanned.wait(timeout)
+
+    def playable_path(self, music_file: str) -> str:
+        """返回播放用的文件路径：已转码完成的返回p3文件，否则返回源文件"""
+        source = os.path.join(self.music_dir, music_file)
+        if music_file.lower().endswith(".p3"):
+            return source
+        with self._lock:
+            entry = self._manifest.get(music_file)
+        if entry and self._is_current(source, entry):
+            p3_path = os.path.join(self.cache_dir, entry["p3"])
+            if os.path.exists(p3_path):
+                return p3_path
+        return source
+
+    def _worker(self):
+        while True:
+            self._refresh_event.wait()
+            self._refresh_event.clear()
+            try:
+                try:
+                    self.scan()
+                    added, removed = self.song_index.update(self.music_files)
+                finally:
+                    self._scanned.set()
+                if added or removed:
+                    logger.bind(tag=TAG).info(
+                        f"歌名索引已更新，新增: {added}首，删除: {removed}首"
+                    )
+                if self.transcode:
+                    self._sync_cache()
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"刷新音乐库失败: {e}")
+
+    def _sync_cache(self):
+        music_files = list(self.music_files)
+        # 删除源文件已不存在的转码结果
+        existing = set(music_files)
+        with self._lock:
+            removed = [f for f in self._manifest if f not in existing]
+        for music_file in removed:
+            self._remove_entry(music_file)
+
+        transcoded = 0
+        for music_file in music_files:
+            source = os.path.join(self.music_dir, music_file)
+            if music_file.lower().endswith(".p3"):
+                # p3源文件无需转码，只补建偏移索引
+                if p3.load_packet_index(source) is None:
+                    self._try(p3.build_packet_index, source)
+                continue
+            with self._lock:
+                entry = self._manifest.get(music_file)
+            if entry and self._is_current(source, entry):
+                continue
+            if self._transcode(music_file, source):
+                transcoded += 1
+        if transcoded or removed:
+            self._save_manifest()
+            logger.bind(tag=TAG).info(
+                f"音乐库转码完成，新增/更新: {transcoded}首，删除: {len(removed)}首"
+            )
+
+    def _transcode(self, music_file: str, source: str) -> bool:
+        try:
+            stat = os.stat(source)
+            name = hashlib.sha1(music_file.encode("utf-8")).hexdigest()[:16] + ".p3"
+            # ffmpeg中途失败时抛出异常，不把残缺的转码结果记入清单
+            p3.encode_opus_to_file(
+                iter_audio_file_frames(source, is_opus=True, strict=True),
+                os.path.join(self.cache_dir, name),
+            )
+        except Exception as e:
+            logger.bind(tag=TAG).warning(f"音乐转码失败: {music_file}，错误: {e}")
+            return False
+        with self._lock:
+            self._manifest[music_file] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "p3": name,
+            }
+        return True
+
+    def _remove_entry(self, music_file: str):
+        with self._lock:
+            entry = self._manifest.pop(music_file, None)
+        if entry:
+            p3_path = os.path.join(self.cache_dir, entry["p3"])
+            for path in (p3_path, p3_path + p3.INDEX_SUFFIX):
+                self._try(os.remove, path)
+
+    @staticmethod
+    def _is_current(source: str, entry: dict) -> bool:
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        return stat.st_mtime_ns == entry["mtime_ns"] and stat.st_size == entry["size"]
+
+    @staticmethod
+    def _try(func, *args):
+        try:
+            func(*args)
+        except Exception:
+            pass
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        path = os.path.join(self.cache_dir, MANIFEST_FILE)
+        with self._lock:
+            data = json.dumps(self._manifest, ensure_ascii=False)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
@@ -1,4 +1,13 @@
+import os
+import mmap
 import struct
+import opuslib_next
+from array import array
+from typing import Iterable, Iterator, Optional
+
+HEADER_SIZE = 4  # [1字节类型，1字节保留，2字节长度]
+INDEX_SUFFIX = ".idx"
+FRAME_DURATION_MS = 60  # 每个数据包的时长
 
 def decode_opus_from_file(input_file):
     """
@@ -56,4 +65,218 @@ def decode_opus_from_bytes(input_bytes):
         total_frames += 1
 
     total_duration = (total_frames * frame_duration_ms) / 1000.0
-    return opus_datas, total_duration
\ No newline at end of file
+    return opus_datas, total_duration
+
+
+def encode_opus_to_file(opus_datas: Iterable[bytes], output_file: str) -> array:
+    """
+    将Opus数据包写入p3文件，同时在同目录写入数据包偏移索引（output_file + ".idx"）。
+    先写临时文件再替换，写入过程中读取方不会看到不完整的文件。
+    索引为uint32数组：每个数据包头部的偏移，最后一项为文件总长度。
+    """
+    offsets = array("I")
+    position = 0
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            for opus_data in opus_datas:
+                offsets.append(position)
+                f.write(struct.pack(">BBH", 0, 0, len(opus_data)))
+                f.write(opus_data)
+                position += HEADER_SIZE + len(opus_data)
+    except BaseException:
+        # 数据源中途失败时不留下不完整的临时文件
+        os.remove(tmp_file)
+        raise
+    offsets.append(position)
+    _write_index(offsets, output_file + INDEX_SUFFIX)
+    os.replace(tmp_file, output_file)
+    return offsets
+
+
+def build_packet_index(input_file: str) -> array:
+    """扫描p3文件头部建立数据包偏移索引并写入索引文件"""
+    with open(input_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            offsets = array("I", [0])
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = _scan_offsets(mm)
+    _write_index(offsets, input_file + INDEX_SUFFIX)
+    return offsets
+
+
+def load_packet_index(input_file: str) -> Optional[array]:
+    """读取p3文件的数据包偏移索引，索引不存在或与文件不一致时返回None"""
+    index_file = input_file + INDEX_SUFFIX
+    try:
+        with open(index_file, "rb") as f:
+            offsets = array("I")
+            offsets.frombytes(f.read())
+        if not offsets or offsets[-1] != os.path.getsize(input_file):
+            return None
+        return offsets
+    except (OSError, ValueError):
+        return None
+
+
+class P3Reader:
+    """
+    p3数据包的惰性读取器，支持按数据包序号或时间定位
+
+    文件以内存映射方式打开，迭代时才逐个切出数据包，内存占用与文件长度无关。
+    有偏移索引文件时直接使用；没有索引时顺序播放只需依次解析头部，
+    第一次定位时才扫描全部头部建立内存中的偏移索引（每个数据包4字节）。
+
+    用法：
+        with P3Reader("long.p3") as reader:
+            reader.seek_time(1800)  # 从30分钟处继续播放
+            for opus_data in reader:
+                ...
+    """
+
+    def __init__(self, source, offsets: Optional[array] = None):
+        """
+        Args:
+            source: p3文件路径，或p3二进制数据（bytes/bytearray/memoryview）
+            offsets: 数据包偏移索引，文件路径时默认读取同名.idx文件
+        """
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._data = memoryview(source)
+        else:
+            if offsets is None:
+                offsets = load_packet_index(source)
+            self._file = open(source, "rb")
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._data = memoryview(b"")
+            else:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._data = memoryview(self._mmap)
+        self._offsets = offsets
+        self._position = 0  # 下一个数据包头部的字节偏移
+        self._packet = 0  # 下一个数据包的序号
+
+    @property
+    def packet_count(self) -> int:
+        return len(self._get_offsets()) - 1
+
+    @property
+    def duration(self) -> float:
+        """总时长（秒）"""
+        return self.packet_count * FRAME_DURATION_MS / 1000.0
+
+    def tell(self) -> int:
+        """下一个要读取的数据包序号"""
+        return self._packet
+
+    def tell_time(self) -> float:
+        """当前播放位置（秒）"""
+        return self._packet * FRAME_DURATION_MS / 1000.0
+
+    def seek(self, packet_index: int):
+        """定位到指定序号的数据包，超出范围时定位到开头或末尾"""
+        offsets = self._get_offsets()
+        packet_index = min(max(int(packet_index), 0), len(offsets) - 1)
+        self._packet = packet_index
+        self._position = offsets[packet_index]
+
+    def seek_time(self, seconds: float):
+        """定位到指定时间（秒）所在的数据包"""
+        self.seek(int(seconds * 1000 // FRAME_DURATION_MS))
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        data = self._data
+        if self._offsets is not None:
+            if self._packet >= len(self._offsets) - 1:
+                raise StopIteration
+            start = self._offsets[self._packet] + HEADER_SIZE
+            end = self._offsets[self._packet + 1]
+        else:
+            if self._position + HEADER_SIZE > len(data):
+                raise StopIteration
+            _, _, data_len = struct.unpack_from(">BBH", data, self._position)
+            start = self._position + HEADER_SIZE
+            end = start + data_len
+            if end > len(data):
+                raise ValueError(f"Data length({len(data) - start}) mismatch({data_len}) in the file.")
+        self._position = end
+        self._packet += 1
+        return bytes(data[start:end])
+
+    def close(self):
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_offsets(self) -> array:
+        if self._offsets is None:
+            self._offsets = _scan_offsets(self._data)
+        return self._offsets
+
+
+def iter_opus_from_file(
+    input_file: str, offsets: Optional[array] = None, start_time: float = 0
+) -> Iterator[bytes]:
+    """
+    内存映射方式逐个读取p3文件中的Opus数据包，不解码也不把整个文件读入内存。
+    start_time大于0时从该时间点开始读取。
+    """
+    with P3Reader(input_file, offsets) as reader:
+        if start_time > 0:
+            reader.seek_time(start_time)
+        yield from reader
+
+
+def iter_pcm_from_file(
+    input_file: str, offsets: Optional[array] = None, start_time: float = 0
+) -> Iterator[bytes]:
+    """逐个读取p3文件中的Opus数据包并解码为16kHz单声道PCM，用于要求PCM格式的设备"""
+    decoder = opuslib_next.Decoder(16000, 1)
+    frame_size = int(16000 * FRAME_DURATION_MS / 1000)
+    for opus_data in iter_opus_from_file(input_file, offsets, start_time):
+        yield decoder.decode(opus_data, frame_size)
+
+
+def decode_opus_from_file_stream(input_file, callback):
+    """逐个读取p3文件中的Opus数据包并回调"""
+    for opus_data in iter_opus_from_file(input_file):
+        callback(opus_data)
+
+
+def decode_opus_from_bytes_stream(input_bytes, callback):
+    """逐个读取p3二进制数据中的Opus数据包并回调"""
+    with P3Reader(input_bytes) as reader:
+        for opus_data in reader:
+            callback(opus_data)
+
+
+def _scan_offsets(data) -> array:
+    """依次解析数据包头部，返回每个数据包头部的偏移，最后一项为数据结束位置"""
+    offsets = array("I")
+    position = 0
+    while position + HEADER_SIZE <= len(data):
+        offsets.append(position)
+        _, _, data_len = struct.unpack_from(">BBH", data, position)
+        position += HEADER_SIZE + data_len
+    offsets.append(min(position, len(data)))
+    return offsets
+
+
+def _write_index(offsets: array, index_file: str):
+    tmp_file = f"{index_file}.tmp"
+    with open(tmp_file, "wb") as f:
+        offsets.tofile(f)
+    os.replace(tmp_file, index_file)
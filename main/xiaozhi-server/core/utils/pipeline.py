@@ -0,0 +1,177 @@
+"""
+asyncio连接处理模式的公共组件
+
+pipeline_mode设置为asyncio时，ASR、TTS文本、音频播放、上报各阶段以事件循环任务运行，
+阻塞型的模型推理和网络请求统一交给进程级共享线程池，每个连接不再单独创建线程。
+"""
+
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TAG = __name__
+
+PIPELINE_MODE_THREAD = "thread"
+PIPELINE_MODE_ASYNCIO = "asyncio"
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def is_async_pipeline(config) -> bool:
+    """是否启用asyncio连接处理模式"""
+    mode = str(config.get("pipeline_mode", PIPELINE_MODE_THREAD) or "").lower()
+    return mode == PIPELINE_MODE_ASYNCIO
+
+
+def get_shared_executor(max_workers=None) -> ThreadPoolExecutor:
+    """获取进程级共享线程池，首次调用时创建"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                max_workers = int(max_workers) if max_workers else 32
+                _shared_executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="pipeline"
+                )
+    return _shared_executor
+
+
+def run_in_thread(func, *args, name=None) -> asyncio.Future:
+    """
+    在新建的线程中执行阻塞函数，返回可在当前事件循环中await的结果。
+    用于音乐播放等会长时间占用线程的任务，避免占满共享线程池。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def runner():
+        result, error = None, None
+        try:
+            result = func(*args)
+        except BaseException as e:
+            error = e
+        finally:
+            # 任何异常都要交回事件循环，否则await的一方会一直等待
+            if not loop.is_closed():
+                try:
+                    loop.call_soon_threadsafe(deliver, result, error)
+                except RuntimeError:
+                    pass
+
+    threading.Thread(target=runner, name=name, daemon=True).start()
+    return future
+
+
+class AsyncQueue:
+    """
+    可在事件循环中await的线程安全队列
+
+    put/put_nowait/task_done/clear可以在任意线程调用，get只能在所属事件循环中await，
+    接口与queue.Queue保持一致，以便直接替换连接和TTS上的队列。
+    qsize在put时立即计数，包含其它线程放入但事件循环尚未处理的数据；
+    与queue.Queue相同，每取出一项会通知not_full条件变量。
+    每项数据带有放入时的清空代数，clear后代数加一，get跳过之前放入的数据，
+    其它线程放入但尚未进入事件循环的数据也会被丢弃。
+    所属事件循环关闭后放入的数据直接丢弃。
+    """
+
+    def __init__(self, loop, source: queue.Queue = None):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._size = 0
+        self._generation = 0
+        self.not_full = threading.Condition()
+        # 接管原队列中尚未消费的数据
+        while source is not None:
+            try:
+                self._queue.put_nowait((self._generation, source.get_nowait()))
+                self._size += 1
+            except queue.Empty:
+                break
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def put(self, item, block=True, timeout=None):
+        self.put_nowait(item)
+
+    def put_nowait(self, item):
+        if self._loop.is_closed():
+            return
+        with self.not_full:
+            self._size += 1
+            entry = (self._generation, item)
+        if self._in_loop():
+            self._queue.put_nowait(entry)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, entry)
+        except RuntimeError:
+            # 事件循环在检查之后关闭
+            self._taken(entry[0])
+
+    def get_nowait(self):
+        while True:
+            try:
+                generation, item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                raise queue.Empty
+            if self._taken(generation):
+                return item
+            self._queue.task_done()
+
+    async def get(self):
+        while True:
+            generation, item = await self._queue.get()
+            if self._taken(generation):
+                return item
+            self._queue.task_done()
+
+    def clear(self):
+        """丢弃队列中的全部数据，包括其它线程已放入但尚未进入事件循环的数据"""
+        with self.not_full:
+            self._generation += 1
+            self._size = 0
+            self.not_full.notify_all()
+        if self._in_loop():
+            # 立即释放已进入队列的旧数据，其余的由get跳过
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                self._queue.task_done()
+
+    def _taken(self, generation) -> bool:
+        """取出一项后更新计数，返回该项是否在最近一次clear之后放入"""
+        with self.not_full:
+            if generation != self._generation:
+                return False
+            self._size -= 1
+            self.not_full.notify()
+        return True
+
+    def task_done(self):
+        if self._in_loop():
+            self._queue.task_done()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._queue.task_done)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
@@ -0,0 +1,69 @@
+"""
+固定容量的PCM环形缓冲区
+
+写入时直接拷贝到预分配的内存中，读取时拷贝到调用方提供的缓冲区，
+稳定运行时不会产生新的bytes/bytearray对象。
+"""
+
+
+class PCMRingBuffer:
+    def __init__(self, capacity: int = 4096):
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def write(self, data):
+        """写入数据，容量不足时按两倍扩容（只在帧长超出预期时发生）"""
+        length = len(data)
+        if not length:
+            return
+        if self._size + length > self._capacity:
+            self._grow(self._size + length)
+
+        end = (self._start + self._size) % self._capacity
+        first = min(length, self._capacity - end)
+        if first == length:
+            self._view[end : end + length] = data
+        else:
+            # 写入位置跨过缓冲区末尾，分两段写入
+            source = memoryview(data)
+            self._view[end:] = source[:first]
+            self._view[: length - first] = source[first:]
+        self._size += length
+
+    def read_into(self, out) -> int:
+        """
+        从缓冲区头部取出len(out)字节写入out，返回实际读取的字节数
+
+        out应为memoryview，bytearray的切片赋值会先复制一份源数据
+        """
+        length = min(len(out), self._size)
+        first = min(length, self._capacity - self._start)
+        out[:first] = self._view[self._start : self._start + first]
+        if first < length:
+            out[first:length] = self._view[: length - first]
+        self._start = (self._start + length) % self._capacity
+        self._size -= length
+        return length
+
+    def _grow(self, required: int):
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        size = self._size
+        buffer = bytearray(capacity)
+        self.read_into(memoryview(buffer)[:size])
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._capacity = capacity
+        self._start = 0
+        self._size = size
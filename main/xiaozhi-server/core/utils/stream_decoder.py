@@ -0,0 +1,166 @@
+"""
+流式音频解码
+
+压缩音频（mp3等）边接收边交给ffmpeg子进程解码为16kHz单声道PCM，
+每凑够一帧（60ms）就编码为Opus（或直接输出PCM）回调出去，
+不需要等整段音频接收完毕再整体转码，首帧延迟只取决于第一批数据的到达时间。
+
+本地音频文件同样由ffmpeg逐帧解码，调用方取走一帧才读取下一帧，
+ffmpeg在管道写满后暂停解码，每路播放的内存占用与文件长度无关。
+"""
+
+import asyncio
+import subprocess
+from typing import Any, Callable, Iterator
+import opuslib_next
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+SAMPLE_RATE = 16000
+FRAME_DURATION = 60  # ms
+FRAME_SIZE = SAMPLE_RATE * FRAME_DURATION // 1000  # 960 samples/frame
+FRAME_BYTES = FRAME_SIZE * 2  # 16bit=2bytes/sample
+READ_SIZE = 4096
+
+
+class StreamingAudioDecoder:
+    def __init__(
+        self,
+        callback: Callable[[Any], Any],
+        input_format: str = "mp3",
+        is_opus: bool = True,
+    ):
+        """
+        Args:
+            callback: 每帧音频的回调，参数为Opus数据包或60ms的PCM数据
+            input_format: 输入音频格式，传给ffmpeg的-f参数
+            is_opus: 是否编码为Opus，否则输出PCM
+        """
+        self.callback = callback
+        self.input_format = input_format
+        self.is_opus = is_opus
+        self.frame_count = 0
+        self._encoder = (
+            opuslib_next.Encoder(SAMPLE_RATE, 1, opuslib_next.APPLICATION_AUDIO)
+            if is_opus
+            else None
+        )
+        self._pcm_buffer = bytearray()
+        self._process = None
+        self._reader = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel", "error",
+            "-f", self.input_format,
+            "-i", "pipe:0",
+            "-f", "s16le",
+            "-ac", "1",
+            "-ar", str(SAMPLE_RATE),
+            "-flush_packets", "1",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read_pcm())
+
+    async def feed(self, data: bytes):
+        """写入一段压缩音频数据"""
+        self._process.stdin.write(data)
+        await self._process.stdin.drain()
+
+    async def finish(self):
+        """输入结束，等待解码完成并输出最后一帧（不足一帧补零）"""
+        self._process.stdin.close()
+        await self._reader
+        await self._process.wait()
+        if self._pcm_buffer:
+            self._pcm_buffer.extend(b"\x00" * (FRAME_BYTES - len(self._pcm_buffer)))
+            self._emit(bytes(self._pcm_buffer))
+            self._pcm_buffer.clear()
+        if self._process.returncode != 0 and self.frame_count == 0:
+            raise RuntimeError(f"ffmpeg解码失败，返回码: {self._process.returncode}")
+
+    async def abort(self):
+        """丢弃未解码的数据并结束子进程"""
+        if self._process and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader:
+            self._reader.cancel()
+        self._pcm_buffer.clear()
+
+    async def _read_pcm(self):
+        while True:
+            data = await self._process.stdout.read(READ_SIZE)
+            if not data:
+                return
+            self._pcm_buffer.extend(data)
+            while len(self._pcm_buffer) >= FRAME_BYTES:
+                frame = bytes(self._pcm_buffer[:FRAME_BYTES])
+                del self._pcm_buffer[:FRAME_BYTES]
+                self._emit(frame)
+
+    def _emit(self, frame: bytes):
+        self.frame_count += 1
+        if self._encoder:
+            frame = self._encoder.encode(frame, FRAME_SIZE)
+        self.callback(frame)
+
+
+def iter_audio_file_frames(
+    audio_file_path: str, is_opus: bool = True, strict: bool = False
+) -> Iterator[bytes]:
+    """
+    逐帧解码音频文件，每次产出一帧60ms的Opus数据包或PCM数据，最后一帧不足时补零
+    提前关闭迭代器（close或break后被回收）时立即结束ffmpeg子进程
+    ffmpeg异常退出时默认只在没有解码出任何帧时抛出异常；strict为True时读完后
+    只要返回码不为0就抛出异常，用于不能接受残缺结果的场景（如预先转码）
+    """
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel", "error",
+            "-i", audio_file_path,
+            "-f", "s16le",
+            "-ac", "1",
+            "-ar", str(SAMPLE_RATE),
+            "pipe:1",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    encoder = (
+        opuslib_next.Encoder(SAMPLE_RATE, 1, opuslib_next.APPLICATION_AUDIO)
+        if is_opus
+        else None
+    )
+    frame_count = 0
+    finished = False
+    try:
+        while True:
+            # 缓冲读取，返回不足一帧说明已到文件末尾
+            frame = process.stdout.read(FRAME_BYTES)
+            if not frame:
+                finished = True
+                break
+            if len(frame) < FRAME_BYTES:
+                frame += b"\x00" * (FRAME_BYTES - len(frame))
+            frame_count += 1
+            yield encoder.encode(frame, FRAME_SIZE) if encoder else frame
+    finally:
+        if not finished and process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+    if process.returncode != 0 and (strict or frame_count == 0):
+        raise RuntimeError(
+            f"ffmpeg解码失败: {audio_file_path}，返回码: {process.returncode}"
+        )
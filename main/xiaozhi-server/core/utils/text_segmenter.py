@@ -0,0 +1,77 @@
+"""
+流式文本增量分句
+
+大模型逐个token输出文本时，每次只扫描新追加的字符，找到分句标点后切出一段交给TTS，
+未切分的文本暂存在待处理片段列表中，整个回答的分句开销与文本长度成线性关系。
+
+第一句可配置提前切分，让TTS尽早开始合成：
+- first_min_length：第一句不足该长度时不在标点处切分，避免"嗯，"这类过短的句子
+- first_max_length：第一句达到该长度仍未遇到标点时直接切分，0为不限制
+"""
+
+from typing import Iterable, Optional
+
+
+class TextSegmenter:
+    def __init__(
+        self,
+        punctuations: Iterable[str],
+        first_sentence_punctuations: Iterable[str],
+        first_min_length: int = 0,
+        first_max_length: int = 0,
+    ):
+        self.punctuations = frozenset(punctuations)
+        self.first_sentence_punctuations = frozenset(first_sentence_punctuations)
+        self.first_min_length = max(int(first_min_length or 0), 0)
+        self.first_max_length = max(int(first_max_length or 0), 0)
+        if self.first_max_length:
+            self.first_max_length = max(self.first_max_length, self.first_min_length)
+        self.reset()
+
+    def reset(self):
+        self._pending = []  # 未切分的文本片段
+        self._pending_len = 0
+
+    @property
+    def pending_text(self) -> str:
+        return "".join(self._pending)
+
+    def feed(self, text: str, is_first_sentence: bool) -> Optional[str]:
+        """
+        追加一段文本，只扫描新追加的字符
+        Returns:
+            切分出的原始文本（包含结尾标点），无法切分时返回None
+        """
+        if not text:
+            return None
+        start = self._pending_len
+        self._pending.append(text)
+        self._pending_len += len(text)
+
+        punctuations = (
+            self.first_sentence_punctuations if is_first_sentence else self.punctuations
+        )
+        min_length = self.first_min_length if is_first_sentence else 0
+        cut = -1
+        for i, char in enumerate(text):
+            if char in punctuations and start + i + 1 >= min_length:
+                cut = start + i + 1
+
+        if (
+            cut == -1
+            and is_first_sentence
+            and self.first_max_length
+            and self._pending_len >= self.first_max_length
+        ):
+            cut = self.first_max_length
+
+        if cut == -1:
+            return None
+        return self._take(cut)
+
+    def _take(self, length: int) -> str:
+        text = "".join(self._pending)
+        rest = text[length:]
+        self._pending = [rest] if rest else []
+        self._pending_len = len(rest)
+        return text[:length]
@@ -0,0 +1,233 @@
+"""
+语音合成结果缓存
+
+以"TTS供应商+音色+文本+音频参数"的哈希作为键，缓存合成后的音频帧（Opus或PCM），
+插件确认语、问候语、告别语等重复出现的句子无需再次调用远程合成。
+分为两级：内存LRU（按字节数限制）和磁盘（p3格式文件，按总大小限制，淘汰最久未使用的文件）。
+"""
+
+import os
+import json
+import time
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+DEFAULT_CACHE_DIR = "tmp/tts_cache"
+STATS_LOG_INTERVAL = 100  # 每查询多少次输出一次统计
+
+
+class TTSAudioCache:
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_memory_mb: float = 64,
+        max_disk_mb: float = 512,
+        max_text_length: int = 50,
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(float(max_memory_mb) * 1024 * 1024)
+        self.max_disk_bytes = int(float(max_disk_mb) * 1024 * 1024)
+        # 只缓存短句，长句重复的概率低，缓存只会挤占空间
+        self.max_text_length = int(max_text_length)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> List[bytes]
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # key -> 文件大小，按最近使用排序
+        self._disk_bytes = 0
+        self._stats = {
+            "lookups": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "bytes_saved": 0,
+            "hit_first_audio": 0.0,
+            "hit_first_audio_count": 0,
+            "miss_first_audio": 0.0,
+            "miss_first_audio_count": 0,
+        }
+
+        if self.max_disk_bytes > 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(provider: str, voice, text: str, params: dict) -> str:
+        raw = json.dumps(
+            [provider, voice, text, params], ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return bool(text) and len(text) <= self.max_text_length
+
+    def get(self, key: str) -> Optional[List[bytes]]:
+        """查询缓存，先查内存再查磁盘，磁盘命中后放回内存"""
+        with self._lock:
+            self._stats["lookups"] += 1
+            frames = self._memory.get(key)
+            if frames is not None:
+                self._memory.move_to_end(key)
+                self._record_hit("memory_hits", frames)
+                return frames
+            on_disk = key in self._disk
+
+        frames = self._read_file(key) if on_disk else None
+        with self._lock:
+            if frames is None:
+                if on_disk:
+                    self._forget_disk(key)
+                self._maybe_log_stats()
+                return None
+            self._disk.move_to_end(key)
+            self._put_memory(key, frames)
+            self._record_hit("disk_hits", frames)
+        return frames
+
+    def put(self, key: str, frames: List[bytes]):
+        if not frames:
+            return
+        frames = list(frames)
+        with self._lock:
+            self._put_memory(key, frames)
+            write_disk = self.max_disk_bytes > 0 and key not in self._disk
+        if write_disk:
+            self._write_file(key, frames)
+
+    def record_first_audio(self, hit: bool, seconds: float):
+        """记录从开始合成到第一帧音频的耗时"""
+        prefix = "hit" if hit else "miss"
+        with self._lock:
+            self._stats[f"{prefix}_first_audio"] += seconds
+            self._stats[f"{prefix}_first_audio_count"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["disk_bytes"] = self._disk_bytes
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = hits / stats["lookups"] if stats["lookups"] else 0.0
+        for prefix in ("hit", "miss"):
+            count = stats.pop(f"{prefix}_first_audio_count")
+            total = stats.pop(f"{prefix}_first_audio")
+            stats[f"{prefix}_first_audio_ms"] = total * 1000 / count if count else None
+        return stats
+
+    def _record_hit(self, name: str, frames: List[bytes]):
+        self._stats[name] += 1
+        self._stats["bytes_saved"] += sum(len(frame) for frame in frames)
+        self._maybe_log_stats()
+
+    def _maybe_log_stats(self):
+        if self._stats["lookups"] % STATS_LOG_INTERVAL != 0:
+            return
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        logger.bind(tag=TAG).info(
+            f"TTS缓存命中率: {hits / self._stats['lookups']:.1%}，"
+            f"累计节省音频: {self._stats['bytes_saved'] / 1024:.1f}KB"
+        )
+
+    def _put_memory(self, key: str, frames: List[bytes]):
+        size = sum(len(frame) for frame in frames)
+        if size > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= sum(len(frame) for frame in old)
+        self._memory[key] = frames
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= sum(len(frame) for frame in evicted)
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.p3")
+
+    def _load_disk_index(self):
+        """启动时扫描缓存目录，按修改时间从旧到新建立磁盘索引"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".p3"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, name[: -len(".p3")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _forget_disk(self, key: str):
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._file_path(key))
+            except OSError:
+                pass
+
+    def _read_file(self, key: str) -> Optional[List[bytes]]:
+        try:
+            with open(self._file_path(key), "rb") as f:
+                data = f.read()
+            # 顺便更新修改时间，重启后仍按最近使用顺序淘汰
+            os.utime(self._file_path(key))
+        except OSError:
+            return None
+        frames, offset = [], 0
+        while offset + 4 <= len(data):
+            _, _, length = struct.unpack_from(">BBH", data, offset)
+            offset += 4
+            frames.append(data[offset : offset + length])
+            offset += length
+        return frames
+
+    def _write_file(self, key: str, frames: List[bytes]):
+        """以p3格式写入：每帧前加4字节头[1字节类型，1字节保留，2字节长度]"""
+        data = b"".join(struct.pack(">BBH", 0, 0, len(frame)) + frame for frame in frames)
+        tmp_path = f"{self._file_path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._file_path(key))
+        except OSError as e:
+            logger.bind(tag=TAG).warning(f"写入TTS缓存文件失败: {e}")
+            return
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+
+_tts_cache = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache(config: dict) -> Optional[TTSAudioCache]:
+    """根据全局配置中的tts_cache获取进程级缓存实例，未启用时返回None"""
+    global _tts_cache
+    cache_config = (config or {}).get("tts_cache") or {}
+    if not cache_config.get("enabled", False):
+        return None
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSAudioCache(
+                    cache_dir=cache_config.get("cache_dir", DEFAULT_CACHE_DIR),
+                    max_memory_mb=cache_config.get("max_memory_mb", 64),
+                    max_disk_mb=cache_config.get("max_disk_mb", 512),
+                    max_text_length=cache_config.get("max_text_length", 50),
+                )
+    return _tts_cache
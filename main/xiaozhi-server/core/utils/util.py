@@ -280,6 +280,47 @@ def audio_to_data(audio_file_path: str, is_opus: bool = True) -> list[bytes]:
 
     return datas
 
+
+AUDIO_ASSETS_DIR = "config/assets"
+AUDIO_ASSET_EXTS = (".wav", ".mp3")
+
+
+def audio_to_data_cached(audio_file_path: str, is_opus: bool = True) -> list[bytes]:
+    """
+    带内存缓存的audio_to_data，用于提示音、绑定码等固定音频文件
+    同一文件只转码一次，文件修改时间或大小变化后重新转码
+    """
+    from core.utils.cache.manager import cache_manager, CacheType
+
+    stat = os.stat(audio_file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = f"{os.path.abspath(audio_file_path)}:{'opus' if is_opus else 'pcm'}"
+
+    cached = cache_manager.get(CacheType.AUDIO_ASSET, key)
+    if cached is not None and cached[0] == version:
+        datas = cached[1]
+    else:
+        datas = audio_to_data(audio_file_path, is_opus)
+        cache_manager.set(CacheType.AUDIO_ASSET, key, (version, datas))
+    # 返回副本，避免调用方修改列表影响缓存
+    return list(datas)
+
+
+def preload_audio_assets(assets_dir: str = AUDIO_ASSETS_DIR) -> int:
+    """将目录下所有音频文件预先转码为Opus帧放入缓存，返回成功加载的文件数"""
+    count = 0
+    for root, _, files in os.walk(assets_dir):
+        for name in files:
+            if not name.lower().endswith(AUDIO_ASSET_EXTS):
+                continue
+            try:
+                audio_to_data_cached(os.path.join(root, name))
+                count += 1
+            except Exception:
+                continue
+    return count
+
+
 def audio_bytes_to_data_stream(audio_bytes, file_type, is_opus, callback: Callable[[Any], Any]) -> None:
     """
     直接用音频二进制数据转为opus/pcm数据，支持wav、mp3、p3
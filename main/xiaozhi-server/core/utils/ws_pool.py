@@ -0,0 +1,177 @@
+"""
+跨连接共享的WebSocket连接池
+
+双流式TTS每轮对话开始时都需要与服务商建立WebSocket连接（DNS、TLS、WebSocket握手、鉴权），
+连接池预先建立并保持若干个已鉴权的连接：
+- 会话开始（SentenceType.FIRST）时取出一个健康的连接，会话正常结束后归还，供其他设备继续使用
+- 空闲超过服务商允许时长、已被关闭或心跳无响应的连接直接丢弃
+- 每次取出连接后在后台补足空闲连接，保证下一次取用时无需等待握手
+- 最近keep_warm_time秒内有设备使用时，后台定期把快到空闲时限的连接换成新连接，
+  避免服务端空闲断开时间很短（如阿里云约10秒）时池中连接在下次取用前全部过期；
+  超过keep_warm_time没有设备使用后停止替换，空闲连接随之过期，不再占用服务端连接数
+
+connect不应持有某个设备的TTS实例（及其连接对象），连接池是进程内共享的，
+否则第一个创建连接池的实例会一直无法释放。
+连接池只在创建连接的事件循环（服务主事件循环）中使用。
+"""
+
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+PING_TIMEOUT = 1  # 健康检查心跳超时（秒）
+
+
+def _is_open(ws) -> bool:
+    return ws is not None and ws.close_code is None
+
+
+class WebSocketPool:
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable],
+        size: int,
+        max_idle_time: float = 50,
+        ping_after: float = 15,
+        keep_warm_time: float = 300,
+        name: str = "ws_pool",
+    ):
+        """
+        Args:
+            connect: 建立一个已鉴权连接的协程函数
+            size: 保持的空闲连接数
+            max_idle_time: 空闲连接最长保留时间（秒），应小于服务商的空闲断开时间
+            ping_after: 空闲超过该时间的连接在取出前先发送心跳检查
+            keep_warm_time: 最后一次使用后继续定期替换空闲连接的时长（秒），0为不定期替换
+            name: 日志中显示的连接池名称
+        """
+        self._connect = connect
+        self.size = max(int(size), 0)
+        self.max_idle_time = float(max_idle_time)
+        self.ping_after = float(ping_after)
+        self.keep_warm_time = float(keep_warm_time)
+        # 定期检查的间隔，空闲超过max_idle_time减去该间隔的连接在检查时替换
+        self.refresh_interval = max(self.max_idle_time / 3, 1)
+        self.name = name
+        self._idle = []  # [(ws, 放回时间)]
+        self._opening = 0
+        self._warm_task = None
+        self._keep_warm_task = None
+        self._last_used = 0.0
+
+    def warm_up(self):
+        """在后台补足空闲连接，不等待连接建立完成"""
+        self._last_used = time.monotonic()
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self._fill())
+        if self.keep_warm_time > 0 and (
+            self._keep_warm_task is None or self._keep_warm_task.done()
+        ):
+            self._keep_warm_task = asyncio.create_task(self._keep_warm())
+
+    async def acquire(self):
+        """取出一个可用连接，没有空闲连接时直接新建"""
+        while self._idle:
+            ws, released_at = self._idle.pop()
+            if await self._healthy(ws, time.monotonic() - released_at):
+                self.warm_up()
+                return ws
+            await self._close(ws)
+        ws = await self._connect()
+        self.warm_up()
+        return ws
+
+    def release(self, ws):
+        """会话正常结束后归还连接，空闲连接已满时关闭"""
+        if not _is_open(ws):
+            return
+        if len(self._idle) >= self.size:
+            asyncio.create_task(self._close(ws))
+            return
+        self._idle.append((ws, time.monotonic()))
+
+    async def _healthy(self, ws, idle_time: float) -> bool:
+        if not _is_open(ws) or idle_time > self.max_idle_time:
+            return False
+        if idle_time <= self.ping_after:
+            return True
+        try:
+            pong = await ws.ping()
+            await asyncio.wait_for(pong, PING_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        """停止定期替换并关闭所有空闲连接"""
+        for task in (self._keep_warm_task, self._warm_task):
+            if task and not task.done():
+                task.cancel()
+        idle, self._idle = self._idle, []
+        for ws, _ in idle:
+            await self._close(ws)
+
+    async def _keep_warm(self):
+        while time.monotonic() - self._last_used < self.keep_warm_time:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                # 下次检查前就会超过空闲时限的连接提前替换
+                await self._fill(self.max_idle_time - self.refresh_interval)
+            except Exception as e:
+                logger.bind(tag=TAG).warning(f"{self.name}替换空闲连接失败: {e}")
+
+    async def _fill(self, max_idle_time: float = None):
+        if max_idle_time is None:
+            max_idle_time = self.max_idle_time
+        # 先清理已失效的空闲连接，关闭期间可能有连接被归还，清理完再关闭
+        now = time.monotonic()
+        alive, expired = [], []
+        for ws, released_at in self._idle:
+            if _is_open(ws) and now - released_at <= max_idle_time:
+                alive.append((ws, released_at))
+            else:
+                expired.append(ws)
+        self._idle = alive
+        for ws in expired:
+            await self._close(ws)
+
+        missing = self.size - len(self._idle) - self._opening
+        if missing <= 0:
+            return
+        self._opening += missing
+        try:
+            results = await asyncio.gather(
+                *[self._connect() for _ in range(missing)], return_exceptions=True
+            )
+        finally:
+            self._opening -= missing
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.bind(tag=TAG).warning(f"{self.name}预建连接失败: {result}")
+            else:
+                self.release(result)
+
+    @staticmethod
+    async def _close(ws):
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+
+_pools: Dict[Hashable, WebSocketPool] = {}
+
+
+def get_ws_pool(key: Hashable, connect: Callable[[], Awaitable], size: int, **kwargs):
+    """按key（服务地址+鉴权信息）获取进程内共享的连接池，size为0时不使用连接池"""
+    if not size or int(size) <= 0:
+        return None
+    pool = _pools.get(key)
+    if pool is None:
+        pool = WebSocketPool(connect, size, **kwargs)
+        _pools[key] = pool
+    return pool
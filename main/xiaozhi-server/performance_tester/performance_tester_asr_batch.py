@@ -0,0 +1,81 @@
+import os
+import time
+import argparse
+import logging
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.asr import create_instance
+from core.utils.util import audio_to_data
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地ASR跨连接批量识别吞吐量测试（每CPU核每秒识别句数）"
+
+
+class ASRBatchPerformanceTester:
+    def __init__(self, asr_name="FunASR", batch_sizes=None, audio_file=None, rounds=3):
+        asr_config = dict(load_config()["ASR"][asr_name])
+        # 测试直接调用批量识别函数，不需要调度器和进程池
+        asr_config.update(batch_window_ms=0, worker_processes=0)
+        self.asr_name = asr_name
+        self.asr = create_instance(asr_config["type"], asr_config, True)
+        self.batch_sizes = batch_sizes or [1, 2, 4, 8, 12, 16]
+        self.audio_file = audio_file or os.path.join(
+            os.getcwd(), "config", "assets", "wakeup_words.wav"
+        )
+        self.rounds = rounds
+        self.results = []
+
+    def _decode_batch(self, pcm_list):
+        if hasattr(self.asr, "decode_batch"):
+            return self.asr.decode_batch(pcm_list)
+        from core.providers.asr.fun_local import _generate_batch
+
+        return _generate_batch(self.asr.model, pcm_list)
+
+    def run(self):
+        pcm_data = b"".join(audio_to_data(self.audio_file, is_opus=False))
+        self._decode_batch([pcm_data])  # 预热
+        for batch_size in self.batch_sizes:
+            pcm_list = [pcm_data] * batch_size
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for _ in range(self.rounds):
+                self._decode_batch(pcm_list)
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            utterances = batch_size * self.rounds
+            self.results.append(
+                [
+                    batch_size,
+                    f"{utterances / wall:.2f}",
+                    f"{utterances / cpu:.2f}",
+                    f"{wall * 1000 / self.rounds:.0f}",
+                ]
+            )
+
+        print(f"{self.asr_name}，测试音频: {os.path.basename(self.audio_file)}")
+        print(
+            tabulate(
+                self.results,
+                headers=["批大小", "吞吐量(句/秒)", "每CPU核吞吐量(句/CPU秒)", "单批耗时(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="本地ASR批量识别吞吐量测试工具")
+    parser.add_argument("--asr", default="FunASR", help="config.yaml中的ASR配置名")
+    parser.add_argument("--file", help="测试录音文件")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    ASRBatchPerformanceTester(args.asr, audio_file=args.file).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    ASRBatchPerformanceTester(args.asr, audio_file=args.file).run()
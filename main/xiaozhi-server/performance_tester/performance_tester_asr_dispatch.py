@@ -0,0 +1,94 @@
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import concurrent.futures
+from tabulate import tabulate
+from core.providers.asr.base import run_in_asr_worker
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "说话结束到ASR开始执行的调度延迟测试（临时线程池+事件循环 vs 常驻ASR工作线程）"
+
+
+async def _mark_start():
+    """模拟speech_to_text，只记录开始执行的时间"""
+    return time.perf_counter()
+
+
+def _dispatch_legacy():
+    """旧实现：每句话临时创建线程池和事件循环"""
+
+    def run_asr():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(_mark_start())
+        finally:
+            loop.close()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as thread_executor:
+        return thread_executor.submit(run_asr).result(timeout=15)
+
+
+class ASRDispatchPerformanceTester:
+    def __init__(self, rounds=200, concurrency=(1, 8, 32)):
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.results = []
+
+    async def _legacy(self):
+        # 旧实现在事件循环中同步等待，这里放到线程中以便模拟多连接并发
+        start = time.perf_counter()
+        asr_start = await asyncio.to_thread(_dispatch_legacy)
+        return asr_start - start
+
+    async def _worker(self):
+        start = time.perf_counter()
+        asr_start = await run_in_asr_worker(_mark_start)
+        return asr_start - start
+
+    async def _measure(self, dispatch, concurrency):
+        latencies = []
+        for _ in range(max(self.rounds // concurrency, 1)):
+            latencies.extend(
+                await asyncio.gather(*[dispatch() for _ in range(concurrency)])
+            )
+        latencies.sort()
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        return statistics.median(latencies), p95
+
+    async def run(self):
+        await self._worker()  # 预热，创建常驻工作线程
+        for concurrency in self.concurrency:
+            for mode, dispatch in (("临时线程池", self._legacy), ("常驻工作线程", self._worker)):
+                p50, p95 = await self._measure(dispatch, concurrency)
+                self.results.append(
+                    [mode, concurrency, f"{p50 * 1000:.3f}", f"{p95 * 1000:.3f}"]
+                )
+
+        print(
+            tabulate(
+                self.results,
+                headers=["调度方式", "并发数", "P50延迟(ms)", "P95延迟(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ASR调度延迟测试工具")
+    parser.add_argument("--rounds", type=int, default=200, help="每种调度方式的测试次数")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await ASRDispatchPerformanceTester(args.rounds).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(ASRDispatchPerformanceTester(args.rounds).run())
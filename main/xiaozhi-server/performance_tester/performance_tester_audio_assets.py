@@ -0,0 +1,60 @@
+import os
+import time
+import argparse
+import logging
+import statistics
+from tabulate import tabulate
+from core.utils.util import audio_to_data, audio_to_data_cached
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "提示音频转码耗时测试（每次转码 vs 内存缓存），以播放6位绑定码为例"
+
+ASSETS_DIR = os.path.join("config", "assets")
+
+
+class AudioAssetsPerformanceTester:
+    def __init__(self, bind_code="123456", rounds=10):
+        self.bind_code = bind_code
+        self.rounds = rounds
+        self.results = []
+
+    def _bind_code_files(self):
+        files = [os.path.join(ASSETS_DIR, "bind_code.wav")]
+        files += [os.path.join(ASSETS_DIR, "bind_code", f"{d}.wav") for d in self.bind_code]
+        return files
+
+    def _measure(self, load):
+        files = self._bind_code_files()
+        latencies = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            for file in files:
+                load(file)
+            latencies.append(time.perf_counter() - start)
+        return statistics.median(latencies)
+
+    def run(self):
+        audio_to_data_cached(os.path.join(ASSETS_DIR, "bind_code.wav"))  # 首次转码
+        for name, load in (("每次转码", audio_to_data), ("内存缓存", audio_to_data_cached)):
+            self.results.append([name, f"{self._measure(load) * 1000:.2f}"])
+
+        print(f"绑定码: {self.bind_code}，共{len(self._bind_code_files())}个音频文件")
+        print(tabulate(self.results, headers=["方式", "准备耗时(ms)"], tablefmt="github"))
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="提示音频缓存性能测试工具")
+    parser.add_argument("--code", default="123456", help="测试用的6位绑定码")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    AudioAssetsPerformanceTester(args.code).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    AudioAssetsPerformanceTester(args.code).run()
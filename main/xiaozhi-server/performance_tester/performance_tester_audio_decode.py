@@ -0,0 +1,88 @@
+import os
+import time
+import argparse
+import opuslib_next
+from tabulate import tabulate
+from core.utils.util import audio_to_data
+
+description = "上行Opus音频解码次数与CPU耗时测试（VAD与ASR重复解码 vs 单次解码共享）"
+
+
+class AudioDecodePerformanceTester:
+    def __init__(self, audio_file=None, devices=20):
+        self.audio_file = audio_file or os.path.join(
+            os.getcwd(), "config", "assets", "wakeup_words.wav"
+        )
+        self.devices = devices
+        self.results = []
+
+    def _load_packets(self):
+        """将测试音频编码为60ms的Opus数据包，模拟设备上行的录音流量"""
+        return audio_to_data(self.audio_file, is_opus=True)
+
+    def _replay_decode_twice(self, packets):
+        """原流程：VAD逐包解码一次，说话结束后ASR用新的解码器再解码一次"""
+        decodes = 0
+        for _ in range(self.devices):
+            vad_decoder = opuslib_next.Decoder(16000, 1)
+            for packet in packets:
+                vad_decoder.decode(packet, 960)
+                decodes += 1
+            asr_decoder = opuslib_next.Decoder(16000, 1)
+            for packet in packets:
+                asr_decoder.decode(packet, 960)
+                decodes += 1
+        return decodes
+
+    def _replay_decode_once(self, packets):
+        """新流程：handleAudioMessage逐包解码一次，VAD与ASR共享PCM"""
+        decodes = 0
+        for _ in range(self.devices):
+            decoder = opuslib_next.Decoder(16000, 1)
+            asr_audio = []
+            for packet in packets:
+                asr_audio.append(decoder.decode(packet, 960))
+                decodes += 1
+            b"".join(asr_audio)
+        return decodes
+
+    def _measure(self, name, func, packets):
+        cpu_start = time.process_time()
+        decodes = func(packets)
+        cpu = time.process_time() - cpu_start
+        frames = len(packets) * self.devices
+        self.results.append(
+            [name, frames, decodes, f"{cpu * 1000:.1f}", f"{cpu * 1e6 / frames:.1f}"]
+        )
+
+    def run(self):
+        packets = self._load_packets()
+        print(
+            f"回放 {os.path.basename(self.audio_file)}: {len(packets)} 个Opus包，模拟 {self.devices} 台设备"
+        )
+        self._measure("VAD与ASR各自解码", self._replay_decode_twice, packets)
+        self._measure("单次解码共享PCM", self._replay_decode_once, packets)
+        print(
+            tabulate(
+                self.results,
+                headers=["流程", "上行帧数", "解码次数", "CPU耗时(ms)", "每帧CPU(us)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="上行音频解码性能测试工具")
+    parser.add_argument("--file", help="回放的音频文件，默认使用唤醒词提示音")
+    parser.add_argument("--devices", type=int, default=20, help="模拟设备数")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    AudioDecodePerformanceTester(args.file, args.devices).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    AudioDecodePerformanceTester(args.file, args.devices).run()
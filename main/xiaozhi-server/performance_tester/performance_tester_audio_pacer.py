@@ -0,0 +1,162 @@
+import time
+import random
+import asyncio
+import argparse
+import logging
+import selectors
+import statistics
+from tabulate import tabulate
+from core.utils import audio_pacer
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音频发送节奏测试（每个连接每帧asyncio.sleep vs 每个事件循环一个时间轮调度器），统计500路并发时的事件循环唤醒次数和发送抖动"
+
+FRAME_DURATION = 60
+FRAME = bytes(120)
+
+
+class _CountingSelector(selectors.DefaultSelector):
+    """统计事件循环每次等待事件（唤醒）的次数"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def select(self, timeout=None):
+        if timeout is None or timeout > 0:
+            self.calls += 1
+        return super().select(timeout)
+
+
+class _FakeWebSocket:
+    def __init__(self, loop):
+        self.loop = loop
+        self.send_times = []
+
+    async def send(self, data):
+        self.send_times.append(self.loop.time())
+
+
+class _FakeConnection:
+    def __init__(self, loop):
+        self.client_abort = False
+        self.conn_from_mqtt_gateway = False
+        self.last_activity_time = 0.0
+        self.websocket = _FakeWebSocket(loop)
+
+
+async def _legacy_send(conn, flow_control, opus_packet):
+    """原实现：每个连接自己维护流控状态，每帧sleep到预期时间再发送"""
+    current_time = time.perf_counter()
+    expected_time = flow_control["start_time"] + (
+        flow_control["packet_count"] * FRAME_DURATION / 1000
+    )
+    delay = expected_time - current_time
+    if delay > 0:
+        await asyncio.sleep(delay)
+    else:
+        flow_control["start_time"] += abs(delay)
+    await conn.websocket.send(opus_packet)
+    flow_control["packet_count"] += 1
+
+
+async def _pacer_send_frame(conn, opus_packet, start_time, packet_index, sequence):
+    await conn.websocket.send(opus_packet)
+
+
+class AudioPacerPerformanceTester:
+    def __init__(self, streams=500, seconds=10.0):
+        self.streams = streams
+        self.frames = int(seconds * 1000 / FRAME_DURATION)
+        self.results = []
+
+    async def _run_legacy(self, conn, loop):
+        flow_control = {"start_time": time.perf_counter(), "packet_count": 0}
+        for _ in range(self.frames):
+            await _legacy_send(conn, flow_control, FRAME)
+
+    async def _run_pacer(self, conn, loop):
+        pacer = audio_pacer.get_audio_pacer(_pacer_send_frame)
+        # 与TTS播放线程一致，逐帧交给调度器
+        for _ in range(self.frames):
+            await pacer.enqueue(conn, (FRAME,), FRAME_DURATION)
+        await pacer.wait_sent(conn)
+
+    async def _stream(self, run, loop, rng):
+        # 各路在一帧时长内随机错开开始
+        await asyncio.sleep(rng.random() * FRAME_DURATION / 1000)
+        conn = _FakeConnection(loop)
+        await run(conn, loop)
+        return conn.websocket.send_times
+
+    async def _run_all(self, run, rng):
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(self._stream(run, loop, rng) for _ in range(self.streams))
+        )
+
+    def _test(self, name, run, skip_frames):
+        selector = _CountingSelector()
+        loop = asyncio.SelectorEventLoop(selector)
+        rng = random.Random(0)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        try:
+            send_times = loop.run_until_complete(self._run_all(run, rng))
+        finally:
+            loop.close()
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+        # 抖动：相邻两帧的发送间隔与帧时长之差，跳过开头的预缓冲帧
+        jitters = sorted(
+            abs((times[i] - times[i - 1]) * 1000 - FRAME_DURATION)
+            for times in send_times
+            for i in range(skip_frames + 1, len(times))
+        )
+        self.results.append(
+            [
+                name,
+                f"{selector.calls / wall:.0f}",
+                f"{statistics.mean(jitters):.2f}",
+                f"{jitters[int(len(jitters) * 0.99) - 1]:.2f}",
+                f"{jitters[-1]:.2f}",
+                f"{cpu / wall * 100:.1f}%",
+            ]
+        )
+
+    def run(self):
+        self._test("每帧asyncio.sleep", self._run_legacy, 0)
+        self._test("时间轮调度器", self._run_pacer, audio_pacer.PRE_BUFFER_FRAMES)
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    f"方式（{self.streams}路）",
+                    "事件循环唤醒/秒",
+                    "平均抖动(ms)",
+                    "P99抖动(ms)",
+                    "最大抖动(ms)",
+                    "CPU占用",
+                ],
+                tablefmt="github",
+            )
+        )
+        print(f"时间轮刻度: {audio_pacer.TICK_MS}ms，调度器发送时间最多延后一个刻度")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="音频发送节奏调度器性能测试工具")
+    parser.add_argument("--streams", type=int, default=500, help="并发音频流数量")
+    parser.add_argument("--seconds", type=float, default=10.0, help="每路音频时长（秒）")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    AudioPacerPerformanceTester(args.streams, args.seconds).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    AudioPacerPerformanceTester(args.streams, args.seconds).run()
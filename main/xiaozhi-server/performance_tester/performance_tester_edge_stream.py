@@ -0,0 +1,113 @@
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import edge_tts
+from tabulate import tabulate
+from core.utils.util import audio_bytes_to_data_stream
+from core.utils.stream_decoder import StreamingAudioDecoder
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "Edge TTS首帧延迟测试（整句合成后转码 vs 边合成边解码），需要能访问Edge TTS服务"
+
+TEST_SENTENCES = [
+    "人工智能正在深刻改变我们的生活方式，从语音助手到自动驾驶，从医疗诊断到金融风控，几乎每个行业都在经历一场由数据和算法驱动的变革。",
+    "今天的天气预报显示，上午晴转多云，下午可能有短时雷阵雨，最高气温三十二度，最低气温二十四度，出门记得带伞，注意防暑降温。",
+    "这个故事讲的是一只小狐狸在森林里迷了路，它遇到了聪明的猫头鹰、热心的松鼠和胆小的兔子，大家一起帮助它在天黑之前找到了回家的路。",
+]
+
+
+class EdgeStreamPerformanceTester:
+    def __init__(self, voice="zh-CN-XiaoxiaoNeural", rounds=3):
+        self.voice = voice
+        self.rounds = rounds
+        self.results = []
+
+    async def _full_then_transcode(self, text):
+        """原实现：收齐整句mp3后再整体转码"""
+        start = time.perf_counter()
+        first_frame = None
+        audio_chunks = []
+        async for chunk in edge_tts.Communicate(text, voice=self.voice).stream():
+            if chunk["type"] == "audio":
+                audio_chunks.append(chunk["data"])
+        frames = []
+
+        def on_frame(frame):
+            nonlocal first_frame
+            if first_frame is None:
+                first_frame = time.perf_counter() - start
+            frames.append(frame)
+
+        audio_bytes_to_data_stream(
+            b"".join(audio_chunks), file_type="mp3", is_opus=True, callback=on_frame
+        )
+        return first_frame, time.perf_counter() - start, len(frames)
+
+    async def _streaming(self, text):
+        start = time.perf_counter()
+        first_frame = None
+        frames = []
+
+        def on_frame(frame):
+            nonlocal first_frame
+            if first_frame is None:
+                first_frame = time.perf_counter() - start
+            frames.append(frame)
+
+        decoder = StreamingAudioDecoder(on_frame, input_format="mp3", is_opus=True)
+        await decoder.start()
+        async for chunk in edge_tts.Communicate(text, voice=self.voice).stream():
+            if chunk["type"] == "audio":
+                await decoder.feed(chunk["data"])
+        await decoder.finish()
+        return first_frame, time.perf_counter() - start, len(frames)
+
+    async def run(self):
+        for name, synthesize in (
+            ("整句合成后转码", self._full_then_transcode),
+            ("边合成边解码", self._streaming),
+        ):
+            first_frames, totals, frame_counts = [], [], []
+            for _ in range(self.rounds):
+                for text in TEST_SENTENCES:
+                    first_frame, total, frame_count = await synthesize(text)
+                    first_frames.append(first_frame)
+                    totals.append(total)
+                    frame_counts.append(frame_count)
+            self.results.append(
+                [
+                    name,
+                    f"{statistics.median(first_frames) * 1000:.0f}",
+                    f"{statistics.median(totals) * 1000:.0f}",
+                    f"{statistics.mean(frame_counts):.0f}",
+                ]
+            )
+
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "首帧延迟中位数(ms)", "整句耗时中位数(ms)", "平均帧数"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Edge TTS流式解码性能测试工具")
+    parser.add_argument("--voice", default="zh-CN-XiaoxiaoNeural", help="Edge TTS音色")
+    parser.add_argument("--rounds", type=int, default=3, help="每句测试轮数")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await EdgeStreamPerformanceTester(args.voice, args.rounds).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(EdgeStreamPerformanceTester(args.voice, args.rounds).run())
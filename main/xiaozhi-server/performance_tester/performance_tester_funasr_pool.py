@@ -0,0 +1,85 @@
+import os
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.util import audio_to_data
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地FunASR线程模式与进程池模式在不同并发下的识别延迟测试"
+
+
+class FunASRPoolPerformanceTester:
+    def __init__(self, workers=None, concurrency=(1, 4, 16, 32), audio_file=None):
+        self.asr_config = dict(load_config()["ASR"]["FunASR"])
+        self.workers = workers or os.cpu_count()
+        self.concurrency = concurrency
+        self.audio_file = audio_file or os.path.join(
+            os.getcwd(), "config", "assets", "wakeup_words.wav"
+        )
+        self.results = []
+
+    def _create_asr(self, worker_processes):
+        from core.providers.asr.fun_local import ASRProvider
+
+        config = dict(self.asr_config, worker_processes=worker_processes)
+        return ASRProvider(config, True)
+
+    async def _measure(self, asr, pcm_frames, concurrency):
+        """模拟concurrency台设备同时说完话，每个请求像handle_voice_stop一样在独立线程中识别"""
+
+        def recognize(session_id):
+            start = time.perf_counter()
+            asyncio.run(asr.speech_to_text(pcm_frames, session_id, "pcm"))
+            return time.perf_counter() - start
+
+        latencies = await asyncio.gather(
+            *[asyncio.to_thread(recognize, f"device-{i}") for i in range(concurrency)]
+        )
+        latencies = sorted(latencies)
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        return statistics.median(latencies), p95
+
+    async def run(self):
+        pcm_frames = audio_to_data(self.audio_file, is_opus=False)
+        for mode, worker_processes in (("thread", 0), ("pool", self.workers)):
+            asr = self._create_asr(worker_processes)
+            # 预热，进程池模式下等待所有工作进程加载完模型
+            await self._measure(asr, pcm_frames, max(worker_processes, 1))
+            for concurrency in self.concurrency:
+                p50, p95 = await self._measure(asr, pcm_frames, concurrency)
+                self.results.append(
+                    [mode, concurrency, f"{p50 * 1000:.0f}", f"{p95 * 1000:.0f}"]
+                )
+            if asr.pool:
+                asr.pool.shutdown()
+
+        print(
+            tabulate(
+                self.results,
+                headers=["模式", "并发数", "P50延迟(ms)", "P95延迟(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FunASR进程池性能测试工具")
+    parser.add_argument("--workers", type=int, help="进程池模式的工作进程数，默认为CPU核数")
+    parser.add_argument("--file", help="测试录音文件")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await FunASRPoolPerformanceTester(args.workers, audio_file=args.file).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(FunASRPoolPerformanceTester(args.workers, audio_file=args.file).run())
@@ -0,0 +1,108 @@
+import time
+import asyncio
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from tabulate import tabulate
+from core.utils import http_client
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "HTTP类TTS请求方式对比：每次requests请求 vs 共享连接池，统计新建连接数和P95单句耗时"
+
+FAKE_AUDIO = b"\x00" * 32000  # 1秒16kHz 16位静音
+
+
+class _FakeTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持keep-alive
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _FakeTTSHandler.lock:
+            _FakeTTSHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(0.02)  # 模拟合成耗时
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Content-Length", str(len(FAKE_AUDIO)))
+        self.end_headers()
+        self.wfile.write(FAKE_AUDIO)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpClientPerformanceTester:
+    def __init__(self, devices=8, sentences=25):
+        self.devices = devices
+        self.sentences = sentences
+        self.results = []
+
+    async def _run_devices(self, synthesize):
+        """模拟多台设备同时对话，每台设备依次合成多句话"""
+
+        async def device(device_id):
+            latencies = []
+            for i in range(self.sentences):
+                start = time.perf_counter()
+                await synthesize(f"设备{device_id}的第{i}句")
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        results = await asyncio.gather(*[device(d) for d in range(self.devices)])
+        latencies = sorted(latency for result in results for latency in result)
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+    async def run(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTTSHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/tts"
+
+        async def with_requests(text):
+            # 原实现：每句在线程中用requests发起请求，不复用连接
+            return await asyncio.to_thread(
+                lambda: requests.post(url, json={"text": text}).content
+            )
+
+        async def with_pool(text):
+            return (await http_client.post(url, json={"text": text})).content
+
+        for name, synthesize in (("requests", with_requests), ("共享连接池", with_pool)):
+            _FakeTTSHandler.connections = 0
+            p95 = await self._run_devices(synthesize)
+            self.results.append(
+                [name, self.devices * self.sentences, _FakeTTSHandler.connections, f"{p95 * 1000:.1f}"]
+            )
+
+        server.shutdown()
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "请求数", "新建连接数", "P95单句耗时(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP连接池性能测试工具")
+    parser.add_argument("--devices", type=int, default=8, help="同时对话的设备数")
+    parser.add_argument("--sentences", type=int, default=25, help="每台设备合成的句子数")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await HttpClientPerformanceTester(args.devices, args.sentences).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(HttpClientPerformanceTester(args.devices, args.sentences).run())
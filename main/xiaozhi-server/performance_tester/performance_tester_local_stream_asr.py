@@ -0,0 +1,102 @@
+import os
+import time
+import asyncio
+import argparse
+import logging
+from tabulate import tabulate
+from pydub import AudioSegment
+from config.settings import load_config
+from core.utils.asr import create_instance
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地离线ASR与流式ASR说话结束到出结果的延迟测试"
+
+FRAME_BYTES = 1920  # 60ms 16kHz 16位PCM
+
+
+class LocalStreamASRPerformanceTester:
+    def __init__(self, offline_key, stream_key, audio_file=None, durations=(2, 5, 10)):
+        config = load_config()
+        self.asr_configs = config.get("ASR", {})
+        self.offline_key = offline_key
+        self.stream_key = stream_key
+        self.audio_file = audio_file or os.path.join(
+            os.getcwd(), "config", "assets", "wakeup_words.wav"
+        )
+        self.durations = durations
+        self.results = []
+
+    def _create_asr(self, key):
+        asr_config = self.asr_configs[key]
+        return create_instance(asr_config["type"], asr_config, True)
+
+    def _build_utterance(self, seconds):
+        """循环拼接测试录音，得到指定时长的60ms PCM帧列表"""
+        audio = AudioSegment.from_file(self.audio_file, parameters=["-nostdin"])
+        audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+        raw = audio.raw_data
+        target = int(seconds * 16000 * 2)
+        data = (raw * (target // len(raw) + 1))[:target]
+        return [data[i : i + FRAME_BYTES] for i in range(0, len(data), FRAME_BYTES)]
+
+    async def _offline_latency(self, asr, frames):
+        """离线识别：说话结束后才开始整句识别"""
+        start = time.perf_counter()
+        await asr.speech_to_text(frames, "perf", "pcm")
+        return time.perf_counter() - start
+
+    def _stream_latency(self, asr, frames):
+        """流式识别：说话过程中逐帧解码，只统计说话结束后的收尾耗时"""
+        from core.providers.asr.sherpa_onnx_stream import OnlineSession
+
+        session = OnlineSession(asr.model.create_stream())
+        for frame in frames:
+            asr._accept_frames(session, [frame])
+        start = time.perf_counter()
+        asr._finish(session)
+        return time.perf_counter() - start
+
+    async def run(self):
+        offline_asr = self._create_asr(self.offline_key)
+        stream_asr = self._create_asr(self.stream_key)
+        for seconds in self.durations:
+            frames = self._build_utterance(seconds)
+            offline = await self._offline_latency(offline_asr, frames)
+            stream = self._stream_latency(stream_asr, frames)
+            self.results.append(
+                [f"{seconds}s", f"{offline * 1000:.0f}", f"{stream * 1000:.0f}"]
+            )
+
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "语音时长",
+                    f"{self.offline_key}延迟(ms)",
+                    f"{self.stream_key}延迟(ms)",
+                ],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="本地流式ASR延迟测试工具")
+    parser.add_argument("--offline", default="SherpaASR", help="离线ASR配置名")
+    parser.add_argument("--stream", default="SherpaStreamASR", help="流式ASR配置名")
+    parser.add_argument("--file", help="用于拼接测试语音的录音文件")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await LocalStreamASRPerformanceTester(args.offline, args.stream, args.file).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(
+        LocalStreamASRPerformanceTester(args.offline, args.stream, args.file).run()
+    )
@@ -0,0 +1,115 @@
+import os
+import time
+import argparse
+import logging
+import tempfile
+import threading
+import subprocess
+import psutil
+from tabulate import tabulate
+from core.utils import p3
+from core.utils.stream_decoder import FRAME_DURATION, iter_audio_file_frames
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音乐播放CPU开销测试（每次播放实时解码转码 vs 预先转码的p3内存映射），模拟100路并发播放"
+
+
+def _make_test_music(duration):
+    """用ffmpeg生成一段立体声44.1kHz的测试mp3"""
+    path = os.path.join(tempfile.gettempdir(), f"music_library_test_{duration}s.mp3")
+    if not os.path.exists(path):
+        subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+                "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+                "-ac", "2", "-ar", "44100", path,
+            ],
+            check=True,
+        )
+    return path
+
+
+def _cpu_seconds():
+    """本进程及已回收子进程（ffmpeg）累计的CPU时间"""
+    times = psutil.Process().cpu_times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class MusicLibraryPerformanceTester:
+    def __init__(self, music_file, streams=100):
+        self.music_file = music_file
+        self.streams = streams
+        self.results = []
+
+    def _run_streams(self, open_frames):
+        """每路完整读取一遍歌曲的所有帧（不按实时节奏等待），统计总CPU时间"""
+        frame_counts = []
+
+        def play():
+            count = 0
+            for _ in open_frames():
+                count += 1
+            frame_counts.append(count)
+
+        cpu_start, wall_start = _cpu_seconds(), time.perf_counter()
+        threads = [threading.Thread(target=play) for _ in range(self.streams)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cpu, wall = _cpu_seconds() - cpu_start, time.perf_counter() - wall_start
+
+        audio_seconds = sum(frame_counts) * FRAME_DURATION / 1000
+        # 实时播放时每路每秒音频消耗的CPU，乘以路数即为并发播放需要的CPU核数
+        per_stream = cpu / audio_seconds
+        return [
+            f"{cpu:.2f}",
+            f"{wall:.2f}",
+            f"{per_stream * 100:.3f}%",
+            f"{per_stream * self.streams:.3f}",
+        ]
+
+    def run(self):
+        p3_file = os.path.join(tempfile.gettempdir(), "music_library_test.p3")
+        start = time.perf_counter()
+        p3.encode_opus_to_file(iter_audio_file_frames(self.music_file), p3_file)
+        print(f"预先转码耗时: {time.perf_counter() - start:.2f}s（每首歌只需一次）")
+
+        self.results.append(
+            ["实时解码转码"] + self._run_streams(lambda: iter_audio_file_frames(self.music_file))
+        )
+        self.results.append(
+            ["p3内存映射"] + self._run_streams(lambda: p3.iter_opus_from_file(p3_file))
+        )
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "方式",
+                    f"{self.streams}路总CPU时间(s)",
+                    "墙钟耗时(s)",
+                    "每路实时播放CPU占用",
+                    f"{self.streams}路实时播放需要的CPU核数",
+                ],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="音乐库预转码性能测试工具")
+    parser.add_argument("--file", help="测试用的音乐文件，不指定时生成1分钟的测试mp3")
+    parser.add_argument("--streams", type=int, default=100, help="并发播放路数")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    MusicLibraryPerformanceTester(args.file or _make_test_music(60), args.streams).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    MusicLibraryPerformanceTester(args.file or _make_test_music(60), args.streams).run()
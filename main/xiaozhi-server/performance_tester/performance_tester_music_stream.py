@@ -0,0 +1,163 @@
+import os
+import time
+import argparse
+import logging
+import tempfile
+import threading
+import subprocess
+import statistics
+import psutil
+from tabulate import tabulate
+from core.utils.util import audio_to_data_stream
+from core.utils.stream_decoder import FRAME_DURATION, iter_audio_file_frames
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音乐播放解码测试（整文件解码 vs 逐帧流式解码），统计多路并发播放的内存占用和首帧延迟"
+
+MAX_BUFFERED_FRAMES = 50  # 与TTS基类一致：每路最多预先解码的帧数
+
+
+def _make_test_music(duration):
+    """用ffmpeg生成一段立体声44.1kHz的测试mp3"""
+    path = os.path.join(tempfile.gettempdir(), f"music_stream_test_{duration}s.mp3")
+    if not os.path.exists(path):
+        subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+                "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+                "-ac", "2", "-ar", "44100", path,
+            ],
+            check=True,
+        )
+    return path
+
+
+class _RssMonitor:
+    """定时采样本进程及ffmpeg子进程的总内存，记录峰值"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.base = self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+
+
+class MusicStreamPerformanceTester:
+    def __init__(self, music_file, streams=50, play_seconds=10):
+        self.music_file = music_file
+        self.streams = streams
+        self.play_seconds = play_seconds
+        self.results = []
+
+    def _whole_file(self, first_frames, abort_times):
+        """原实现：pydub整文件解码为PCM后编码，所有帧一次性进入播放队列"""
+        start = time.perf_counter()
+        frames = []
+
+        def on_frame(frame):
+            if not frames:
+                first_frames.append(time.perf_counter() - start)
+            frames.append(frame)
+
+        audio_to_data_stream(self.music_file, is_opus=True, callback=on_frame)
+        # 播放期间所有帧常驻内存，打断只能在解码全部结束后生效
+        time.sleep(self.play_seconds)
+        abort_start = time.perf_counter()
+        frames.clear()
+        abort_times.append(time.perf_counter() - abort_start)
+
+    def _streaming(self, first_frames, abort_times):
+        """逐帧解码，模拟播放进度：预缓冲50帧，之后每60ms取一帧"""
+        start = time.perf_counter()
+        frames = iter_audio_file_frames(self.music_file, is_opus=True)
+        buffered = 0
+        for _ in frames:
+            if buffered == 0:
+                first_frames.append(time.perf_counter() - start)
+            buffered += 1
+            if buffered >= MAX_BUFFERED_FRAMES:
+                time.sleep(FRAME_DURATION / 1000)
+            if time.perf_counter() - start >= self.play_seconds:
+                break
+        abort_start = time.perf_counter()
+        frames.close()
+        abort_times.append(time.perf_counter() - abort_start)
+
+    def _run_streams(self, play):
+        first_frames, abort_times = [], []
+        with _RssMonitor() as monitor:
+            threads = [
+                threading.Thread(target=play, args=(first_frames, abort_times))
+                for _ in range(self.streams)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        first_frames.sort()
+        return [
+            f"{(monitor.peak - monitor.base) / 1024 / 1024:.0f}",
+            f"{statistics.median(first_frames) * 1000:.0f}",
+            f"{first_frames[-1] * 1000:.0f}",
+            f"{statistics.median(abort_times) * 1000:.1f}",
+        ]
+
+    def run(self):
+        for name, play in (("整文件解码", self._whole_file), ("逐帧流式解码", self._streaming)):
+            self.results.append([name] + self._run_streams(play))
+        print(f"测试文件: {self.music_file}，并发播放: {self.streams}路")
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "峰值内存增量(MB)", "首帧延迟中位数(ms)", "首帧延迟最大值(ms)", "停止耗时(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="音乐流式解码性能测试工具")
+    parser.add_argument("--file", help="测试用的音乐文件，不指定时生成5分钟的测试mp3")
+    parser.add_argument("--streams", type=int, default=50, help="并发播放路数")
+    parser.add_argument("--play-seconds", type=float, default=10, help="每路播放多少秒后停止")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    MusicStreamPerformanceTester(
+        args.file or _make_test_music(300), args.streams, args.play_seconds
+    ).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    MusicStreamPerformanceTester(
+        args.file or _make_test_music(300), args.streams, args.play_seconds
+    ).run()
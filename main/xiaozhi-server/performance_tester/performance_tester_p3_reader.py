@@ -0,0 +1,104 @@
+import os
+import time
+import random
+import argparse
+import logging
+import tempfile
+import tracemalloc
+from tabulate import tabulate
+from core.utils import p3
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "p3文件读取内存测试（一次性读入数据包列表 vs 惰性读取器），并测试按时间定位的耗时"
+
+
+def _make_test_p3(hours, with_index):
+    """生成指定时长的p3文件，数据包为随机长度的占位数据（不影响读取开销）"""
+    suffix = "indexed" if with_index else "plain"
+    path = os.path.join(tempfile.gettempdir(), f"p3_reader_test_{hours}h_{suffix}.p3")
+    if not os.path.exists(path):
+        rng = random.Random(0)
+        packets = int(hours * 3600 * 1000 / p3.FRAME_DURATION_MS)
+        p3.encode_opus_to_file(
+            (bytes(rng.randint(60, 200)) for _ in range(packets)), path
+        )
+        if not with_index:
+            os.remove(path + p3.INDEX_SUFFIX)
+    return path
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+class P3ReaderPerformanceTester:
+    def __init__(self, hours=1.0):
+        self.hours = hours
+        self.results = []
+
+    def _read_all(self, path):
+        opus_datas, _ = p3.decode_opus_from_file(path)
+        return len(opus_datas)
+
+    def _read_lazy(self, path):
+        count = 0
+        with p3.P3Reader(path) as reader:
+            for _ in reader:
+                count += 1
+        return count
+
+    def _seek(self, path):
+        # 从中间位置继续播放，读取10秒
+        with p3.P3Reader(path) as reader:
+            reader.seek_time(self.hours * 3600 / 2)
+            return sum(1 for _, _ in zip(reader, range(int(10000 / p3.FRAME_DURATION_MS))))
+
+    def run(self):
+        plain = _make_test_p3(self.hours, with_index=False)
+        indexed = _make_test_p3(self.hours, with_index=True)
+        print(f"测试文件: {os.path.getsize(plain) / 1024 / 1024:.1f}MB，时长{self.hours}小时")
+
+        cases = (
+            ("一次性读入列表", self._read_all, plain),
+            ("惰性读取器", self._read_lazy, plain),
+            ("惰性读取器(有索引)", self._read_lazy, indexed),
+            ("定位到中间再读10秒", self._seek, plain),
+            ("定位到中间再读10秒(有索引)", self._seek, indexed),
+        )
+        for name, func, path in cases:
+            packets, elapsed, peak = _measure(lambda: func(path))
+            self.results.append(
+                [name, packets, f"{elapsed * 1000:.1f}", f"{peak / 1024 / 1024:.2f}"]
+            )
+
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "读取数据包数", "耗时(ms)", "Python峰值内存(MB)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="p3惰性读取器性能测试工具")
+    parser.add_argument("--hours", type=float, default=1.0, help="测试文件时长（小时）")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    P3ReaderPerformanceTester(args.hours).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    P3ReaderPerformanceTester(args.hours).run()
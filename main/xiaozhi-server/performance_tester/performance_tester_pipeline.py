@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import queue
+import time
+import asyncio
+import argparse
+import threading
+import subprocess
+from types import SimpleNamespace
+from tabulate import tabulate
+
+description = "连接处理模式(thread/asyncio)线程数与内存占用测试"
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _simulate_connections(mode: str, count: int, hold_seconds: float) -> dict:
+    """在当前进程中模拟count个空闲连接，返回线程数和RSS"""
+    import psutil
+    from core.utils import pipeline
+    from core.providers.asr.base import ASRProviderBase
+    from core.providers.tts.default import DefaultTTS
+
+    class IdleASR(ASRProviderBase):
+        async def speech_to_text(self, opus_data, session_id, audio_format="opus"):
+            return "", None
+
+    process = psutil.Process()
+    base_threads = threading.active_count()
+    base_rss = process.memory_info().rss
+
+    config = {"pipeline_mode": mode, "pipeline_workers": 32}
+    loop = asyncio.get_running_loop()
+    asr = IdleASR()
+    conns = []
+    for _ in range(count):
+        async_pipeline = pipeline.is_async_pipeline(config)
+        conn = SimpleNamespace(
+            loop=loop,
+            stop_event=threading.Event(),
+            async_pipeline=async_pipeline,
+            pipeline_tasks=[],
+            executor=pipeline.get_shared_executor(32) if async_pipeline else None,
+            asr_audio_queue=queue.Queue(),
+        )
+        conn.tts = DefaultTTS({}, delete_audio_file=True)
+        await asr.open_audio_channels(conn)
+        await conn.tts.open_audio_channels(conn)
+        conns.append(conn)
+
+    await asyncio.sleep(hold_seconds)
+    result = {
+        "mode": mode,
+        "connections": count,
+        "threads": threading.active_count() - base_threads,
+        "rss_mb": (process.memory_info().rss - base_rss) / 1024 / 1024,
+    }
+
+    for conn in conns:
+        conn.stop_event.set()
+        for task in conn.pipeline_tasks:
+            task.cancel()
+    return result
+
+
+class PipelinePerformanceTester:
+    def __init__(self, count=500, hold_seconds=3.0):
+        self.count = count
+        self.hold_seconds = hold_seconds
+        self.results = []
+
+    def _run_mode(self, mode: str) -> dict:
+        """每种模式在独立进程中运行，避免相互影响内存统计"""
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--worker",
+                mode,
+                "--count",
+                str(self.count),
+                "--hold",
+                str(self.hold_seconds),
+            ],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+        )
+        for line in output.stdout.splitlines()[::-1]:
+            if line.startswith("{"):
+                return json.loads(line)
+        raise RuntimeError(output.stderr[-2000:])
+
+    def run(self):
+        print(f"模拟 {self.count} 个空闲连接，分别测试 thread 和 asyncio 模式...")
+        for mode in ("thread", "asyncio"):
+            start = time.time()
+            result = self._run_mode(mode)
+            result["elapsed"] = time.time() - start
+            self.results.append(result)
+
+        table = [
+            [
+                r["mode"],
+                r["connections"],
+                r["threads"],
+                f"{r['threads'] / r['connections']:.2f}",
+                f"{r['rss_mb']:.1f}",
+            ]
+            for r in self.results
+        ]
+        print(
+            tabulate(
+                table,
+                headers=["模式", "连接数", "新增线程数", "每连接线程数", "新增RSS(MB)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="连接处理模式性能测试工具")
+    parser.add_argument("--count", type=int, default=500, help="模拟连接数")
+    parser.add_argument("--hold", type=float, default=3.0, help="统计前保持的秒数")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    PipelinePerformanceTester(args.count, args.hold).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.worker:
+        sys.path.insert(0, PROJECT_DIR)
+        result = asyncio.run(_simulate_connections(args.worker, args.count, args.hold))
+        print(json.dumps(result))
+    else:
+        PipelinePerformanceTester(args.count, args.hold).run()
@@ -0,0 +1,161 @@
+import os
+import time
+import random
+import difflib
+import argparse
+import logging
+import statistics
+from tabulate import tabulate
+from core.utils.song_index import SongIndex
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "歌名模糊匹配耗时测试（逐首difflib比较 vs 二元组倒排索引的近似/精确模式），曲库规模1千/1万/10万首"
+
+# 常用汉字，用于生成随机歌名
+CHARS = (
+    "爱你我他她的是不了在人有这中大为上个国和地到以说时要就出会可也你对生能而子那得于着下自之年过发后作里"
+    "如家多经么去法学都同现当没动面起看定天分还进好小部其些主样理心本前开但因只从想实日军者意无力它与长把"
+    "机十民第公此已工使情明性知全三又关点正业外将两高间由问很最重并物手应战向头文体政美相见被利什二等产或"
+    "新己制身果加西斯月话合回特代内信表化老给世位次度门任常先海通教儿原东声提立及比员解水名真论处走义各入"
+    "几口认条平系气题活尔更别打女变四神总何电数安少报才结反受目太量再感建务做接必场件计管期市直德资命山金"
+    "星月光风雨花雪夜梦春秋夏冬城路远歌唱虎雁海岸晴天云朵蓝白红青梅竹马故乡"
+)
+
+
+def _random_name(rng):
+    name = "".join(rng.choice(CHARS) for _ in range(rng.randint(3, 10)))
+    if rng.random() < 0.3:
+        name = f"{rng.choice(['儿歌', '流行', '经典', '民谣'])}/{name}"
+    return name + rng.choice([".mp3", ".wav", ".p3"])
+
+
+def _perturb(music_file, rng):
+    """模拟语音识别出来的歌名：去掉目录和扩展名，随机删除或替换一个字"""
+    name = list(os.path.splitext(os.path.basename(music_file))[0])
+    if len(name) > 3:
+        i = rng.randrange(len(name))
+        if rng.random() < 0.5:
+            del name[i]
+        else:
+            name[i] = rng.choice(CHARS)
+    return "".join(name)
+
+
+def _difflib_best_match(potential_song, music_files):
+    """原实现：与每一首歌逐一计算difflib相似度"""
+    best_match, highest_ratio = None, 0
+    for music_file in music_files:
+        song_name = os.path.splitext(music_file)[0]
+        ratio = difflib.SequenceMatcher(None, potential_song, song_name).ratio()
+        if ratio > highest_ratio and ratio > 0.4:
+            highest_ratio, best_match = ratio, music_file
+    return best_match
+
+
+class SongIndexPerformanceTester:
+    def __init__(self, sizes=(1000, 10000, 100000), queries=200, difflib_queries=50):
+        self.sizes = sizes
+        self.queries = queries
+        # difflib逐首比较在大曲库上很慢，只测少量查询，并用其结果统计索引查询与全量比较的一致率
+        self.difflib_queries = difflib_queries
+        self.results = []
+        self.exact_mismatches = 0
+
+    def _test_size(self, size, rng):
+        music_files = list({_random_name(rng) for _ in range(size)})
+        queries = [_perturb(rng.choice(music_files), rng) for _ in range(self.queries)]
+
+        start = time.perf_counter()
+        index = SongIndex(music_files)
+        build_time = time.perf_counter() - start
+
+        latencies, index_results = self._query(index, queries, exact=False)
+        exact_latencies, exact_results = self._query(index, queries, exact=True)
+
+        difflib_latencies, same, exact_same = [], 0, 0
+        for query, index_result, exact_result in zip(
+            queries[: self.difflib_queries], index_results, exact_results
+        ):
+            start = time.perf_counter()
+            difflib_result = _difflib_best_match(query, music_files)
+            difflib_latencies.append(time.perf_counter() - start)
+            same += difflib_result == index_result
+            exact_same += difflib_result == exact_result
+        self.exact_mismatches += len(difflib_latencies) - exact_same
+
+        # 增量更新：替换1%的歌曲
+        changed = max(size // 100, 1)
+        new_files = music_files[changed:] + [_random_name(rng) for _ in range(changed)]
+        start = time.perf_counter()
+        index.update(new_files)
+        update_time = time.perf_counter() - start
+
+        return [
+            len(music_files),
+            f"{build_time * 1000:.0f}",
+            f"{update_time * 1000:.1f}",
+            f"{statistics.median(difflib_latencies) * 1000:.1f}",
+            f"{statistics.median(latencies) * 1000:.3f}",
+            f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f}",
+            f"{same}/{len(difflib_latencies)}",
+            f"{statistics.median(exact_latencies) * 1000:.3f}",
+            f"{exact_same}/{len(difflib_latencies)}",
+        ]
+
+    @staticmethod
+    def _query(index, queries, exact):
+        latencies, results = [], []
+        for query in queries:
+            start = time.perf_counter()
+            results.append(index.best_match(query, exact=exact))
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        return latencies, results
+
+    def run(self):
+        rng = random.Random(0)
+        for size in self.sizes:
+            self.results.append(self._test_size(size, rng))
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "曲库大小",
+                    "建索引(ms)",
+                    "增量更新1%(ms)",
+                    "difflib逐首比较(ms)",
+                    "近似查询中位数(ms)",
+                    "近似查询P99(ms)",
+                    "近似查询与difflib一致",
+                    "精确查询中位数(ms)",
+                    "精确查询与difflib一致",
+                ],
+                tablefmt="github",
+            )
+        )
+        if self.exact_mismatches:
+            print(f"警告: {self.exact_mismatches}次精确查询的结果与difflib逐首比较不一致")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="歌名索引性能测试工具")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="曲库大小"
+    )
+    parser.add_argument("--queries", type=int, default=200, help="每个曲库的索引查询次数")
+    parser.add_argument(
+        "--difflib-queries", type=int, default=50, help="每个曲库的difflib逐首比较查询次数（同时统计结果一致率）"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    SongIndexPerformanceTester(args.sizes, args.queries, args.difflib_queries).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    SongIndexPerformanceTester(args.sizes, args.queries, args.difflib_queries).run()
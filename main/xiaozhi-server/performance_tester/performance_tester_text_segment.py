@@ -0,0 +1,162 @@
+import time
+import random
+import argparse
+import logging
+import statistics
+from tabulate import tabulate
+from core.utils import textUtils
+from core.utils.text_segmenter import TextSegmenter
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "流式文本分句耗时测试（每个token全量拼接查找 vs 增量分句），模拟2000字的流式回答"
+
+WORDS = "今天天气很好我们一起去公园散步看看湖边的风景顺便聊聊最近读过的书"
+SENTENCE_ENDS = "。！？；"
+CLAUSE_ENDS = "，、"
+
+
+class StandInTTSProvider(TTSProviderBase):
+    def __init__(self):
+        super().__init__({}, True)
+
+    async def text_to_speak(self, text, output_file):
+        return None
+
+
+def _legacy_get_segment_text(provider):
+    """原实现：每收到一个token都拼接全部文本，并对每个标点做rfind"""
+    full_text = "".join(provider.tts_text_buff)
+    current_text = full_text[provider.processed_chars :]
+    last_punct_pos = -1
+    punctuations_to_use = (
+        provider.first_sentence_punctuations
+        if provider.is_first_sentence
+        else provider.punctuations
+    )
+    for punct in punctuations_to_use:
+        pos = current_text.rfind(punct)
+        if (pos != -1 and last_punct_pos == -1) or (pos != -1 and pos < last_punct_pos):
+            last_punct_pos = pos
+    if last_punct_pos != -1:
+        segment_text_raw = current_text[: last_punct_pos + 1]
+        provider.processed_chars += len(segment_text_raw)
+        provider.is_first_sentence = False
+        return textUtils.get_string_no_punctuation_or_emoji(segment_text_raw)
+    return None
+
+
+def _make_answer(length, first_clause_length, rng):
+    """生成一段回答：第一句较长且没有标点，之后按句号、逗号随机断句"""
+    chars = [rng.choice(WORDS) for _ in range(first_clause_length)]
+    chars.append("。")
+    while len(chars) < length:
+        chars.extend(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+        chars.append(rng.choice(SENTENCE_ENDS if rng.random() < 0.5 else CLAUSE_ENDS))
+    return "".join(chars[:length])
+
+
+def _tokenize(text, rng):
+    """按1~3个字切分成token，模拟大模型流式输出"""
+    tokens, i = [], 0
+    while i < len(text):
+        step = rng.randint(1, 3)
+        tokens.append(text[i : i + step])
+        i += step
+    return tokens
+
+
+class TextSegmentPerformanceTester:
+    def __init__(self, answers=20, length=2000, first_clause_length=60, first_max_length=20):
+        self.answers = answers
+        self.length = length
+        self.first_clause_length = first_clause_length
+        self.first_max_length = first_max_length
+        self.results = []
+
+    def _run(self, answers, segment, first_max_length=0):
+        provider = StandInTTSProvider()
+        provider._segmenter = TextSegmenter(
+            provider.punctuations,
+            provider.first_sentence_punctuations,
+            first_max_length=first_max_length,
+        )
+        total_times, token_times, first_cuts, segment_counts = [], [], [], []
+        for tokens in answers:
+            provider.tts_text_buff = []
+            provider.processed_chars = 0
+            provider.is_first_sentence = True
+            received, first_cut, segments = 0, None, 0
+            start = time.perf_counter()
+            for token in tokens:
+                token_start = time.perf_counter()
+                provider.tts_text_buff.append(token)
+                segment_text = segment(provider)
+                token_times.append(time.perf_counter() - token_start)
+                received += len(token)
+                if segment_text:
+                    segments += 1
+                    if first_cut is None:
+                        first_cut = received
+            total_times.append(time.perf_counter() - start)
+            first_cuts.append(first_cut or received)
+            segment_counts.append(segments)
+        token_times.sort()
+        return [
+            f"{statistics.mean(total_times) * 1000:.2f}",
+            f"{token_times[int(len(token_times) * 0.99) - 1] * 1e6:.1f}",
+            f"{statistics.mean(first_cuts):.0f}",
+            f"{statistics.mean(segment_counts):.0f}",
+        ]
+
+    def run(self):
+        rng = random.Random(0)
+        answers = [
+            _tokenize(_make_answer(self.length, self.first_clause_length, rng), rng)
+            for _ in range(self.answers)
+        ]
+
+        self.results.append(["全量拼接查找"] + self._run(answers, _legacy_get_segment_text))
+        self.results.append(["增量分句"] + self._run(answers, TTSProviderBase._get_segment_text))
+
+        self.results.append(
+            [f"增量分句+首句{self.first_max_length}字切分"]
+            + self._run(answers, TTSProviderBase._get_segment_text, self.first_max_length)
+        )
+
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "每个回答分句总耗时(ms)", "单token P99(us)", "首句切分前收到字数", "分句数"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="流式文本分句性能测试工具")
+    parser.add_argument("--answers", type=int, default=20, help="模拟的回答数")
+    parser.add_argument("--length", type=int, default=2000, help="每个回答的字数")
+    parser.add_argument(
+        "--first-clause-length", type=int, default=60, help="第一句没有标点的字数"
+    )
+    parser.add_argument(
+        "--first-max-length", type=int, default=20, help="第一句提前切分的字数"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    TextSegmentPerformanceTester(
+        args.answers, args.length, args.first_clause_length, args.first_max_length
+    ).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    TextSegmentPerformanceTester(
+        args.answers, args.length, args.first_clause_length, args.first_max_length
+    ).run()
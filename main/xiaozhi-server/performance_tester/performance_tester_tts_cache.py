@@ -0,0 +1,83 @@
+import time
+import random
+import argparse
+import logging
+import tempfile
+from types import SimpleNamespace
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.tts import create_instance as create_tts_instance
+from core.utils.tts_cache import get_tts_cache
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "语音合成缓存测试：命中率、节省的音频字节数、命中与未命中的首帧耗时"
+
+# 模拟线上经常重复出现的固定回复
+REPEATED_PHRASES = [
+    "好的，已为你打开。",
+    "好的，已为你关闭。",
+    "音量已调整。",
+    "再见，下次聊哦！",
+    "你好呀，有什么可以帮你的吗？",
+    "正在为你播放音乐。",
+]
+
+
+class TTSCachePerformanceTester:
+    def __init__(self, tts_name=None, requests=60, seed=0):
+        self.config = load_config()
+        self.tts_name = tts_name or self.config["selected_module"]["TTS"]
+        self.requests = requests
+        self.random = random.Random(seed)
+
+    def _create_tts(self):
+        tts_config = self.config["TTS"][self.tts_name]
+        tts = create_tts_instance(tts_config["type"], tts_config, delete_audio_file=True)
+        # 不建立设备连接，只提供缓存配置
+        cache_config = {
+            "enabled": True,
+            "cache_dir": tempfile.mkdtemp(prefix="tts_cache_"),
+        }
+        tts.conn = SimpleNamespace(
+            config={"tts_cache": cache_config}, audio_format="opus"
+        )
+        return tts
+
+    def run(self):
+        tts = self._create_tts()
+        start = time.perf_counter()
+        for _ in range(self.requests):
+            tts.to_tts(self.random.choice(REPEATED_PHRASES))
+        elapsed = time.perf_counter() - start
+
+        stats = get_tts_cache(tts.conn.config).stats()
+        hit_ms, miss_ms = stats["hit_first_audio_ms"], stats["miss_first_audio_ms"]
+        rows = [
+            ["请求数", stats["lookups"]],
+            ["命中率", f"{stats['hit_rate']:.1%}"],
+            ["节省音频(KB)", f"{stats['bytes_saved'] / 1024:.1f}"],
+            ["命中首帧耗时(ms)", f"{hit_ms:.2f}" if hit_ms is not None else "-"],
+            ["未命中首帧耗时(ms)", f"{miss_ms:.0f}" if miss_ms is not None else "-"],
+            ["总耗时(s)", f"{elapsed:.2f}"],
+        ]
+        print(f"TTS: {self.tts_name}")
+        print(tabulate(rows, headers=["指标", "数值"], tablefmt="github"))
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="语音合成缓存性能测试工具")
+    parser.add_argument("--tts", help="config.yaml中的TTS配置名，默认为当前选用的TTS")
+    parser.add_argument("--requests", type=int, default=60, help="模拟的合成请求数")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    TTSCachePerformanceTester(args.tts, args.requests).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    TTSCachePerformanceTester(args.tts, args.requests).run()
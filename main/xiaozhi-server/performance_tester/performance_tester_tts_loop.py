@@ -0,0 +1,111 @@
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import aiohttp
+from tabulate import tabulate
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "每句TTS的事件循环开销测试（每句asyncio.run vs 常驻事件循环），使用本地模拟TTS服务"
+
+FAKE_AUDIO = b"\x00" * 32000  # 1秒16kHz 16位静音
+
+
+class _FakeTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Content-Length", str(len(FAKE_AUDIO)))
+        self.end_headers()
+        self.wfile.write(FAKE_AUDIO)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInTTSProvider(TTSProviderBase):
+    """请求本地模拟服务的TTS，HTTP会话保存在实例上，所在事件循环存活期间一直复用"""
+
+    def __init__(self, url):
+        super().__init__({}, True)
+        self.url = url
+        self.session = None
+
+    async def text_to_speak(self, text, output_file):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        async with self.session.post(self.url, json={"text": text}) as response:
+            return await response.read()
+
+    async def text_to_speak_new_session(self, text):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(self.url, json={"text": text}) as response:
+                return await response.read()
+
+
+class TTSLoopPerformanceTester:
+    def __init__(self, sentences=200):
+        self.sentences = sentences
+        self.results = []
+
+    def _start_server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTTSHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _measure(self, synthesize):
+        latencies = []
+        for i in range(self.sentences):
+            start = time.perf_counter()
+            synthesize(f"第{i}句测试文本")
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+    def run(self):
+        server = self._start_server()
+        url = f"http://127.0.0.1:{server.server_address[1]}/tts"
+        tts = StandInTTSProvider(url)
+
+        cases = (
+            ("每句asyncio.run", lambda text: asyncio.run(tts.text_to_speak_new_session(text))),
+            ("常驻事件循环", lambda text: tts._run_coroutine(tts.text_to_speak(text, None))),
+        )
+        for name, synthesize in cases:
+            p50, p95 = self._measure(synthesize)
+            self.results.append([name, f"{p50 * 1000:.2f}", f"{p95 * 1000:.2f}"])
+
+        tts._run_coroutine(tts.session.close())
+        server.shutdown()
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "P50单句耗时(ms)", "P95单句耗时(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TTS事件循环开销测试工具")
+    parser.add_argument("--sentences", type=int, default=200, help="每种方式合成的句子数")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    TTSLoopPerformanceTester(args.sentences).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    TTSLoopPerformanceTester(args.sentences).run()
@@ -0,0 +1,105 @@
+import os
+import time
+import logging
+import numpy as np
+from tabulate import tabulate
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VAD逐连接推理与跨连接批量推理性能测试"
+
+CHUNK_SAMPLES = 512
+
+
+class VADPerformanceTester:
+    def __init__(self, sessions=(1, 8, 32, 64), rounds=50):
+        self.sessions = sessions
+        self.rounds = rounds
+        self.vad = self._create_vad()
+        self.results = []
+
+    def _create_vad(self):
+        """按config.yaml中的SileroVAD配置创建VAD实例"""
+        import yaml
+        from core.providers.vad.silero import VADProvider
+
+        with open(os.path.join(os.getcwd(), "config.yaml"), "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        return VADProvider(config["VAD"]["SileroVAD"])
+
+    def _synthetic_chunks(self, count):
+        """生成模拟音频分片：一半为带噪正弦波，一半为低噪声"""
+        rng = np.random.default_rng(0)
+        t = np.arange(CHUNK_SAMPLES) / 16000
+        chunks = []
+        for i in range(count):
+            noise = rng.normal(0, 0.01, CHUNK_SAMPLES)
+            if i % 2 == 0:
+                noise += 0.3 * np.sin(2 * np.pi * (200 + 10 * i) * t)
+            chunks.append(noise.astype(np.float32))
+        return chunks
+
+    def _run_sequential(self, chunks):
+        import torch
+
+        for _ in range(self.rounds):
+            for chunk in chunks:
+                with torch.no_grad():
+                    self.vad.model(torch.from_numpy(chunk), 16000).item()
+
+    def _run_batched(self, chunks):
+        from core.providers.vad.silero import SileroVADSession
+
+        sessions = [SileroVADSession(self.vad) for _ in chunks]
+        for _ in range(self.rounds):
+            self.vad._run_batch(list(zip(sessions, chunks)))
+
+    def _measure(self, func, chunks):
+        self.vad.model.reset_states()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func(chunks)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        frames = len(chunks) * self.rounds
+        return frames / wall, cpu * 1000 / frames
+
+    def run(self):
+        print(f"每组测试{self.rounds}轮，每轮每个连接推理一个{CHUNK_SAMPLES}采样点的分片")
+        for count in self.sessions:
+            chunks = self._synthetic_chunks(count)
+            seq_fps, seq_cpu = self._measure(self._run_sequential, chunks)
+            batch_fps, batch_cpu = self._measure(self._run_batched, chunks)
+            self.results.append(
+                [
+                    count,
+                    f"{seq_fps:.0f}",
+                    f"{batch_fps:.0f}",
+                    f"{seq_cpu:.3f}",
+                    f"{batch_cpu:.3f}",
+                    f"{batch_fps / seq_fps:.2f}x",
+                ]
+            )
+
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "连接数",
+                    "逐个推理(分片/秒)",
+                    "批量推理(分片/秒)",
+                    "逐个CPU(ms/分片)",
+                    "批量CPU(ms/分片)",
+                    "吞吐提升",
+                ],
+                tablefmt="github",
+            )
+        )
+
+
+def main():
+    VADPerformanceTester().run()
+
+
+if __name__ == "__main__":
+    main()
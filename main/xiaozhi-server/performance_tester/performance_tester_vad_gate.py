@@ -0,0 +1,98 @@
+import os
+import time
+import argparse
+import logging
+import numpy as np
+from tabulate import tabulate
+from pydub import AudioSegment
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VAD能量门限跳过模型推理的次数与CPU节省测试"
+
+
+class VADGatePerformanceTester:
+    def __init__(self, audio_file=None, vad_name="SileroVAD", thresholds=None):
+        self.audio_file = audio_file or os.path.join(
+            os.getcwd(), "config", "assets", "wakeup_words.wav"
+        )
+        self.vad_name = vad_name
+        self.thresholds = thresholds or [0.001, 0.002, 0.005, 0.01]
+        self.vad = self._create_vad()
+        self.results = []
+
+    def _create_vad(self):
+        """按config.yaml中的VAD配置创建实例"""
+        import yaml
+        import importlib
+
+        with open(os.path.join(os.getcwd(), "config.yaml"), "r", encoding="utf-8") as f:
+            vad_config = yaml.safe_load(f)["VAD"][self.vad_name]
+        module = importlib.import_module(f"core.providers.vad.{vad_config['type']}")
+        return module.VADProvider(vad_config)
+
+    def _load_chunks(self):
+        """读取录音（如家庭环境噪声）并切分为512采样点的float32分片"""
+        audio = AudioSegment.from_file(self.audio_file, parameters=["-nostdin"])
+        audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+        count = len(samples) // 512
+        samples = samples[: count * 512].astype(np.float32) / 32768.0
+        return list(samples.reshape(count, 512))
+
+    def _run(self, chunks, energy_threshold):
+        """返回(模型调用次数, CPU耗时)"""
+        self.vad.energy_threshold = energy_threshold
+        self.vad._energy_limit = energy_threshold**2 * 512
+        session = self.vad._get_session(type("Conn", (), {"vad_session": None})())
+        calls = 0
+        cpu_start = time.process_time()
+        for chunk in chunks:
+            if self.vad._is_below_energy_gate(chunk):
+                continue
+            self.vad._run_batch([(session, chunk)])
+            calls += 1
+        return calls, time.process_time() - cpu_start
+
+    def run(self):
+        chunks = self._load_chunks()
+        print(f"回放 {os.path.basename(self.audio_file)}: {len(chunks)} 个分片")
+        base_calls, base_cpu = self._run(chunks, 0.0)
+        self.results.append(["不启用", base_calls, "0.0%", f"{base_cpu * 1000:.1f}", "0.0%"])
+        for threshold in self.thresholds:
+            calls, cpu = self._run(chunks, threshold)
+            skipped = base_calls - calls
+            self.results.append(
+                [
+                    threshold,
+                    calls,
+                    f"{skipped * 100 / max(base_calls, 1):.1f}%",
+                    f"{cpu * 1000:.1f}",
+                    f"{(base_cpu - cpu) * 100 / max(base_cpu, 1e-9):.1f}%",
+                ]
+            )
+        print(
+            tabulate(
+                self.results,
+                headers=["能量门限", "模型调用次数", "跳过比例", "CPU耗时(ms)", "CPU节省"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VAD能量门限测试工具")
+    parser.add_argument("--file", help="回放的录音文件，建议使用家庭环境噪声录音")
+    parser.add_argument("--vad", default="SileroVAD", help="config.yaml中的VAD配置名")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    VADGatePerformanceTester(args.file, args.vad).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    VADGatePerformanceTester(args.file, args.vad).run()
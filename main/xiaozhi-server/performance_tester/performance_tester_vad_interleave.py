@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import logging
+import importlib
+from collections import deque
+import numpy as np
+from tabulate import tabulate
+from config.settings import load_config
+from core.utils.ring_buffer import PCMRingBuffer
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VAD会话隔离测试：两路合成音频交错推理（逐帧交错及合并批次）时的判断结果与各自单独推理是否一致"
+
+VAD_CONFIGS = {"silero": "SileroVAD", "silero_onnx": "SileroVADOnnx"}
+FRAME_SAMPLES = 960  # 60ms
+
+
+class _FakeConnection:
+    """只包含VAD需要的连接状态"""
+
+    def __init__(self):
+        self.vad_session = None
+        self.client_audio_buffer = PCMRingBuffer()
+        self.client_have_voice = False
+        self.last_activity_time = 0.0
+        self.client_voice_stop = False
+        self.client_voice_window = deque(maxlen=5)
+        self.last_is_voice = False
+
+
+def _make_stream(seed, seconds, speech_spans):
+    """生成一路16kHz合成音频：speech_spans内为带谐波的变调信号，其余为低噪声，按60ms切帧"""
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * 16000)
+    t = np.arange(samples) / 16000
+    audio = rng.normal(0, 0.003, samples)
+    for start, end, pitch in speech_spans:
+        span = slice(int(start * 16000), int(end * 16000))
+        f0 = pitch * (1 + 0.1 * np.sin(2 * np.pi * 3 * t[span]))
+        phase = 2 * np.pi * np.cumsum(f0) / 16000
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t[span]) ** 2
+        audio[span] += 0.3 * voiced * envelope + rng.normal(0, 0.02, span.stop - span.start)
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes()
+    step = FRAME_SAMPLES * 2
+    return [pcm[i : i + step] for i in range(0, len(pcm) - step + 1, step)]
+
+
+class VADInterleavePerformanceTester:
+    def __init__(self, vad_type="silero", seconds=10.0):
+        self.vad_type = vad_type
+        config = load_config()["VAD"][VAD_CONFIGS[vad_type]]
+        module = importlib.import_module(f"core.providers.vad.{vad_type}")
+        self.module = module
+        # 关闭批量调度和能量门限，所有分片都经过模型
+        self.vad = module.VADProvider(dict(config, batch_window_ms=0, energy_threshold=0))
+        self.streams = [
+            _make_stream(1, seconds, [(1.0, 3.0, 140), (5.5, 7.0, 160)]),
+            _make_stream(2, seconds, [(2.0, 2.8, 220), (4.0, 8.5, 200)]),
+        ]
+        self.results = []
+
+    def _solo(self, frames):
+        """单独一路逐帧推理，返回每帧的判断结果和每个分片的语音概率"""
+        conn = _FakeConnection()
+        decisions = [bool(self.vad.is_vad(conn, frame)) for frame in frames]
+        return decisions, self._probs([frames])[0]
+
+    def _interleaved_decisions(self):
+        """两路逐帧交错调用is_vad，各自使用自己的连接和会话"""
+        conns = [_FakeConnection() for _ in self.streams]
+        decisions = [[] for _ in self.streams]
+        for i in range(max(len(frames) for frames in self.streams)):
+            for k, frames in enumerate(self.streams):
+                if i < len(frames):
+                    decisions[k].append(bool(self.vad.is_vad(conns[k], frames[i])))
+        return decisions
+
+    def _probs(self, streams):
+        """多路的分片在同一批次中推理，返回各路每个分片的语音概率"""
+        chunk_bytes = self.module.CHUNK_SAMPLES * 2
+        chunks = []
+        for frames in streams:
+            pcm = b"".join(frames)
+            chunks.append(
+                [
+                    np.frombuffer(pcm[i : i + chunk_bytes], dtype=np.int16).astype(np.float32)
+                    / 32768.0
+                    for i in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes)
+                ]
+            )
+        sessions = [self.vad.session_class(self.vad) for _ in streams]
+        probs = [[] for _ in streams]
+        for i in range(max(len(c) for c in chunks)):
+            items = [
+                (sessions[k], chunks[k][i]) for k in range(len(streams)) if i < len(chunks[k])
+            ]
+            for (session, _), prob in zip(items, self.vad._run_batch(items)):
+                probs[sessions.index(session)].append(prob)
+        return probs
+
+    async def run(self):
+        solo = [self._solo(frames) for frames in self.streams]
+        interleaved = self._interleaved_decisions()
+        batched = self._probs(self.streams)
+
+        for k, (solo_decisions, solo_probs) in enumerate(solo):
+            diff = max(abs(a - b) for a, b in zip(solo_probs, batched[k]))
+            self.results.append(
+                [
+                    f"第{k + 1}路",
+                    len(solo_decisions),
+                    sum(solo_decisions),
+                    sum(a != b for a, b in zip(solo_decisions, interleaved[k])),
+                    f"{diff:.2e}",
+                ]
+            )
+
+        print(f"VAD类型: {self.vad_type}")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "音频流",
+                    "帧数",
+                    "单独推理判断为有声的帧数",
+                    "逐帧交错与单独推理不一致的帧数",
+                    "合并批次与单独推理的最大概率差",
+                ],
+                tablefmt="github",
+            )
+        )
+        consistent = all(row[3] == 0 for row in self.results)
+        print("结论: " + ("两路判断互不影响" if consistent else "存在串扰，请检查会话状态"))
+        # 作为回归检查使用，出现串扰时以非0状态退出
+        if not consistent:
+            raise AssertionError("VAD会话串扰：逐帧交错推理的判断结果与单独推理不一致")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VAD会话隔离测试工具")
+    parser.add_argument(
+        "--type", choices=sorted(VAD_CONFIGS), default="silero", help="VAD类型"
+    )
+    parser.add_argument("--seconds", type=float, default=10.0, help="每路音频时长（秒）")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await VADInterleavePerformanceTester(args.type, args.seconds).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(VADInterleavePerformanceTester(args.type, args.seconds).run())
@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from tabulate import tabulate
+
+description = "VAD torch与ONNX实现的导入耗时、单帧延迟与内存占用对比测试"
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VAD_CONFIGS = {"silero": "SileroVAD", "silero_onnx": "SileroVADOnnx"}
+
+
+def _measure_provider(vad_type: str, frames: int) -> dict:
+    """在当前进程中加载指定VAD并推理frames个分片，返回各项指标"""
+    import yaml
+    import psutil
+    import importlib
+
+    process = psutil.Process()
+    base_rss = process.memory_info().rss
+
+    start = time.perf_counter()
+    module = importlib.import_module(f"core.providers.vad.{vad_type}")
+    import_seconds = time.perf_counter() - start
+
+    with open(os.path.join(PROJECT_DIR, "config.yaml"), "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    start = time.perf_counter()
+    vad = module.VADProvider(config["VAD"][VAD_CONFIGS[vad_type]])
+    load_seconds = time.perf_counter() - start
+
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    chunks = [
+        rng.normal(0, 0.1, module.CHUNK_SAMPLES).astype(np.float32)
+        for _ in range(frames)
+    ]
+    session = vad._get_session(type("Conn", (), {"vad_session": None})())
+    # 预热
+    vad._run_batch([(session, chunks[0])])
+    latencies = []
+    for chunk in chunks:
+        start = time.perf_counter()
+        vad._run_batch([(session, chunk)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    return {
+        "type": vad_type,
+        "import_s": import_seconds,
+        "load_s": load_seconds,
+        "avg_ms": sum(latencies) / len(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "rss_mb": (process.memory_info().rss - base_rss) / 1024 / 1024,
+    }
+
+
+class VADOnnxPerformanceTester:
+    def __init__(self, frames=2000):
+        self.frames = frames
+        self.results = []
+
+    def _run_type(self, vad_type: str) -> dict:
+        """每种实现在独立进程中运行，保证导入耗时与内存统计互不影响"""
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--worker",
+                vad_type,
+                "--frames",
+                str(self.frames),
+            ],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+        )
+        for line in output.stdout.splitlines()[::-1]:
+            if line.startswith("{"):
+                return json.loads(line)
+        raise RuntimeError(output.stderr[-2000:])
+
+    def run(self):
+        print(f"每种实现推理 {self.frames} 个512采样点分片...")
+        for vad_type in VAD_CONFIGS:
+            try:
+                self.results.append(self._run_type(vad_type))
+            except Exception as e:
+                print(f"{vad_type} 测试失败: {e}")
+
+        table = [
+            [
+                r["type"],
+                f"{r['import_s']:.2f}",
+                f"{r['load_s']:.2f}",
+                f"{r['avg_ms']:.3f}",
+                f"{r['p99_ms']:.3f}",
+                f"{r['rss_mb']:.1f}",
+            ]
+            for r in self.results
+        ]
+        print(
+            tabulate(
+                table,
+                headers=[
+                    "VAD类型",
+                    "导入耗时(s)",
+                    "模型加载(s)",
+                    "平均延迟(ms/帧)",
+                    "P99延迟(ms/帧)",
+                    "新增RSS(MB)",
+                ],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VAD实现对比测试工具")
+    parser.add_argument("--frames", type=int, default=2000, help="推理分片数")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = _parse_args([])
+    VADOnnxPerformanceTester(args.frames).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.worker:
+        sys.path.insert(0, PROJECT_DIR)
+        print(json.dumps(_measure_provider(args.worker, args.frames)))
+    else:
+        VADOnnxPerformanceTester(args.frames).run()
@@ -0,0 +1,110 @@
+import os
+import time
+import asyncio
+import argparse
+import logging
+from tabulate import tabulate
+from pydub import AudioSegment
+from config.settings import load_config
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VOSK识别器池在不同池大小下的并发识别吞吐量与结果一致性测试"
+
+
+class VoskPoolPerformanceTester:
+    def __init__(self, audio_dir=None, concurrency=16, pool_sizes=(1, 2, 4, 8, 16)):
+        self.asr_config = dict(load_config()["ASR"]["VoskASR"])
+        self.audio_dir = audio_dir or os.path.join(os.getcwd(), "config", "assets")
+        self.concurrency = concurrency
+        self.pool_sizes = pool_sizes
+        self.results = []
+
+    def _load_utterances(self):
+        """读取测试目录中的录音，转换为16kHz单声道PCM帧列表"""
+        utterances = []
+        for name in sorted(os.listdir(self.audio_dir)):
+            if not name.lower().endswith((".wav", ".mp3")):
+                continue
+            audio = AudioSegment.from_file(
+                os.path.join(self.audio_dir, name), parameters=["-nostdin"]
+            )
+            audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+            raw = audio.raw_data
+            utterances.append(
+                (name, [raw[i : i + 1920] for i in range(0, len(raw), 1920)])
+            )
+        if not utterances:
+            raise FileNotFoundError(f"测试目录中没有录音文件: {self.audio_dir}")
+        return utterances
+
+    def _create_asr(self, pool_size):
+        from core.providers.asr.vosk import ASRProvider
+
+        return ASRProvider(dict(self.asr_config, pool_size=pool_size), True)
+
+    async def _run_concurrent(self, asr, jobs):
+        """模拟多台设备同时说完话，每个请求像handle_voice_stop一样在ASR工作线程中识别"""
+        from core.providers.asr.base import run_in_asr_worker
+
+        return await asyncio.gather(
+            *[
+                run_in_asr_worker(asr.speech_to_text, frames, f"device-{i}", "pcm")
+                for i, (_, frames) in enumerate(jobs)
+            ]
+        )
+
+    async def run(self):
+        utterances = self._load_utterances()
+        jobs = [utterances[i % len(utterances)] for i in range(self.concurrency)]
+
+        # 以单识别器串行识别的结果作为各录音的参考文本
+        reference_asr = self._create_asr(1)
+        references = {}
+        for name, frames in utterances:
+            references[name], _ = await reference_asr.speech_to_text(frames, "ref", "pcm")
+
+        for pool_size in self.pool_sizes:
+            asr = self._create_asr(pool_size)
+            start = time.perf_counter()
+            outputs = await self._run_concurrent(asr, jobs)
+            elapsed = time.perf_counter() - start
+            mismatched = [
+                name
+                for (name, _), (text, _) in zip(jobs, outputs)
+                if text != references[name]
+            ]
+            self.results.append(
+                [
+                    pool_size,
+                    self.concurrency,
+                    f"{self.concurrency / elapsed:.2f}",
+                    "一致" if not mismatched else f"{len(mismatched)}条不一致",
+                ]
+            )
+
+        print(
+            tabulate(
+                self.results,
+                headers=["池大小", "并发数", "吞吐量(句/秒)", "识别结果"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="VOSK识别器池性能测试工具")
+    parser.add_argument("--dir", help="测试录音目录，目录中每个录音作为一条不同的语音")
+    parser.add_argument("--concurrency", type=int, default=16, help="同时识别的语音数")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await VoskPoolPerformanceTester(args.dir, args.concurrency).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(VoskPoolPerformanceTester(args.dir, args.concurrency).run())
@@ -0,0 +1,116 @@
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+import websockets
+from tabulate import tabulate
+from core.utils.ws_pool import WebSocketPool
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "双流式TTS连接方式对比：每轮新建WebSocket vs 预建连接池，统计首帧音频延迟"
+
+FAKE_FRAME = b"\x00" * 120  # 一帧60ms的Opus音频大小
+
+
+async def _fake_tts_server(websocket):
+    """模拟TTS服务：每收到一句文本返回一帧音频，连接可连续处理多轮会话"""
+    async for _ in websocket:
+        await websocket.send(FAKE_FRAME)
+
+
+class WebSocketPoolPerformanceTester:
+    def __init__(self, devices=8, turns=10, handshake_ms=150, pool_size=4):
+        self.devices = devices
+        self.turns = turns
+        # 本地回环没有TLS和鉴权，建立连接时额外等待handshake_ms模拟公网握手耗时
+        self.handshake = handshake_ms / 1000
+        self.pool_size = pool_size
+        self.results = []
+
+    async def _run_devices(self, acquire, release):
+        """模拟多台设备同时对话，每轮取得连接后发送一句文本，统计到收到第一帧音频的耗时"""
+
+        async def device():
+            latencies = []
+            for _ in range(self.turns):
+                start = time.perf_counter()
+                ws = await acquire()
+                await ws.send("你好")
+                await ws.recv()
+                latencies.append(time.perf_counter() - start)
+                await release(ws)
+                # 模拟设备播放和用户说话的间隔
+                await asyncio.sleep(0.05)
+            return latencies
+
+        results = await asyncio.gather(*[device() for _ in range(self.devices)])
+        latencies = sorted(latency for result in results for latency in result)
+        return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+    async def run(self):
+        server = await websockets.serve(_fake_tts_server, "127.0.0.1", 0)
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+        async def connect():
+            await asyncio.sleep(self.handshake)
+            return await websockets.connect(url)
+
+        async def close(ws):
+            await ws.close()
+
+        # 原实现：每轮对话新建连接，会话结束后关闭
+        median, p95 = await self._run_devices(connect, close)
+        self.results.append(["每轮新建连接", f"{median * 1000:.1f}", f"{p95 * 1000:.1f}"])
+
+        pool = WebSocketPool(connect, self.pool_size, name="测试连接池")
+        pool.warm_up()
+        await asyncio.sleep(self.handshake * 2)  # 等待预建连接完成，对应服务启动后的首次握手
+
+        async def release(ws):
+            pool.release(ws)
+
+        median, p95 = await self._run_devices(pool.acquire, release)
+        self.results.append(
+            [f"连接池({self.pool_size})", f"{median * 1000:.1f}", f"{p95 * 1000:.1f}"]
+        )
+
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "首帧延迟中位数(ms)", "首帧延迟P95(ms)"],
+                tablefmt="github",
+            )
+        )
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WebSocket连接池性能测试工具")
+    parser.add_argument("--devices", type=int, default=8, help="同时对话的设备数")
+    parser.add_argument("--turns", type=int, default=10, help="每台设备的对话轮数")
+    parser.add_argument(
+        "--handshake-ms", type=float, default=150, help="模拟的建立连接耗时（毫秒）"
+    )
+    parser.add_argument("--pool-size", type=int, default=4, help="连接池空闲连接数")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = _parse_args([])
+    await WebSocketPoolPerformanceTester(
+        args.devices, args.turns, args.handshake_ms, args.pool_size
+    ).run()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(
+        WebSocketPoolPerformanceTester(
+            args.devices, args.turns, args.handshake_ms, args.pool_size
+        ).run()
+    )
@@ -2,17 +2,19 @@ import os
 import re
 import time
 import random
-import difflib
+import asyncio
 import traceback
-from pathlib import Path
 from core.handle.sendAudioHandle import send_stt_message
 from plugins_func.register import register_function, ToolType, ActionResponse, Action
 from core.utils.dialogue import Message
+from core.utils.music_library import MusicLibrary, DEFAULT_CACHE_DIR
 from core.providers.tts.dto.dto import TTSMessageDTO, SentenceType, ContentType
 
 TAG = __name__
 
 MUSIC_CACHE = {}
+# 首次播放时等待后台扫描完成的最长时间（秒）
+FIRST_SCAN_TIMEOUT = 5
 
 play_music_function_desc = {
     "type": "function",
@@ -82,37 +84,9 @@ def _extract_song_name(text):
     return None
 
 
-def _find_best_match(potential_song, music_files):
-    """查找最匹配的歌曲"""
-    best_match = None
-    highest_ratio = 0
-
-    for music_file in music_files:
-        song_name = os.path.splitext(music_file)[0]
-        ratio = difflib.SequenceMatcher(None, potential_song, song_name).ratio()
-        if ratio > highest_ratio and ratio > 0.4:
-            highest_ratio = ratio
-            best_match = music_file
-    return best_match
-
-
-def get_music_files(music_dir, music_ext):
-    music_dir = Path(music_dir)
-    music_files = []
-    music_file_names = []
-    for file in music_dir.rglob("*"):
-        # 判断是否是文件
-        if file.is_file():
-            # 获取文件扩展名
-            ext = file.suffix.lower()
-            # 判断扩展名是否在列表中
-            if ext in music_ext:
-                # 添加相对路径
-                music_files.append(str(file.relative_to(music_dir)))
-                music_file_names.append(
-                    os.path.splitext(str(file.relative_to(music_dir)))[0]
-                )
-    return music_files, music_file_names
+def _find_best_match(potential_song, song_index):
+    """通过歌名索引查找最匹配的歌曲"""
+    return song_index.best_match(potential_song, min_ratio=0.4)
 
 
 def initialize_music_handler(conn):
@@ -130,14 +104,23 @@ def initialize_music_handler(conn):
                 "refresh_time", 60
             )
         else:
+            MUSIC_CACHE["music_config"] = {}
             MUSIC_CACHE["music_dir"] = os.path.abspath("./music")
             MUSIC_CACHE["music_ext"] = (".mp3", ".wav", ".p3")
             MUSIC_CACHE["refresh_time"] = 60
-        # 获取音乐文件列表
-        MUSIC_CACHE["music_files"], MUSIC_CACHE["music_file_names"] = get_music_files(
-            MUSIC_CACHE["music_dir"], MUSIC_CACHE["music_ext"]
+        # 音乐库：后台把歌曲预先转码为p3，播放时直接读取Opus数据包
+        MUSIC_CACHE["library"] = MusicLibrary(
+            MUSIC_CACHE["music_dir"],
+            MUSIC_CACHE["music_ext"],
+            cache_dir=MUSIC_CACHE["music_config"].get("cache_dir", DEFAULT_CACHE_DIR),
+            transcode=MUSIC_CACHE["music_config"].get("pretranscode", True),
         )
+        # 在后台线程中扫描目录、建立歌名索引，不阻塞事件循环
         MUSIC_CACHE["scan_time"] = time.time()
+        MUSIC_CACHE["library"].refresh()
+    # 使用后台最近一次扫描的结果，首次扫描完成前为空
+    MUSIC_CACHE["music_files"] = MUSIC_CACHE["library"].music_files
+    MUSIC_CACHE["music_file_names"] = MUSIC_CACHE["library"].music_file_names
     return MUSIC_CACHE
 
 
@@ -151,16 +134,23 @@ async def handle_music_command(conn, text):
 
     # 尝试匹配具体歌名
     if os.path.exists(MUSIC_CACHE["music_dir"]):
+        library = MUSIC_CACHE["library"]
         if time.time() - MUSIC_CACHE["scan_time"] > MUSIC_CACHE["refresh_time"]:
-            # 刷新音乐文件列表
-            MUSIC_CACHE["music_files"], MUSIC_CACHE["music_file_names"] = (
-                get_music_files(MUSIC_CACHE["music_dir"], MUSIC_CACHE["music_ext"])
-            )
+            # 在后台线程中重新扫描目录、增量更新歌名索引并转码有变化的歌曲，本次先使用上一次的结果
+            library.refresh()
             MUSIC_CACHE["scan_time"] = time.time()
+        if not library.wait_scanned(0):
+            # 服务刚启动时首次扫描可能尚未完成，在线程池中等待，不阻塞事件循环
+            await asyncio.get_running_loop().run_in_executor(
+                None, library.wait_scanned, FIRST_SCAN_TIMEOUT
+            )
+            initialize_music_handler(conn)
 
         potential_song = _extract_song_name(clean_text)
         if potential_song:
-            best_match = _find_best_match(potential_song, MUSIC_CACHE["music_files"])
+            best_match = _find_best_match(
+                potential_song, MUSIC_CACHE["library"].song_index
+            )
             if best_match:
                 conn.logger.bind(tag=TAG).info(f"找到最匹配的歌曲: {best_match}")
                 await play_local_music(conn, specific_file=best_match)
@@ -211,6 +201,8 @@ async def play_local_music(conn, specific_file=None):
         if not os.path.exists(music_path):
             conn.logger.bind(tag=TAG).error(f"选定的音乐文件不存在: {music_path}")
             return
+        # 已预先转码的歌曲直接播放p3文件
+        music_path = MUSIC_CACHE["library"].playable_path(selected_music)
         text = _get_random_play_prompt(selected_music)
         await send_stt_message(conn, text)
         conn.dialogue.put(Message(role="assistant", content=text))